@@ -0,0 +1,527 @@
+"""
+ETL Benchmark
+
+Generates synthetic BGG-shaped CSVs (games, credits, ratings) at a chosen
+scale and runs ETLPipeline end-to-end against a local mongod or an
+in-process mongomock database. Per-stage timings and peak memory are saved
+as a JSON baseline that later runs can be compared against.
+
+Usage:
+    python -m etl.benchmark --scale small
+    python -m etl.benchmark --scale medium --output etl/benchmarks/medium.json
+    python -m etl.benchmark --scale large --mongo mongodb://localhost:27017 --compare baseline.json
+
+The benchmark drops and refills the collections of its own database
+(default: bgr_benchmark). Never point it at the application database.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+import multiprocessing
+
+# Add project root to Python path for imports
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+import numpy as np
+import pandas as pd
+
+from etl.config import Config, CSVImportConfig, MongoDBConfig, PipelineConfig
+from etl.lib.mongodb import MongoDBHelper
+from etl.logger import setup_logging, get_logger
+from etl.pipeline import ETLPipeline, LOAD_MODES
+
+logger = get_logger(__name__)
+
+# File pattern of the generated CSVs (e.g., game_ratings_bench.csv)
+BENCHMARK_PATTERN = "_bench"
+BENCHMARK_DATABASE = "bgr_benchmark"
+
+# Exponents of the power laws for user activity and game popularity: a few
+# users rate thousands of games, and a few games collect most ratings
+USER_ACTIVITY_EXPONENT = 1.1
+GAME_POPULARITY_EXPONENT = 0.9
+
+# Stages faster than this are too noisy to flag as regressions
+MIN_COMPARED_SECONDS = 0.05
+
+MECHANICS = [
+    "Dice Rolling", "Hand Management", "Set Collection", "Worker Placement", "Deck Building",
+    "Area Majority / Influence", "Tile Placement", "Cooperative Game", "Drafting", "Auction/Bidding",
+    "Network and Route Building", "Variable Player Powers", "Push Your Luck", "Trick-taking",
+    "Pattern Building", "Engine Building", "Action Points", "Grid Movement", "Trading", "Voting",
+]
+CATEGORIES = [
+    "Strategy", "Economic", "Fantasy", "Card Game", "Adventure", "Science Fiction", "Wargame",
+    "Party Game", "Abstract Strategy", "Family", "Medieval", "Exploration", "Civilization", "Deduction",
+]
+COUNTRIES = ["US", "DE", "GB", "FR", "CA", "NL", "PL", "ES", "IT", "SE", ""]
+
+
+@dataclass
+class BenchmarkScale:
+    """Size of a synthetic dataset."""
+
+    name: str
+    games: int
+    users: int
+    ratings: int
+
+
+SCALES = {
+    "small": BenchmarkScale("small", games=100, users=200, ratings=1_000),
+    "medium": BenchmarkScale("medium", games=2_000, users=5_000, ratings=100_000),
+    "large": BenchmarkScale("large", games=25_000, users=250_000, ratings=10_000_000),
+}
+
+
+class InProcessMongoDBHelper(MongoDBHelper):
+    """MongoDBHelper backed by an in-process mongomock client (no server needed)."""
+
+    def __init__(self, database: str = BENCHMARK_DATABASE):
+        super().__init__(uri="mongomock://localhost", database=database)
+
+    def connect(self) -> None:
+        """Create the in-process client."""
+        if self._client is None:
+            try:
+                import mongomock
+            except ImportError as e:
+                raise ImportError("The in-process benchmark database requires mongomock (pip install mongomock)") from e
+
+            _accept_update_sort(mongomock)
+            self._client = mongomock.MongoClient()
+            self._db = self._client[self.database_name]
+
+
+def _accept_update_sort(mongomock) -> None:
+    """
+    Let mongomock's bulk builder take the sort option of recent pymongo UpdateOne.
+
+    pymongo 4.11+ passes sort=None when adding an UpdateOne to a bulk write,
+    which mongomock 4.x does not accept. Sort only matters for updates that
+    match several documents, which the pipeline never issues.
+    """
+    builder = mongomock.collection.BulkOperationBuilder
+    if getattr(builder.add_update, "_accepts_sort", False):
+        return
+
+    add_update = builder.add_update
+
+    def add_update_with_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    add_update_with_sort._accepts_sort = True
+    builder.add_update = add_update_with_sort
+
+
+def _power_law(size: int, exponent: float) -> np.ndarray:
+    """Probabilities proportional to 1 / rank**exponent."""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _sample_rating_pairs(scale: BenchmarkScale, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Draw distinct (user, game) pairs with power-law user activity and game popularity.
+
+    Returns:
+        Tuple of (user indices, game indices)
+    """
+    if scale.users * scale.games < 2 * scale.ratings:
+        raise ValueError(f"Scale {scale.name} has too few users x games for {scale.ratings} distinct ratings")
+
+    user_p = _power_law(scale.users, USER_ACTIVITY_EXPONENT)
+    game_p = _power_law(scale.games, GAME_POPULARITY_EXPONENT)
+
+    pairs = np.empty(0, dtype=np.int64)
+    while len(pairs) < scale.ratings:
+        draw = int((scale.ratings - len(pairs)) * 1.2) + 16
+        users = rng.choice(scale.users, size=draw, p=user_p).astype(np.int64)
+        games = rng.choice(scale.games, size=draw, p=game_p).astype(np.int64)
+        pairs = np.unique(np.concatenate([pairs, users * scale.games + games]))
+
+    pairs = rng.permutation(pairs)[: scale.ratings]
+    return pairs // scale.games, pairs % scale.games
+
+
+def generate_dataset(data_dir: Path, scale: BenchmarkScale, seed: int = 42) -> dict:
+    """
+    Write synthetic games, credits and ratings CSVs.
+
+    Files are named like the scraper outputs with the "_bench" pattern
+    (test_bgg_games_bench.csv, game_credits_bench.csv, game_ratings_bench.csv).
+
+    Args:
+        data_dir: Output directory
+        scale: Dataset size
+        seed: Random seed; the same seed always produces the same files
+
+    Returns:
+        Dataset description (scale, seed and row counts)
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    logger.info(f"Generating {scale.name} dataset in {data_dir}")
+
+    # Games are indexed by popularity rank; BGG ids are scattered
+    bgg_ids = rng.choice(np.arange(1, 20 * scale.games + 1), size=scale.games, replace=False)
+    game_means = np.clip(rng.normal(6.8, 0.8, scale.games), 3.0, 9.2)
+
+    user_idx, game_idx = _sample_rating_pairs(scale, rng)
+    ratings = np.clip(np.round(rng.normal(game_means[game_idx], 1.4), 1), 1.0, 10.0)
+    ratings[rng.random(scale.ratings) < 0.002] = np.nan
+
+    usernames = np.array([f"bgg_user_{i}" for i in range(scale.users)], dtype=object)
+    timestamps = pd.Timestamp("2005-01-01") + pd.to_timedelta(
+        rng.integers(0, 20 * 365 * 86400, scale.ratings), unit="s"
+    )
+    user_counts = np.bincount(user_idx, minlength=scale.users)
+
+    pd.DataFrame({
+        "bggId": bgg_ids[game_idx],
+        "rating": ratings,
+        "rating_tstamp": timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+        "username": usernames[user_idx],
+        "isocountry": rng.choice(COUNTRIES, size=scale.users)[user_idx],
+        "rating_count": user_counts[user_idx],
+    }).to_csv(data_dir / f"game_ratings{BENCHMARK_PATTERN}.csv", index=False)
+
+    num_voters = np.bincount(game_idx, minlength=scale.games)
+    avg_ratings = np.round(game_means, 3)
+    geek_ratings = np.round((num_voters * avg_ratings + 1000 * 5.5) / (num_voters + 1000), 3)
+    ranks = np.arange(1, scale.games + 1)
+
+    pd.DataFrame({
+        "rank": ranks,
+        "thumbnailUrl": [f"https://cf.geekdo-images.com/thumb/{bgg_id}.jpg" for bgg_id in bgg_ids],
+        "thumbnailAlt": "Board Game: thumbnail",
+        "name": [f"Synthetic Game {rank}" for rank in ranks],
+        "detailUrl": [f"https://boardgamegeek.com/boardgame/{bgg_id}/synthetic-game" for bgg_id in bgg_ids],
+        "bggId": bgg_ids,
+        "yearPublished": rng.integers(1960, 2025, scale.games),
+        "description": "A synthetic game generated for ETL benchmarks.",
+        "geekRating": geek_ratings,
+        "avgRating": avg_ratings,
+        "numVoters": num_voters,
+        "page": (ranks - 1) // 100 + 1,
+    }).to_csv(data_dir / f"test_bgg_games{BENCHMARK_PATTERN}.csv", index=False)
+
+    min_players = rng.integers(1, 4, scale.games)
+    max_players = min_players + rng.integers(0, 5, scale.games)
+    playtime = rng.choice([15, 30, 45, 60, 90, 120], size=scale.games)
+
+    def pick(vocabulary: list[str], low: int, high: int) -> list[str]:
+        return json.dumps(list(rng.choice(vocabulary, size=rng.integers(low, high), replace=False)))
+
+    pd.DataFrame({
+        "bggId": bgg_ids,
+        "mechanics": [pick(MECHANICS, 1, 6) for _ in range(scale.games)],
+        "categories": [pick(CATEGORIES, 1, 4) for _ in range(scale.games)],
+        "designers": [json.dumps([f"Designer {i}"]) for i in rng.integers(0, max(1, scale.games // 4), scale.games)],
+        "alternateNames": None,
+        "imageUrl": [f"https://cf.geekdo-images.com/original/{bgg_id}.jpg" for bgg_id in bgg_ids],
+        "gameplay_numberofplayers": [
+            f"{lo}+" if hi - lo >= 4 else f"{lo}–{hi}" if hi > lo else str(lo)
+            for lo, hi in zip(min_players, max_players)
+        ],
+        "gameplay_playtime": [f"{t}–{2 * t}" for t in playtime],
+        "gameplay_suggestedage": [f"{age}+" for age in rng.choice([8, 10, 12, 14], size=scale.games)],
+    }).to_csv(data_dir / f"game_credits{BENCHMARK_PATTERN}.csv", index=False)
+
+    dataset = {"scale": asdict(scale), "seed": seed}
+    with open(data_dir / "dataset.json", "w", encoding="utf-8") as f:
+        json.dump(dataset, f, indent=2)
+
+    logger.info(f"Generated {scale.games} games, {scale.users} users, {scale.ratings} ratings")
+    return dataset
+
+
+def ensure_dataset(data_dir: Path, scale: BenchmarkScale, seed: int) -> dict:
+    """Reuse the dataset in data_dir if it matches scale and seed; otherwise generate it."""
+    marker = data_dir / "dataset.json"
+    if marker.exists():
+        with open(marker, encoding="utf-8") as f:
+            dataset = json.load(f)
+        if dataset == {"scale": asdict(scale), "seed": seed}:
+            logger.info(f"Reusing {scale.name} dataset in {data_dir}")
+            return dataset
+
+    return generate_dataset(data_dir, scale, seed)
+
+
+def _run_pipeline(data_dir: str, mongo: str, database: str, options: dict, log_level: str) -> dict:
+    """
+    Run ETLPipeline once on a generated dataset.
+
+    Runs in a fresh process so peak RSS reflects the pipeline only.
+    """
+    setup_logging(level=log_level, log_to_file=False)
+
+    if mongo == "fake":
+        helper = InProcessMongoDBHelper(database)
+    else:
+        helper = MongoDBHelper(uri=mongo, database=database)
+
+    config = Config(
+        mongodb=MongoDBConfig(uri=helper.uri, database=database),
+        pipeline=PipelineConfig.from_env(),
+        csv_import=CSVImportConfig.from_env(),
+    )
+    config.pipeline.output_dir = Path(data_dir) / "processed"
+
+    pipeline = ETLPipeline(
+        config=config,
+        mongo=helper,
+        load_mode=options["load_mode"],
+        workers=options["workers"],
+        trace_memory=options["trace_memory"],
+        columnar_load=options["columnar_load"],
+    )
+
+    start = time.perf_counter()
+    result = pipeline.run(
+        data_dir=Path(data_dir),
+        pattern=BENCHMARK_PATTERN,
+        files_to_import=["games", "credits", "ratings"],
+        stream=options["stream"],
+        use_cache=options["use_cache"],
+    )
+    result["total_seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_benchmark(
+    scale: BenchmarkScale,
+    data_dir: Path,
+    mongo: str = "fake",
+    database: str = BENCHMARK_DATABASE,
+    seed: int = 42,
+    load_mode: str = "direct",
+    workers: int = 1,
+    stream: bool = False,
+    use_cache: bool = False,
+    trace_memory: bool = False,
+    columnar_load: bool = False,
+    log_level: str = "WARNING",
+) -> dict:
+    """
+    Generate (or reuse) a dataset and run the pipeline on it.
+
+    Args:
+        scale: Dataset size
+        data_dir: Directory for the generated CSVs
+        mongo: "fake" for an in-process database, or a MongoDB URI
+        database: Database to load into (its collections are dropped)
+        seed: Dataset random seed
+        load_mode: Pipeline load mode
+        workers: Transform worker processes
+        stream: Stream ratings in chunks
+        use_cache: Allow the typed Parquet CSV cache (off keeps runs comparable)
+        trace_memory: Record tracemalloc peaks
+        columnar_load: Encode ratings to BSON from columns (needs mongod; mongomock rejects raw BSON)
+        log_level: Log level inside the pipeline process
+
+    Returns:
+        Baseline record with settings, environment, totals and per-stage metrics
+    """
+    if columnar_load and mongo == "fake":
+        raise ValueError("Columnar loads insert raw BSON, which the in-process database does not accept; use --mongo URI")
+
+    dataset = ensure_dataset(data_dir, scale, seed)
+    options = {
+        "load_mode": load_mode,
+        "workers": workers,
+        "stream": stream,
+        "use_cache": use_cache,
+        "trace_memory": trace_memory,
+        "columnar_load": columnar_load,
+    }
+
+    logger.info(f"Running {scale.name} benchmark against {'in-process database' if mongo == 'fake' else 'mongod'}")
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        result = executor.submit(_run_pipeline, str(data_dir), mongo, database, options, log_level).result()
+
+    if "error" in result:
+        raise RuntimeError(f"Benchmark pipeline failed: {result['error']}")
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "dataset": dataset,
+        # Never record the URI itself: it may carry credentials
+        "database": "in-process" if mongo == "fake" else "mongod",
+        "options": options,
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "loaded": {key: result[key] for key in ("games", "users", "ratings")},
+        "total_seconds": round(result["total_seconds"], 3),
+        "stages": result["metrics"],
+    }
+
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float = 0.2) -> tuple[list[str], bool]:
+    """
+    Compare per-stage wall time and peak RSS against a baseline.
+
+    Args:
+        current: Record from run_benchmark
+        baseline: Earlier record from run_benchmark
+        threshold: Relative slowdown flagged as a regression (0.2 = 20%)
+
+    Returns:
+        Tuple of (report lines, whether any stage regressed)
+    """
+    lines = []
+    if current["dataset"] != baseline["dataset"] or current["options"] != baseline["options"]:
+        lines.append("WARNING: dataset or options differ from the baseline; timings are not comparable")
+
+    baseline_stages = {stage["stage"]: stage for stage in baseline["stages"]}
+    regressed = False
+
+    lines.append(f"{'stage':<20}{'baseline s':>12}{'current s':>12}{'change':>9}{'RSS MiB':>16}")
+    for stage in current["stages"]:
+        before = baseline_stages.get(stage["stage"])
+        if before is None:
+            lines.append(f"{stage['stage']:<20}{'-':>12}{stage['wall_seconds']:>12.3f}{'new':>9}")
+            continue
+
+        change = stage["wall_seconds"] / before["wall_seconds"] - 1 if before["wall_seconds"] > 0 else 0.0
+        flag = ""
+        if change > threshold and before["wall_seconds"] >= MIN_COMPARED_SECONDS:
+            flag = "  REGRESSION"
+            regressed = True
+
+        rss = f"{before['peak_rss_mb']} -> {stage['peak_rss_mb']}"
+        lines.append(
+            f"{stage['stage']:<20}{before['wall_seconds']:>12.3f}{stage['wall_seconds']:>12.3f}"
+            f"{change:>+9.1%}{rss:>16}{flag}"
+        )
+
+    lines.append(f"{'total':<20}{baseline['total_seconds']:>12.3f}{current['total_seconds']:>12.3f}")
+    return lines, regressed
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the ETL pipeline on synthetic BGG-shaped data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    # 1k ratings against an in-process database (requires mongomock)
+    python -m etl.benchmark --scale small
+
+    # 100k ratings against a local mongod, saved as a baseline
+    python -m etl.benchmark --scale medium --mongo mongodb://localhost:27017 --output baseline.json
+
+    # Compare a later run with that baseline
+    python -m etl.benchmark --scale medium --mongo mongodb://localhost:27017 --compare baseline.json
+        """,
+    )
+    parser.add_argument("--scale", choices=SCALES.keys(), default="small", help="Dataset size (default: small)")
+    parser.add_argument(
+        "--mongo",
+        default="fake",
+        help='"fake" for an in-process database, or a MongoDB URI such as mongodb://localhost:27017 (default: fake)',
+    )
+    parser.add_argument(
+        "--database",
+        default=BENCHMARK_DATABASE,
+        help=f"Database to load into; its collections are dropped (default: {BENCHMARK_DATABASE})",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Directory for the generated CSVs (default: ./data/benchmark/<scale>)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Dataset random seed (default: 42)")
+    parser.add_argument("--load-mode", choices=LOAD_MODES, default="direct", help="Pipeline load mode")
+    parser.add_argument("--workers", type=int, default=1, help="Transform worker processes (default: 1)")
+    parser.add_argument("--stream", action="store_true", help="Stream ratings in chunks")
+    parser.add_argument("--cache", action="store_true", help="Allow the typed Parquet CSV cache")
+    parser.add_argument("--trace-memory", action="store_true", help="Record tracemalloc peaks (slower)")
+    parser.add_argument(
+        "--columnar-load",
+        action="store_true",
+        help="Encode ratings to BSON straight from columns (requires --mongo URI)",
+    )
+    parser.add_argument("--output", type=Path, help="Write the run record (baseline) as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare this run against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative stage slowdown reported as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 if --compare finds a regression",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level of the pipeline run (default: WARNING)",
+    )
+
+    args = parser.parse_args()
+    if args.columnar_load and args.mongo == "fake":
+        parser.error("--columnar-load requires --mongo URI (the in-process database does not accept raw BSON)")
+    setup_logging(level="INFO", log_to_file=False)
+
+    scale = SCALES[args.scale]
+    record = run_benchmark(
+        scale,
+        data_dir=args.data_dir or Path("./data/benchmark") / scale.name,
+        mongo=args.mongo,
+        database=args.database,
+        seed=args.seed,
+        load_mode=args.load_mode,
+        workers=args.workers,
+        stream=args.stream,
+        use_cache=args.cache,
+        trace_memory=args.trace_memory,
+        columnar_load=args.columnar_load,
+        log_level=args.log_level,
+    )
+
+    for stage in record["stages"]:
+        logger.info(
+            f"{stage['stage']:<20} {stage['wall_seconds']:>9.3f}s  {stage['docs_per_second']:>12.0f} docs/s  "
+            f"peak RSS {stage['peak_rss_mb']} MiB"
+        )
+    logger.info(f"Total: {record['total_seconds']:.3f}s, loaded {record['loaded']}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        logger.info(f"Wrote benchmark record to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressed = compare_to_baseline(record, baseline, args.threshold)
+        for line in lines:
+            logger.info(line)
+        if regressed and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Columnar BSON Encoding
+
+Encodes flat documents straight from NumPy column arrays into BSON, without
+building a Python dict (or ObjectId, float and datetime objects) per
+document. The encoded documents are handed to pymongo as RawBSONDocuments,
+which it sends as-is instead of encoding them again.
+
+Supported column types:
+    (n, 12) uint8      ObjectId (raw bytes)
+    float64            double
+    datetime64         UTC datetime (millisecond precision, like bson)
+    object / str       UTF-8 string
+"""
+
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from bson.raw_bson import RawBSONDocument
+
+# BSON element type bytes
+_DOUBLE = 0x01
+_STRING = 0x02
+_OBJECT_ID = 0x07
+_DATETIME = 0x09
+
+# Length prefix (int32) plus the trailing NUL of every document
+_DOCUMENT_OVERHEAD = 5
+
+
+def _as_bytes(values: np.ndarray, width: int) -> np.ndarray:
+    """View fixed-width little-endian values as an (n, width) uint8 array."""
+    return np.ascontiguousarray(values).view(np.uint8).reshape(-1, width)
+
+
+def _scatter(buffer: np.ndarray, positions: np.ndarray, rows: np.ndarray) -> None:
+    """Write row i of rows into buffer at positions[i]."""
+    buffer[positions[:, None] + np.arange(rows.shape[1])] = rows
+
+
+def _encode_column(column: np.ndarray) -> tuple[int, object]:
+    """
+    Prepare one column for encoding.
+
+    Returns:
+        Tuple of (BSON type byte, value bytes): an (n, width) uint8 array for
+        fixed-width types, or (codes, distinct encoded strings) for strings
+    """
+    column = np.asarray(column)
+    if column.dtype == np.uint8 and column.ndim == 2 and column.shape[1] == 12:
+        return _OBJECT_ID, column
+    if column.dtype == np.float64:
+        return _DOUBLE, _as_bytes(column.astype("<f8"), 8)
+    if np.issubdtype(column.dtype, np.datetime64):
+        return _DATETIME, _as_bytes(column.astype("datetime64[ms]").view("<i8"), 8)
+    if column.dtype == object or column.dtype.kind == "U":
+        codes, distinct = pd.factorize(column)
+        if (codes < 0).any():
+            raise ValueError("String columns must not contain missing values")
+        return _STRING, (codes, [f"{value}".encode("utf-8") + b"\x00" for value in distinct])
+
+    raise TypeError(f"Unsupported column dtype for BSON encoding: {column.dtype}")
+
+
+def encode_columns(columns: dict[str, np.ndarray]) -> tuple[bytes, np.ndarray]:
+    """
+    Encode rows of equal-length columns as concatenated BSON documents.
+
+    Fields appear in column order, so the bytes match bson.encode of the
+    equivalent dicts.
+
+    Args:
+        columns: Field name to column values, one entry per document
+
+    Returns:
+        Tuple of (buffer, offsets); document i is buffer[offsets[i]:offsets[i + 1]]
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    n = lengths.pop()
+
+    fields = []
+    row_lengths = np.full(n, _DOCUMENT_OVERHEAD, dtype=np.int64)
+    for name, values in columns.items():
+        type_byte, encoded = _encode_column(values)
+        header = np.frombuffer(bytes([type_byte]) + name.encode("utf-8") + b"\x00", dtype=np.uint8)
+
+        if type_byte == _STRING:
+            codes, distinct = encoded
+            string_lengths = np.array([len(value) for value in distinct], dtype=np.int64)[codes]
+            string_bytes = np.frombuffer(b"".join(distinct), dtype=np.uint8)
+            starts = np.cumsum([0] + [len(value) for value in distinct[:-1]], dtype=np.int64)[codes]
+            encoded = (string_lengths, string_bytes, starts)
+            row_lengths += len(header) + 4 + string_lengths
+        else:
+            row_lengths += len(header) + encoded.shape[1]
+        fields.append((header, type_byte, encoded))
+
+    offsets = np.concatenate([[0], np.cumsum(row_lengths)])
+    buffer = np.zeros(offsets[-1], dtype=np.uint8)
+    positions = offsets[:-1].copy()
+
+    _scatter(buffer, positions, _as_bytes(row_lengths.astype("<i4"), 4))
+    positions += 4
+    for header, type_byte, encoded in fields:
+        buffer[positions[:, None] + np.arange(len(header))] = header
+        positions += len(header)
+
+        if type_byte == _STRING:
+            string_lengths, string_bytes, starts = encoded
+            _scatter(buffer, positions, _as_bytes(string_lengths.astype("<i4"), 4))
+            positions += 4
+            # Copy each row's string (including its NUL) in one gather/scatter
+            within = np.arange(string_lengths.sum()) - np.repeat(np.cumsum(string_lengths) - string_lengths, string_lengths)
+            buffer[np.repeat(positions, string_lengths) + within] = string_bytes[np.repeat(starts, string_lengths) + within]
+            positions += string_lengths
+        else:
+            _scatter(buffer, positions, encoded)
+            positions += encoded.shape[1]
+
+    return buffer.tobytes(), offsets
+
+
+def raw_documents(buffer: bytes, offsets: np.ndarray) -> list[RawBSONDocument]:
+    """Wrap the documents of an encode_columns buffer for insert_many."""
+    bounds = offsets.tolist()
+    return [RawBSONDocument(buffer[start:end]) for start, end in zip(bounds, bounds[1:])]
+
+
+def iter_raw_documents(columns: dict[str, np.ndarray], batch_size: int = 10000) -> Iterator[RawBSONDocument]:
+    """
+    Lazily encode columns batch by batch.
+
+    Only one batch of encoded documents exists at a time beyond what the
+    consumer holds on to.
+
+    Args:
+        columns: Field name to column values
+        batch_size: Rows encoded at once
+
+    Yields:
+        RawBSONDocument per row
+    """
+    n = len(next(iter(columns.values()), []))
+    for start in range(0, n, batch_size):
+        batch = {name: values[start:start + batch_size] for name, values in columns.items()}
+        yield from raw_documents(*encode_columns(batch))
@@ -41,6 +41,9 @@ class CSVImportConfig:
     data_dir: Path
     file_pattern: str
     files_to_import: list[str]
+    stream_ratings: bool
+    chunk_size: int
+    use_cache: bool
 
     @classmethod
     def from_env(cls) -> "CSVImportConfig":
@@ -55,6 +58,9 @@ class CSVImportConfig:
             data_dir=base_dir,
             file_pattern=pattern,
             files_to_import=files,
+            stream_ratings=os.getenv("ETL_STREAM", "false").lower() == "true",
+            chunk_size=int(os.getenv("ETL_CHUNK_SIZE", "100000")),
+            use_cache=os.getenv("ETL_CSV_CACHE", "true").lower() == "true",
         )
 
 
@@ -71,11 +77,22 @@ class PipelineConfig:
     run_online_games_extract: bool
     run_transform: bool
     run_load: bool
+    run_similarities: bool
+    run_recommendations: bool
 
     # Processing parameters
     min_reviews_per_game: int
     min_reviews_per_user: int
     batch_size: int
+    load_concurrency: int
+    load_mode: str
+    workers: int
+    trace_memory: bool
+    columnar_load: bool
+    stats_prior_weight: float
+    similarity_method: str
+    similarity_top_k: int
+    recommendation_algorithms: list[str]
 
     # Retry configuration
     max_retries: int
@@ -84,6 +101,8 @@ class PipelineConfig:
     @classmethod
     def from_env(cls) -> "PipelineConfig":
         base_dir = Path(os.getenv("ETL_DATA_DIR", "./data"))
+        algorithms_str = os.getenv("ETL_RECOMMENDATION_ALGORITHMS", "popularity,knn")
+        algorithms = [a.strip().lower() for a in algorithms_str.split(",") if a.strip()]
 
         return cls(
             data_dir=base_dir / "raw",
@@ -93,9 +112,20 @@ class PipelineConfig:
             == "true",
             run_transform=os.getenv("ETL_RUN_TRANSFORM", "true").lower() == "true",
             run_load=os.getenv("ETL_RUN_LOAD", "true").lower() == "true",
+            run_similarities=os.getenv("ETL_RUN_SIMILARITIES", "false").lower() == "true",
+            run_recommendations=os.getenv("ETL_RUN_RECOMMENDATIONS", "false").lower() == "true",
             min_reviews_per_game=int(os.getenv("ETL_MIN_REVIEWS_GAME", "500")),
             min_reviews_per_user=int(os.getenv("ETL_MIN_REVIEWS_USER", "5")),
             batch_size=int(os.getenv("ETL_BATCH_SIZE", "1000")),
+            load_concurrency=int(os.getenv("ETL_LOAD_CONCURRENCY", "4")),
+            load_mode=os.getenv("ETL_LOAD_MODE", "direct").lower(),
+            workers=int(os.getenv("ETL_WORKERS", "1")),
+            trace_memory=os.getenv("ETL_TRACE_MEMORY", "false").lower() == "true",
+            columnar_load=os.getenv("ETL_COLUMNAR_LOAD", "false").lower() == "true",
+            stats_prior_weight=float(os.getenv("ETL_STATS_PRIOR_WEIGHT", "100")),
+            similarity_method=os.getenv("ETL_SIMILARITY_METHOD", "cosine").lower(),
+            similarity_top_k=int(os.getenv("ETL_SIMILARITY_TOP_K", "100")),
+            recommendation_algorithms=algorithms,
             max_retries=int(os.getenv("ETL_MAX_RETRIES", "3")),
             retry_delay=float(os.getenv("ETL_RETRY_DELAY", "1.0")),
         )
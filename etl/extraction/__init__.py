@@ -6,7 +6,7 @@ Web scraping and data extraction utilities for the ETL pipeline.
 
 from .bgg_scraper import BGGScraper, scrape_bgg_games
 from .bgg_credits_scraper import BGGCreditsScraper, scrape_game_credits
-from .bgg_ratings_scraper import BGGRatingsScraper, scrape_game_ratings
+from .bgg_ratings_scraper import AsyncBGGRatingsScraper, BGGRatingsScraper, scrape_game_ratings
 from .bgg_credits_batch_scraper import process_csv_credits
 
 __all__ = [
@@ -15,6 +15,7 @@ __all__ = [
     "BGGCreditsScraper",
     "scrape_game_credits",
     "BGGRatingsScraper",
+    "AsyncBGGRatingsScraper",
     "scrape_game_ratings",
     "process_csv_credits",
 ]
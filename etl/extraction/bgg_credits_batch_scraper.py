@@ -2,7 +2,9 @@
 BoardGameGeek Credits Batch Scraper
 
 Processes CSV files with game data and extracts credits information for each game.
-Handles batch processing with progress saving and graceful cancellation.
+Handles batch processing with progress saving and graceful cancellation: every
+batch is appended as a segment (see etl.extraction.checkpoint), and segments are
+compacted into the output CSV at the end of the run.
 
 Usage:
     python -m etl.extraction.bgg_credits_batch_scraper \
@@ -17,7 +19,6 @@ DELAY_BETWEEN_REQUESTS = 5.0  # Delay between credit page requests (seconds)
 DEFAULT_TIMEOUT = 30  # Request timeout (seconds)
 
 import json
-import time
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 
@@ -26,6 +27,9 @@ from tqdm import tqdm
 
 from etl.logger import get_logger
 from etl.extraction.bgg_credits_scraper import BGGCreditsScraper
+from etl.extraction.checkpoint import CheckpointWriter
+from etl.extraction.http_cache import ResponseCache, add_cache_arguments, cache_from_args
+from etl.extraction.rate_limit import RateController, add_max_rate_argument, rate_for_delay
 
 logger = get_logger(__name__)
 
@@ -35,8 +39,10 @@ def process_csv_credits(
     output_csv: Path,
     cookie: Optional[str] = None,
     batch_size: int = BATCH_SIZE,
-    delay_between_requests: float = DELAY_BETWEEN_REQUESTS,
+    delay_between_requests: Optional[float] = None,
     start_from_row: int = 0,
+    cache: Optional[ResponseCache] = None,
+    max_rate: Optional[float] = None,
 ) -> None:
     """
     Process a CSV file and extract credits for each game.
@@ -46,8 +52,12 @@ def process_csv_credits(
         output_csv: Path to output CSV file for credits data
         cookie: Optional Cookie header value for authenticated requests
         batch_size: Number of games to process before saving progress
-        delay_between_requests: Delay between credit page requests (seconds)
+        delay_between_requests: Delay between credit page requests (seconds) to start at, ahead of a learned
+            rate (default: the learned rate, else DELAY_BETWEEN_REQUESTS)
         start_from_row: Row index to start from (for resuming)
+        cache: Response cache for the credits requests (default: from the environment)
+        max_rate: Highest requests per second (default: $ETL_SCRAPER_MAX_RATE, else the requested rate,
+            else the controller default)
     """
     input_path = Path(input_csv)
     output_path = Path(output_csv)
@@ -86,97 +96,20 @@ def process_csv_credits(
     logger.info(f"📊 Total games to process: {total_games}")
     logger.info("=" * 80)
 
-    # Load existing results if output file exists (for resuming)
-    existing_bgg_ids = set()
-    all_credits_data = []
-    if output_path.exists():
-        try:
-            existing_df = pd.read_csv(output_path)
-            if "bggId" in existing_df.columns:
-                existing_bgg_ids = set(existing_df["bggId"].astype(str))
-                # Convert existing CSV data back to nested format for processing
-                # We'll need to parse JSON strings back to lists
-                for _, row in existing_df.iterrows():
-                    try:
-                        credits_entry = {
-                            "bggId": str(row["bggId"]),
-                            "mechanics": (
-                                json.loads(row.get("mechanics", "[]"))
-                                if pd.notna(row.get("mechanics"))
-                                and row.get("mechanics")
-                                else []
-                            ),
-                            "categories": (
-                                json.loads(row.get("categories", "[]"))
-                                if pd.notna(row.get("categories"))
-                                and row.get("categories")
-                                else []
-                            ),
-                            "designers": (
-                                json.loads(row.get("designers", "[]"))
-                                if pd.notna(row.get("designers"))
-                                and row.get("designers")
-                                else []
-                            ),
-                            "alternateNames": (
-                                json.loads(row.get("alternateNames", "[]"))
-                                if pd.notna(row.get("alternateNames"))
-                                and row.get("alternateNames")
-                                else []
-                            ),
-                            "imageUrl": (
-                                row.get("imageUrl")
-                                if pd.notna(row.get("imageUrl"))
-                                else None
-                            ),
-                            "gameplay": {},
-                        }
-                        # Reconstruct gameplay dict from columns
-                        gameplay_cols = [
-                            col
-                            for col in existing_df.columns
-                            if col.startswith("gameplay_")
-                        ]
-                        for col in gameplay_cols:
-                            key = col.replace("gameplay_", "")
-                            if pd.notna(row.get(col)):
-                                credits_entry["gameplay"][key] = row[col]
-                        all_credits_data.append(credits_entry)
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.warning(
-                            f"Error parsing existing entry for bggId {row.get('bggId')}: {e}"
-                        )
-                        continue
-                logger.info(
-                    f"📋 Found {len(existing_bgg_ids)} existing credits entries"
-                )
-                logger.info(f"🔄 Resuming from where we left off...")
-        except Exception as e:
-            logger.warning(f"Could not read existing output file: {e}")
-
-    # Track collected data for progress saving
-    collected_credits: List[Dict[str, Any]] = []
-
-    def save_progress(current_credits: List[Dict[str, Any]]) -> None:
-        """Save current progress to CSV file."""
-        nonlocal collected_credits
-        collected_credits = current_credits
-
-        if current_credits:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            # Flatten nested structures for CSV
-            flattened_credits = flatten_credits_for_csv(current_credits)
-            df_output = pd.DataFrame(flattened_credits)
-            df_output.to_csv(output_path, index=False, encoding="utf-8")
-            logger.debug(
-                f"💾 Progress saved: {len(current_credits)} credits to {output_path}"
-            )
+    # Games already scraped come from the checkpoint manifest (for resuming)
+    writer = CheckpointWriter(output_path)
 
     try:
+        controller = RateController.shared(
+            rate=rate_for_delay(delay_between_requests),
+            initial_rate=1.0 / DELAY_BETWEEN_REQUESTS,
+            max_rate=max_rate,
+        )
         with BGGCreditsScraper(
-            delay_between_requests=delay_between_requests,
+            controller=controller,
             timeout=DEFAULT_TIMEOUT,
             cookie=cookie,
+            cache=cache,
         ) as scraper:
             processed_count = 0
             skipped_count = 0
@@ -189,7 +122,7 @@ def process_csv_credits(
                 if idx < start_from_row:
                     continue
                 bgg_id = str(row["bggId"])
-                if bgg_id in existing_bgg_ids:
+                if bgg_id in writer.completed:
                     skipped_count += 1
                     continue
                 detail_url = row["detailUrl"]
@@ -237,7 +170,7 @@ def process_csv_credits(
                         if credits_data:
                             # Add bggId to credits data
                             credits_data["bggId"] = bgg_id
-                            all_credits_data.append(credits_data)
+                            writer.add(bgg_id, flatten_credits_for_csv([credits_data]))
                             processed_count += 1
                             new_entries_count += 1
 
@@ -263,7 +196,7 @@ def process_csv_credits(
                                 "imageUrl": None,
                                 "gameplay": {},
                             }
-                            all_credits_data.append(empty_credits)
+                            writer.add(bgg_id, flatten_credits_for_csv([empty_credits]))
                             new_entries_count += 1
                             error_count += 1
 
@@ -272,7 +205,7 @@ def process_csv_credits(
                             new_entries_count > 0
                             and new_entries_count % batch_size == 0
                         ):
-                            save_progress(all_credits_data)
+                            writer.flush()
                             percentage = (
                                 (processed_count / remaining_games * 100)
                                 if remaining_games > 0
@@ -283,16 +216,12 @@ def process_csv_credits(
                                 f"{processed_count}/{remaining_games} processed ({percentage:.1f}%), "
                                 f"{skipped_count} skipped, "
                                 f"{error_count} errors, "
-                                f"{len(all_credits_data)} total entries"
+                                f"{len(writer.completed)} total entries"
                             )
 
                         # Update progress bar
                         pbar.update(1)
 
-                        # Delay between requests
-                        if idx < len(df) - 1:
-                            time.sleep(delay_between_requests)
-
                     except KeyboardInterrupt:
                         logger.warning(f"\n⚠ Processing interrupted at row {idx + 1}")
                         raise
@@ -309,20 +238,20 @@ def process_csv_credits(
                             "imageUrl": None,
                             "gameplay": {},
                         }
-                        all_credits_data.append(empty_credits)
+                        writer.add(bgg_id, flatten_credits_for_csv([empty_credits]))
                         new_entries_count += 1
                         pbar.update(1)
                         continue
 
             # Final save
-            save_progress(all_credits_data)
+            writer.compact()
             logger.info("=" * 80)
             logger.info("✅ Scraping completed successfully!")
             logger.info(f"📈 Final Statistics:")
             logger.info(f"   • Processed: {processed_count} games")
             logger.info(f"   • Skipped: {skipped_count} games")
             logger.info(f"   • Errors: {error_count} games")
-            logger.info(f"   • Total entries: {len(all_credits_data)}")
+            logger.info(f"   • Total entries: {len(writer.completed)}")
             logger.info(f"💾 Data saved to: {output_path}")
             logger.info("=" * 80)
 
@@ -332,24 +261,10 @@ def process_csv_credits(
         logger.warning("⚠ Processing interrupted by user")
         logger.warning("=" * 80)
 
-        if collected_credits:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            flattened_credits = flatten_credits_for_csv(collected_credits)
-            df_output = pd.DataFrame(flattened_credits)
-            df_output.to_csv(output_path, index=False, encoding="utf-8")
-            logger.info(
-                f"💾 Saving {len(collected_credits)} collected credits before exit..."
-            )
-            logger.info(f"✓ Data saved to {output_path}")
-        elif all_credits_data:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            flattened_credits = flatten_credits_for_csv(all_credits_data)
-            df_output = pd.DataFrame(flattened_credits)
-            df_output.to_csv(output_path, index=False, encoding="utf-8")
-            logger.info(
-                f"💾 Saving {len(all_credits_data)} collected credits before exit..."
-            )
-            logger.info(f"✓ Data saved to {output_path}")
+        if writer.completed or writer.pending_games:
+            logger.info("💾 Saving collected credits before exit...")
+            writer.compact()
+            logger.info(f"✓ {len(writer.completed)} credits entries saved to {output_path}")
         else:
             logger.warning("⚠ No credits collected before interruption.")
 
@@ -441,15 +356,18 @@ if __name__ == "__main__":
     parser.add_argument(
         "--delay",
         type=float,
-        default=DELAY_BETWEEN_REQUESTS,
-        help=f"Delay between requests in seconds (default: {DELAY_BETWEEN_REQUESTS})",
+        default=None,
+        help="Delay between requests in seconds to start at, ahead of the learned request rate "
+        f"(default: the learned rate, else {DELAY_BETWEEN_REQUESTS})",
     )
+    add_max_rate_argument(parser)
     parser.add_argument(
         "--start-from-row",
         type=int,
         default=0,
         help="Row index to start from (0-indexed, for resuming)",
     )
+    add_cache_arguments(parser)
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -460,6 +378,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     setup_logging(level=args.log_level)
+    cache = cache_from_args(args)
 
     try:
         process_csv_credits(
@@ -469,6 +388,8 @@ if __name__ == "__main__":
             batch_size=args.batch_size,
             delay_between_requests=args.delay,
             start_from_row=args.start_from_row,
+            cache=cache,
+            max_rate=args.max_rate,
         )
 
         print("\nCredits extraction completed successfully!")
@@ -477,3 +398,6 @@ if __name__ == "__main__":
         # Already handled in process_csv_credits, just exit gracefully
         print("\nProcessing cancelled by user.")
         exit(0)
+    finally:
+        if cache:
+            cache.close()
@@ -19,6 +19,8 @@ from urllib.parse import urljoin
 
 import requests
 
+from etl.extraction.http_cache import ResponseCache
+from etl.extraction.rate_limit import RateController, ThrottledSession, rate_for_delay
 from etl.logger import get_logger
 
 logger = get_logger(__name__)
@@ -41,21 +43,28 @@ class BGGCreditsScraper:
 
     def __init__(
         self,
-        delay_between_requests: float = 1.0,
+        delay_between_requests: Optional[float] = None,
         timeout: int = 30,
         cookie: Optional[str] = None,
+        controller: Optional[RateController] = None,
+        cache: Optional[ResponseCache] = None,
     ):
         """
         Initialize the scraper.
 
         Args:
-            delay_between_requests: Delay between HTTP requests (seconds)
+            delay_between_requests: Delay between HTTP requests (seconds) to start at, ahead of a learned rate
+                (default: the learned rate, else 1 request/s)
             timeout: Request timeout (seconds)
             cookie: Optional Cookie header value for authenticated requests
+            controller: Rate controller pacing the requests (default: the shared BGG controller)
+            cache: Response cache for GET requests (default: ResponseCache.shared(), off unless ETL_HTTP_CACHE is set)
         """
         self.delay_between_requests = delay_between_requests
         self.timeout = timeout
-        self.session = requests.Session()
+        self.controller = controller or RateController.shared(rate=rate_for_delay(delay_between_requests))
+        self.cache = cache or ResponseCache.shared()
+        self.session = ThrottledSession(self.controller, cache=self.cache)
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
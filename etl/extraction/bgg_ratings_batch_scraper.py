@@ -2,13 +2,21 @@
 BoardGameGeek Ratings Batch Scraper
 
 Processes CSV files with game data and extracts ratings information for each game.
-Handles batch processing with progress saving and graceful cancellation.
+Handles batch processing with progress saving and graceful cancellation: every
+batch is appended as a segment (see etl.extraction.checkpoint), and segments are
+compacted into the output CSV at the end of the run.
 
 Usage:
     python -m etl.extraction.bgg_ratings_batch_scraper \
         --input data/test_bgg_games_1_100.csv \
         --output data/game_ratings.csv \
         --cookie "your-cookie-here"
+
+    # Scrape 8 games at a time, starting at 2 requests per second
+    python -m etl.extraction.bgg_ratings_batch_scraper \
+        --input data/test_bgg_games_1_100.csv \
+        --output data/game_ratings.csv \
+        --concurrency 8 --rate 2
 """
 
 # Configuration
@@ -16,47 +24,33 @@ BATCH_SIZE = 10  # Number of games to process before saving progress
 DELAY_BETWEEN_REQUESTS = 5.0  # Delay between rating page requests (seconds)
 DEFAULT_TIMEOUT = 30  # Request timeout (seconds)
 DEFAULT_MAX_PAGES = 30  # Default maximum pages per game
+DEFAULT_CONCURRENCY = 8  # Games in flight with --concurrency (async scraper)
 
-import time
+import asyncio
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional
 
 import pandas as pd
 from tqdm import tqdm
 
 from etl.logger import get_logger
-from etl.extraction.bgg_ratings_scraper import BGGRatingsScraper
+from etl.extraction.bgg_ratings_scraper import AsyncBGGRatingsScraper, BGGRatingsScraper
+from etl.extraction.checkpoint import CheckpointWriter
+from etl.extraction.rate_limit import RateController, add_max_rate_argument, rate_for_delay
 
 logger = get_logger(__name__)
 
 
-def process_csv_ratings(
-    input_csv: Path,
-    output_csv: Path,
-    cookie: Optional[str] = None,
-    batch_size: int = BATCH_SIZE,
-    delay_between_requests: float = DELAY_BETWEEN_REQUESTS,
-    max_pages: int = DEFAULT_MAX_PAGES,
-    start_from_row: int = 0,
-) -> None:
+def _read_games(input_path: Path) -> Optional[pd.DataFrame]:
     """
-    Process a CSV file and extract ratings for each game.
+    Read the input CSV and keep the rows that have a bggId.
 
-    Args:
-        input_csv: Path to input CSV file with game data
-        output_csv: Path to output CSV file for ratings data
-        cookie: Optional Cookie header value for authenticated requests
-        batch_size: Number of games to process before saving progress
-        delay_between_requests: Delay between rating page requests (seconds)
-        max_pages: Maximum number of pages to scrape per game
-        start_from_row: Row index to start from (for resuming)
+    Returns:
+        Games to scrape, or None if the CSV is missing or unusable (already logged)
     """
-    input_path = Path(input_csv)
-    output_path = Path(output_csv)
-
     if not input_path.exists():
         logger.error(f"Input CSV file not found: {input_path}")
-        return
+        return None
 
     # Read input CSV
     logger.info("=" * 80)
@@ -66,14 +60,14 @@ def process_csv_ratings(
         logger.info(f"✓ Successfully loaded CSV with {len(df)} rows")
     except Exception as e:
         logger.error(f"✗ Failed to read input CSV: {e}")
-        return
+        return None
 
     # Check required columns
     required_columns = ["bggId"]
     missing_columns = [col for col in required_columns if col not in df.columns]
     if missing_columns:
         logger.error(f"✗ Missing required columns in CSV: {missing_columns}")
-        return
+        return None
 
     # Filter out rows with missing bggId
     initial_count = len(df)
@@ -82,57 +76,55 @@ def process_csv_ratings(
     if filtered_count > 0:
         logger.warning(f"⚠ Filtered out {filtered_count} rows with missing bggId")
 
-    total_games = len(df)
-    logger.info(f"📊 Total games to process: {total_games}")
+    logger.info(f"📊 Total games to process: {len(df)}")
     logger.info("=" * 80)
+    return df
 
-    # Load existing results if output file exists (for resuming)
-    existing_bgg_ids = set()
-    all_ratings_data = []
-    if output_path.exists():
-        try:
-            existing_df = pd.read_csv(output_path)
-            if "bggId" in existing_df.columns:
-                existing_bgg_ids = set(existing_df["bggId"].astype(str))
-                # Load existing ratings data
-                for _, row in existing_df.iterrows():
-                    rating_entry = {
-                        "bggId": str(row["bggId"]),
-                        "rating": row.get("rating"),
-                        "rating_tstamp": row.get("rating_tstamp"),
-                        "username": row.get("username"),
-                        "isocountry": row.get("isocountry", ""),
-                    }
-                    # Preserve rating_count if it exists (for backward compatibility)
-                    if "rating_count" in existing_df.columns:
-                        rating_entry["rating_count"] = row.get("rating_count")
-                    all_ratings_data.append(rating_entry)
-                logger.info(
-                    f"📋 Found {len(existing_bgg_ids)} unique games with existing ratings"
-                )
-                logger.info(f"🔄 Resuming from where we left off...")
-        except Exception as e:
-            logger.warning(f"Could not read existing output file: {e}")
-
-    # Track collected data for progress saving
-    collected_ratings: List[Dict[str, Any]] = []
-
-    def save_progress(current_ratings: List[Dict[str, Any]]) -> None:
-        """Save current progress to CSV file."""
-        nonlocal collected_ratings
-        collected_ratings = current_ratings
-
-        if current_ratings:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            df_output = pd.DataFrame(current_ratings)
-            df_output.to_csv(output_path, index=False, encoding="utf-8")
-            logger.debug(
-                f"💾 Progress saved: {len(current_ratings)} ratings to {output_path}"
-            )
+
+def process_csv_ratings(
+    input_csv: Path,
+    output_csv: Path,
+    cookie: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    delay_between_requests: Optional[float] = None,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    start_from_row: int = 0,
+    max_rate: Optional[float] = None,
+) -> None:
+    """
+    Process a CSV file and extract ratings for each game.
+
+    Args:
+        input_csv: Path to input CSV file with game data
+        output_csv: Path to output CSV file for ratings data
+        cookie: Optional Cookie header value for authenticated requests
+        batch_size: Number of games to process before saving progress
+        delay_between_requests: Delay between rating page requests (seconds) to start at, ahead of a learned
+            rate (default: the learned rate, else DELAY_BETWEEN_REQUESTS)
+        max_pages: Maximum number of pages to scrape per game
+        start_from_row: Row index to start from (for resuming)
+        max_rate: Highest requests per second (default: $ETL_SCRAPER_MAX_RATE, else the requested rate,
+            else the controller default)
+    """
+    input_path = Path(input_csv)
+    output_path = Path(output_csv)
+
+    df = _read_games(input_path)
+    if df is None:
+        return
+    total_games = len(df)
+
+    # Games already scraped come from the checkpoint manifest (for resuming)
+    writer = CheckpointWriter(output_path)
 
     try:
+        controller = RateController.shared(
+            rate=rate_for_delay(delay_between_requests),
+            initial_rate=1.0 / DELAY_BETWEEN_REQUESTS,
+            max_rate=max_rate,
+        )
         with BGGRatingsScraper(
-            delay_between_requests=delay_between_requests,
+            controller=controller,
             timeout=DEFAULT_TIMEOUT,
             cookie=cookie,
         ) as scraper:
@@ -147,7 +139,7 @@ def process_csv_ratings(
                 if idx < start_from_row:
                     continue
                 bgg_id = str(row["bggId"])
-                if bgg_id in existing_bgg_ids:
+                if bgg_id in writer.completed:
                     skipped_count += 1
                     continue
                 rows_to_process.append((idx, row))
@@ -176,7 +168,7 @@ def process_csv_ratings(
                             "Processed": processed_count,
                             "Skipped": skipped_count,
                             "Errors": error_count,
-                            "Ratings": len(all_ratings_data),
+                            "Ratings": writer.rows_written,
                         }
                     )
 
@@ -191,8 +183,7 @@ def process_csv_ratings(
                         )
 
                         if ratings_data:
-                            # Add all ratings to the list
-                            all_ratings_data.extend(ratings_data)
+                            writer.add(bgg_id, ratings_data)
                             processed_count += 1
                             new_ratings_count += len(ratings_data)
 
@@ -208,7 +199,7 @@ def process_csv_ratings(
 
                         # Save progress every batch_size new games processed
                         if processed_count > 0 and processed_count % batch_size == 0:
-                            save_progress(all_ratings_data)
+                            writer.flush()
                             percentage = (
                                 (processed_count / remaining_games * 100)
                                 if remaining_games > 0
@@ -219,16 +210,12 @@ def process_csv_ratings(
                                 f"{processed_count}/{remaining_games} games processed ({percentage:.1f}%), "
                                 f"{skipped_count} skipped, "
                                 f"{error_count} errors, "
-                                f"{len(all_ratings_data)} total ratings"
+                                f"{writer.rows_written} total ratings"
                             )
 
                         # Update progress bar
                         pbar.update(1)
 
-                        # Delay between requests (for different games)
-                        if idx < len(df) - 1:
-                            time.sleep(delay_between_requests)
-
                     except KeyboardInterrupt:
                         logger.warning(f"\n⚠ Processing interrupted at row {idx + 1}")
                         raise
@@ -240,14 +227,14 @@ def process_csv_ratings(
                         continue
 
             # Final save
-            save_progress(all_ratings_data)
+            writer.compact()
             logger.info("=" * 80)
             logger.info("✅ Scraping completed successfully!")
             logger.info(f"📈 Final Statistics:")
             logger.info(f"   • Processed: {processed_count} games")
             logger.info(f"   • Skipped: {skipped_count} games")
             logger.info(f"   • Errors: {error_count} games")
-            logger.info(f"   • Total ratings: {len(all_ratings_data)}")
+            logger.info(f"   • Total ratings: {writer.rows_written}")
             logger.info(f"💾 Data saved to: {output_path}")
             logger.info("=" * 80)
 
@@ -257,22 +244,10 @@ def process_csv_ratings(
         logger.warning("⚠ Processing interrupted by user")
         logger.warning("=" * 80)
 
-        if collected_ratings:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            df_output = pd.DataFrame(collected_ratings)
-            df_output.to_csv(output_path, index=False, encoding="utf-8")
-            logger.info(
-                f"💾 Saving {len(collected_ratings)} collected ratings before exit..."
-            )
-            logger.info(f"✓ Data saved to {output_path}")
-        elif all_ratings_data:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            df_output = pd.DataFrame(all_ratings_data)
-            df_output.to_csv(output_path, index=False, encoding="utf-8")
-            logger.info(
-                f"💾 Saving {len(all_ratings_data)} collected ratings before exit..."
-            )
-            logger.info(f"✓ Data saved to {output_path}")
+        if writer.completed or writer.pending_games:
+            logger.info("💾 Saving collected ratings before exit...")
+            writer.compact()
+            logger.info(f"✓ {writer.rows_written} ratings saved to {output_path}")
         else:
             logger.warning("⚠ No ratings collected before interruption.")
 
@@ -283,6 +258,107 @@ def process_csv_ratings(
         raise
 
 
+def process_csv_ratings_async(
+    input_csv: Path,
+    output_csv: Path,
+    cookie: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    requests_per_second: Optional[float] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    start_from_row: int = 0,
+    max_rate: Optional[float] = None,
+) -> None:
+    """
+    Process a CSV file like process_csv_ratings, scraping many games at once.
+
+    Up to `concurrency` games are in flight and one rate controller paces all
+    requests (starting at `requests_per_second` if given), replacing the fixed sleeps. The output
+    CSV (columns, one row per rating, resuming by bggId) is the same; games
+    are written in the order they finish.
+
+    Args:
+        input_csv: Path to input CSV file with game data
+        output_csv: Path to output CSV file for ratings data
+        cookie: Optional Cookie header value for authenticated requests
+        batch_size: Number of games to process before saving progress
+        requests_per_second: Request rate across all games to start at, ahead of a learned rate
+            (default: the learned rate, else 1 / DELAY_BETWEEN_REQUESTS)
+        concurrency: Games scraped at the same time
+        max_pages: Maximum number of pages to scrape per game
+        start_from_row: Row index to start from (for resuming)
+        max_rate: Highest requests per second (default: $ETL_SCRAPER_MAX_RATE, else the requested rate,
+            else the controller default)
+    """
+    input_path = Path(input_csv)
+    output_path = Path(output_csv)
+
+    df = _read_games(input_path)
+    if df is None:
+        return
+    writer = CheckpointWriter(output_path)
+
+    candidates = [str(bgg_id) for idx, bgg_id in df["bggId"].items() if idx >= start_from_row]
+    bgg_ids = [bgg_id for bgg_id in candidates if bgg_id not in writer.completed]
+    skipped_count = len(candidates) - len(bgg_ids)
+    logger.info(f"🎯 Games remaining to process: {len(bgg_ids)}")
+    logger.info(f"⏭️  Games already processed (skipped): {skipped_count}")
+    controller = RateController.shared(
+        rate=requests_per_second, initial_rate=1.0 / DELAY_BETWEEN_REQUESTS, max_rate=max_rate
+    )
+    logger.info(f"🚦 {concurrency} games in flight, starting at {controller.rate:.2f} requests/s")
+    logger.info("=" * 80)
+
+    counts = {"processed": 0, "errors": 0}
+
+    async def scrape() -> None:
+        async with AsyncBGGRatingsScraper(
+            controller=controller,
+            concurrency=concurrency,
+            timeout=DEFAULT_TIMEOUT,
+            cookie=cookie,
+        ) as scraper:
+            with tqdm(total=len(bgg_ids), desc="Scraping games", unit="game") as pbar:
+                async for bgg_id, ratings_data, error in scraper.scrape_many(bgg_ids, max_pages):
+                    counts["processed"] += 1
+                    if error is not None:
+                        logger.error(f"✗ Error processing game {bgg_id}: {error}")
+                        counts["errors"] += 1
+                    elif ratings_data:
+                        writer.add(bgg_id, ratings_data)
+                    else:
+                        logger.warning(f"⚠ No ratings extracted for BGG ID {bgg_id}")
+                        counts["errors"] += 1
+
+                    if counts["processed"] % batch_size == 0:
+                        writer.flush()
+                        logger.info(
+                            f"📊 Progress Update: {counts['processed']}/{len(bgg_ids)} games processed, "
+                            f"{counts['errors']} errors, {writer.rows_written} total ratings"
+                        )
+                    pbar.set_postfix({"Errors": counts["errors"], "Ratings": writer.rows_written})
+                    pbar.update(1)
+
+    try:
+        asyncio.run(scrape())
+    except KeyboardInterrupt:
+        logger.warning("⚠ Processing interrupted by user")
+        writer.compact()
+        logger.info(f"💾 Saved {writer.rows_written} collected ratings to {output_path}")
+        raise
+
+    writer.compact()
+    logger.info("=" * 80)
+    logger.info("✅ Scraping completed successfully!")
+    logger.info(f"📈 Final Statistics:")
+    logger.info(f"   • Processed: {counts['processed']} games")
+    logger.info(f"   • Skipped: {skipped_count} games")
+    logger.info(f"   • Errors: {counts['errors']} games")
+    logger.info(f"   • Total ratings: {writer.rows_written}")
+    logger.info(f"💾 Data saved to: {output_path}")
+    logger.info("=" * 80)
+
+
 if __name__ == "__main__":
     import argparse
     from etl.logger import setup_logging
@@ -317,9 +393,25 @@ if __name__ == "__main__":
     parser.add_argument(
         "--delay",
         type=float,
-        default=DELAY_BETWEEN_REQUESTS,
-        help=f"Delay between requests in seconds (default: {DELAY_BETWEEN_REQUESTS})",
+        default=None,
+        help="Delay between requests in seconds to start at, ahead of the learned request rate "
+        f"(default: the learned rate, else {DELAY_BETWEEN_REQUESTS})",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Games scraped at once under a shared request rate; 1 scrapes one game "
+        f"at a time (default: 1, e.g. {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Requests per second across all games with --concurrency to start at, ahead of the learned "
+        "request rate (default: 1 / --delay if given, else the learned rate)",
+    )
+    add_max_rate_argument(parser)
     parser.add_argument(
         "--max-pages",
         type=int,
@@ -344,15 +436,29 @@ if __name__ == "__main__":
     setup_logging(level=args.log_level)
 
     try:
-        process_csv_ratings(
-            input_csv=args.input,
-            output_csv=args.output,
-            cookie=args.cookie,
-            batch_size=args.batch_size,
-            delay_between_requests=args.delay,
-            max_pages=args.max_pages,
-            start_from_row=args.start_from_row,
-        )
+        if args.concurrency > 1:
+            process_csv_ratings_async(
+                input_csv=args.input,
+                output_csv=args.output,
+                cookie=args.cookie,
+                batch_size=args.batch_size,
+                requests_per_second=args.rate or rate_for_delay(args.delay),
+                concurrency=args.concurrency,
+                max_pages=args.max_pages,
+                start_from_row=args.start_from_row,
+                max_rate=args.max_rate,
+            )
+        else:
+            process_csv_ratings(
+                input_csv=args.input,
+                output_csv=args.output,
+                cookie=args.cookie,
+                batch_size=args.batch_size,
+                delay_between_requests=args.delay,
+                max_pages=args.max_pages,
+                start_from_row=args.start_from_row,
+                max_rate=args.max_rate,
+            )
 
         print("\nRatings extraction completed successfully!")
 
@@ -12,17 +12,45 @@ Usage:
         max_pages=10,
         cookie=None
     )
+
+    # Many games at once under one shared, adaptive request rate
+    async with AsyncBGGRatingsScraper(requests_per_second=2, concurrency=8) as scraper:
+        async for bgg_id, ratings, error in scraper.scrape_many(["59294", "13"]):
+            ...
 """
 
-import time
-from typing import Optional, List, Dict, Any
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable, Tuple
 
 import requests
 
+from etl.extraction.rate_limit import (
+    DEFAULT_MAX_RETRIES,
+    RateController,
+    ThrottledSession,
+    add_max_rate_argument,
+    rate_for_delay,
+)
 from etl.logger import get_logger
 
 logger = get_logger(__name__)
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+EXPECTED_ITEMS_PER_PAGE = 50  # API returns 50 items per page by default
+
+
+def _create_session(cookie: Optional[str] = None, controller: Optional[RateController] = None) -> requests.Session:
+    """Create a session with the scraper headers (and cookie), paced by controller if given."""
+    session = ThrottledSession(controller) if controller else requests.Session()
+    headers = {"User-Agent": USER_AGENT}
+    if cookie:
+        headers["Cookie"] = cookie
+    session.headers.update(headers)
+    return session
+
 
 class BGGRatingsScraper:
     """
@@ -40,28 +68,27 @@ class BGGRatingsScraper:
 
     def __init__(
         self,
-        delay_between_requests: float = 1.0,
+        delay_between_requests: Optional[float] = None,
         timeout: int = 30,
         cookie: Optional[str] = None,
+        controller: Optional[RateController] = None,
     ):
         """
         Initialize the scraper.
 
         Args:
-            delay_between_requests: Delay between HTTP requests (seconds)
+            delay_between_requests: Delay between HTTP requests (seconds) to start at, ahead of a learned rate
+                (default: the learned rate, else 1 request/s)
             timeout: Request timeout (seconds)
             cookie: Optional Cookie header value for authenticated requests
+            controller: Rate controller pacing the requests (default: the shared BGG controller)
         """
         self.delay_between_requests = delay_between_requests
         self.timeout = timeout
-        self.session = requests.Session()
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        self.controller = controller or RateController.shared(rate=rate_for_delay(delay_between_requests))
+        self.session = _create_session(cookie, self.controller)
         if cookie:
-            headers["Cookie"] = cookie
             logger.debug("🔐 Using authenticated requests with provided cookie")
-        self.session.headers.update(headers)
 
     def __enter__(self):
         """Context manager entry."""
@@ -71,6 +98,85 @@ class BGGRatingsScraper:
         """Context manager exit."""
         self.session.close()
 
+    @classmethod
+    def page_url(cls, bgg_id: str, page_id: int) -> str:
+        """API endpoint of one page of a game's ratings."""
+        return (
+            f"{cls.BASE_URL}?ajax=1&objectid={bgg_id}&objecttype=thing"
+            f"&oneperuser=1&pageid={page_id}&require_review=true"
+            f"&showcount=100&sort=review_tstamp"
+        )
+
+    @staticmethod
+    def parse_items(
+        bgg_id: str, items: List[Dict[str, Any]], rating_count: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Extract ratings from the items of one API page.
+
+        Args:
+            bgg_id: BGG ID of the game
+            items: Items of the page
+            rating_count: Ratings of this game extracted from earlier pages
+
+        Returns:
+            Tuple of (rating dictionaries, updated rating_count)
+        """
+        page_ratings = []
+        for item in items:
+            rating_data: Dict[str, Any] = {
+                "bggId": bgg_id,
+                "rating": None,
+                "rating_tstamp": None,
+                "username": None,
+                "isocountry": "",
+            }
+
+            # Extract rating
+            if "rating" in item:
+                rating_value = item["rating"]
+                # Handle both int and float ratings
+                if rating_value is not None:
+                    rating_data["rating"] = (
+                        float(rating_value)
+                        if isinstance(rating_value, (int, float))
+                        else None
+                    )
+
+            # Extract rating_tstamp
+            if "rating_tstamp" in item:
+                rating_tstamp = item["rating_tstamp"]
+                rating_data["rating_tstamp"] = (
+                    str(rating_tstamp) if rating_tstamp is not None else None
+                )
+
+            # Extract user information
+            if "user" in item and item["user"]:
+                user = item["user"]
+                if "username" in user:
+                    rating_data["username"] = (
+                        str(user["username"]) if user["username"] else None
+                    )
+                if "isocountry" in user:
+                    rating_data["isocountry"] = (
+                        str(user["isocountry"]) if user["isocountry"] else ""
+                    )
+
+            # Only add if we have at least rating and username
+            if (
+                rating_data["rating"] is not None
+                and rating_data["username"] is not None
+            ):
+                rating_count += 1
+                rating_data["rating_count"] = rating_count
+                page_ratings.append(rating_data)
+            else:
+                logger.debug(
+                    f"  ⚠ [{bgg_id}] Skipping item with missing rating or username"
+                )
+
+        return page_ratings, rating_count
+
     def scrape_ratings(self, bgg_id: str, max_pages: int = 10) -> List[Dict[str, Any]]:
         """
         Scrape ratings data for a game using the BGG API.
@@ -91,46 +197,21 @@ class BGGRatingsScraper:
         bgg_id = str(bgg_id)
         all_ratings = []
         rating_count = 0  # Counter for ratings per game
-        EXPECTED_ITEMS_PER_PAGE = 50  # API returns 50 items per page by default
 
         logger.info(
             f"🌐 Starting to fetch ratings for BGG ID: {bgg_id} (max {max_pages} pages)"
         )
 
         for page_id in range(max_pages):
-            # Add delay before each request (including the first one) to avoid rate limiting
-            if page_id > 0:
-                # Delay between page requests
-                time.sleep(self.delay_between_requests)
-            # Note: First page (page_id == 0) doesn't need a delay before it
-
+            # Requests are paced (and 429/503 retried) by the session's rate controller
             try:
-                # API endpoint with pagination
-                api_url = (
-                    f"{self.BASE_URL}?ajax=1&objectid={bgg_id}&objecttype=thing"
-                    f"&oneperuser=1&pageid={page_id}&require_review=true"
-                    f"&showcount=100&sort=review_tstamp"
-                )
+                api_url = self.page_url(bgg_id, page_id)
 
                 logger.info(
                     f"  📄 [{bgg_id}] Fetching page {page_id + 1}/{max_pages}..."
                 )
 
                 response = self.session.get(api_url, timeout=self.timeout)
-
-                # Check for rate limiting before raising for status
-                if response.status_code == 429:
-                    retry_delay = (
-                        self.delay_between_requests * 3
-                    )  # Triple the delay for rate limiting
-                    logger.warning(
-                        f"⚠ [{bgg_id}] Rate limited (429) on page {page_id + 1}. "
-                        f"Waiting {retry_delay:.1f}s before continuing..."
-                    )
-                    time.sleep(retry_delay)
-                    # Retry the request
-                    response = self.session.get(api_url, timeout=self.timeout)
-
                 response.raise_for_status()
                 data = response.json()
 
@@ -143,7 +224,6 @@ class BGGRatingsScraper:
 
                 items = data["items"]
                 items_count = len(items)
-                page_ratings = []
 
                 # If we got 0 items or fewer than expected (and not the first page), this is likely the last page
                 # Note: API returns 50 items per page by default, so we check if we got fewer than that
@@ -151,57 +231,7 @@ class BGGRatingsScraper:
                     items_count < EXPECTED_ITEMS_PER_PAGE and page_id > 0
                 )
 
-                for item in items:
-                    rating_data: Dict[str, Any] = {
-                        "bggId": bgg_id,
-                        "rating": None,
-                        "rating_tstamp": None,
-                        "username": None,
-                        "isocountry": "",
-                    }
-
-                    # Extract rating
-                    if "rating" in item:
-                        rating_value = item["rating"]
-                        # Handle both int and float ratings
-                        if rating_value is not None:
-                            rating_data["rating"] = (
-                                float(rating_value)
-                                if isinstance(rating_value, (int, float))
-                                else None
-                            )
-
-                    # Extract rating_tstamp
-                    if "rating_tstamp" in item:
-                        rating_tstamp = item["rating_tstamp"]
-                        rating_data["rating_tstamp"] = (
-                            str(rating_tstamp) if rating_tstamp is not None else None
-                        )
-
-                    # Extract user information
-                    if "user" in item and item["user"]:
-                        user = item["user"]
-                        if "username" in user:
-                            rating_data["username"] = (
-                                str(user["username"]) if user["username"] else None
-                            )
-                        if "isocountry" in user:
-                            rating_data["isocountry"] = (
-                                str(user["isocountry"]) if user["isocountry"] else ""
-                            )
-
-                    # Only add if we have at least rating and username
-                    if (
-                        rating_data["rating"] is not None
-                        and rating_data["username"] is not None
-                    ):
-                        rating_count += 1
-                        rating_data["rating_count"] = rating_count
-                        page_ratings.append(rating_data)
-                    else:
-                        logger.debug(
-                            f"  ⚠ [{bgg_id}] Skipping item with missing rating or username"
-                        )
+                page_ratings, rating_count = self.parse_items(bgg_id, items, rating_count)
 
                 if page_ratings:
                     all_ratings.extend(page_ratings)
@@ -223,16 +253,11 @@ class BGGRatingsScraper:
                     break
 
             except requests.HTTPError as e:
-                # Handle 429 Too Many Requests with longer delay (if not already handled above)
+                # Still throttled after the session's retries
                 if e.response is not None and e.response.status_code == 429:
-                    retry_delay = (
-                        self.delay_between_requests * 3
-                    )  # Triple the delay for rate limiting
                     logger.warning(
-                        f"⚠ [{bgg_id}] Rate limited (429) on page {page_id + 1}. "
-                        f"Waiting {retry_delay:.1f}s before continuing..."
+                        f"⚠ [{bgg_id}] Rate limited (429) on page {page_id + 1}, skipping it"
                     )
-                    time.sleep(retry_delay)
                 else:
                     logger.error(
                         f"✗ [{bgg_id}] HTTP error on page {page_id + 1}: {e}",
@@ -262,11 +287,198 @@ class BGGRatingsScraper:
         return all_ratings
 
 
+class AsyncBGGRatingsScraper:
+    """
+    Asyncio ratings scraper keeping many games in flight at once.
+
+    Each game's pages are still fetched in order (a short page ends it), but
+    up to `concurrency` games are scraped at the same time and every request
+    first waits for the shared RateController. Throughput is then bounded by
+    the allowed request rate instead of by round-trip latency plus fixed
+    sleeps. Requests run on a thread pool with one requests
+    session per thread; parsing is shared with BGGRatingsScraper.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        concurrency: int = 8,
+        timeout: int = 30,
+        cookie: Optional[str] = None,
+        controller: Optional[RateController] = None,
+    ):
+        """
+        Initialize the scraper.
+
+        Args:
+            requests_per_second: Request rate across all games to start at, ahead of a learned rate
+                (default: the learned rate, else 1 request/s)
+            concurrency: Games (and so requests) in flight at once
+            timeout: Request timeout (seconds)
+            cookie: Optional Cookie header value for authenticated requests
+            controller: Rate controller pacing the requests (default: the shared BGG controller)
+        """
+        self.controller = controller or RateController.shared(rate=requests_per_second)
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.cookie = cookie
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="bgg-ratings"
+        )
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        if cookie:
+            logger.debug("🔐 Using authenticated requests with provided cookie")
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the request threads and close their sessions."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self.controller.save()
+
+    def _fetch(self, url: str) -> requests.Response:
+        """GET url with the calling thread's session (runs on the thread pool)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = _create_session(self.cookie)
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session.get(url, timeout=self.timeout)
+
+    async def _get(self, url: str) -> requests.Response:
+        """
+        Fetch url without blocking the event loop, paced by the controller.
+
+        Throttled responses (429/503) are retried like ThrottledSession does;
+        the last response is returned as is.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(DEFAULT_MAX_RETRIES + 1):
+            reserved_at = await self.controller.acquire_async()
+            response = await loop.run_in_executor(self._executor, self._fetch, url)
+            throttled = self.controller.record(response.status_code, response.headers.get("Retry-After"), reserved_at)
+            if not throttled or attempt == DEFAULT_MAX_RETRIES:
+                return response
+        return response
+
+    async def scrape_ratings(self, bgg_id: str, max_pages: int = 10) -> List[Dict[str, Any]]:
+        """
+        Scrape ratings data for a game using the BGG API.
+
+        Pagination, error handling and the returned dictionaries are those of
+        BGGRatingsScraper.scrape_ratings.
+
+        Args:
+            bgg_id: BGG ID of the game (e.g., "59294")
+            max_pages: Maximum number of pages to scrape (default: 10)
+
+        Returns:
+            List of rating dictionaries
+        """
+        bgg_id = str(bgg_id)
+        all_ratings = []
+        rating_count = 0
+
+        for page_id in range(max_pages):
+            try:
+                api_url = BGGRatingsScraper.page_url(bgg_id, page_id)
+                logger.debug(f"  📄 [{bgg_id}] Fetching page {page_id + 1}/{max_pages}...")
+
+                response = await self._get(api_url)
+                response.raise_for_status()
+                data = response.json()
+
+                if not data or "items" not in data or not data["items"]:
+                    logger.debug(f"  ✓ [{bgg_id}] No more items found on page {page_id + 1}, stopping pagination")
+                    break
+
+                items = data["items"]
+                is_last_page = len(items) < EXPECTED_ITEMS_PER_PAGE and page_id > 0
+                page_ratings, rating_count = BGGRatingsScraper.parse_items(bgg_id, items, rating_count)
+
+                if not page_ratings:
+                    logger.debug(f"  ⚠ [{bgg_id}] No valid ratings found on page {page_id + 1}, stopping pagination")
+                    break
+                all_ratings.extend(page_ratings)
+                if is_last_page:
+                    break
+
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 429:
+                    logger.warning(f"⚠ [{bgg_id}] Rate limited (429) on page {page_id + 1}, skipping it")
+                else:
+                    logger.error(f"✗ [{bgg_id}] HTTP error on page {page_id + 1}: {e}", exc_info=True)
+                continue
+            except requests.RequestException as e:
+                logger.error(f"✗ [{bgg_id}] Request error on page {page_id + 1}: {e}", exc_info=True)
+                continue
+            except Exception as e:
+                logger.error(f"✗ [{bgg_id}] Error processing page {page_id + 1}: {e}", exc_info=True)
+                continue
+
+        logger.debug(f"✓ [{bgg_id}] Completed: Extracted {len(all_ratings)} total ratings")
+        return all_ratings
+
+    async def scrape_many(
+        self, bgg_ids: Iterable[str], max_pages: int = 10
+    ) -> AsyncIterator[Tuple[str, Optional[List[Dict[str, Any]]], Optional[Exception]]]:
+        """
+        Scrape many games, up to `concurrency` at a time.
+
+        Args:
+            bgg_ids: BGG IDs of the games
+            max_pages: Maximum number of pages to scrape per game
+
+        Yields:
+            Tuple of (bgg_id, ratings, error) per game in completion order;
+            ratings is None if scraping the game raised error
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for bgg_id in bgg_ids:
+            pending.put_nowait(str(bgg_id))
+        total = pending.qsize()
+        finished: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    bgg_id = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    ratings = await self.scrape_ratings(bgg_id, max_pages)
+                    finished.put_nowait((bgg_id, ratings, None))
+                except Exception as e:
+                    finished.put_nowait((bgg_id, None, e))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, total))]
+        try:
+            for _ in range(total):
+                yield await finished.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
 def scrape_game_ratings(
     bgg_id: str,
     max_pages: int = 10,
     cookie: Optional[str] = None,
-    delay_between_requests: float = 1.0,
+    delay_between_requests: Optional[float] = None,
+    max_rate: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """
     Convenience function to scrape game ratings.
@@ -275,14 +487,15 @@ def scrape_game_ratings(
         bgg_id: BGG ID of the game
         max_pages: Maximum number of pages to scrape (default: 10)
         cookie: Optional Cookie header value for authenticated requests
-        delay_between_requests: Delay between page requests (seconds)
+        delay_between_requests: Delay between page requests (seconds), ahead of a learned rate
+        max_rate: Highest requests per second (default: $ETL_SCRAPER_MAX_RATE, else the requested rate,
+            else the controller default)
 
     Returns:
         List of rating dictionaries
     """
-    with BGGRatingsScraper(
-        cookie=cookie, delay_between_requests=delay_between_requests
-    ) as scraper:
+    controller = RateController.shared(rate=rate_for_delay(delay_between_requests), max_rate=max_rate)
+    with BGGRatingsScraper(cookie=cookie, controller=controller) as scraper:
         return scraper.scrape_ratings(bgg_id=bgg_id, max_pages=max_pages)
 
 
@@ -313,9 +526,10 @@ if __name__ == "__main__":
     parser.add_argument(
         "--delay",
         type=float,
-        default=1.0,
-        help="Delay between pages in seconds (default: 1.0)",
+        default=None,
+        help="Delay between pages in seconds, ahead of the learned request rate (default: the learned rate, else 1.0)",
     )
+    add_max_rate_argument(parser)
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -332,6 +546,7 @@ if __name__ == "__main__":
         max_pages=args.max_pages,
         cookie=args.cookie,
         delay_between_requests=args.delay,
+        max_rate=args.max_rate,
     )
 
     print(json.dumps(ratings, indent=2, ensure_ascii=False))
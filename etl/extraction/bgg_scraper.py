@@ -2,7 +2,7 @@
 BoardGameGeek Scraper
 
 Automated scraper for extracting board game information from BoardGameGeek.com
-using Beautiful Soup and requests.
+using requests and lxml (or Beautiful Soup when lxml is not installed).
 
 Usage:
     from extraction.bgg_scraper import scrape_bgg_games
@@ -12,19 +12,23 @@ Usage:
 
 import json
 import re
-import time
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Callable
-from urllib.parse import urljoin
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from etl.extraction.browse_parser import DEFAULT_BACKEND, extract_bgg_id, extract_soup_row, parse_browse_page
+from etl.extraction.http_cache import ResponseCache, add_cache_arguments, cache_from_args
+from etl.extraction.rate_limit import RateController, ThrottledSession, add_max_rate_argument, rate_for_delay
 from etl.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Delay between browse pages (seconds) until a request rate is learned, per BGG's crawl delay
+DELAY_BETWEEN_PAGES = 5.0
+
 
 class BGGScraper:
     """
@@ -42,21 +46,34 @@ class BGGScraper:
 
     def __init__(
         self,
-        delay_between_requests: float = 1.0,
+        delay_between_requests: Optional[float] = None,
         timeout: int = 30,
         cookie: Optional[str] = None,
+        controller: Optional[RateController] = None,
+        cache: Optional[ResponseCache] = None,
+        include_raw_html: bool = False,
+        parser_backend: str = DEFAULT_BACKEND,
     ):
         """
         Initialize the scraper.
 
         Args:
-            delay_between_requests: Delay between HTTP requests (seconds)
+            delay_between_requests: Delay between HTTP requests (seconds) to start at, ahead of a learned rate
+                (default: the learned rate, else 1 request/s)
             timeout: Request timeout (seconds)
             cookie: Optional Cookie header value for authenticated requests
+            controller: Rate controller pacing the requests (default: the shared BGG controller)
+            cache: Response cache for GET requests (default: ResponseCache.shared(), off unless ETL_HTTP_CACHE is set)
+            include_raw_html: Keep each row's HTML in the game dictionaries as "_rawHtml"
+            parser_backend: "lxml" (default when installed) or "html.parser"
         """
         self.delay_between_requests = delay_between_requests
         self.timeout = timeout
-        self.session = requests.Session()
+        self.include_raw_html = include_raw_html
+        self.parser_backend = parser_backend
+        self.controller = controller or RateController.shared(rate=rate_for_delay(delay_between_requests))
+        self.cache = cache or ResponseCache.shared()
+        self.session = ThrottledSession(self.controller, cache=self.cache)
         # Set user agent to mimic a browser
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -75,24 +92,37 @@ class BGGScraper:
         """Context manager exit."""
         self.session.close()
 
-    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+    def _fetch_content(self, url: str) -> Optional[bytes]:
         """
-        Fetch and parse a page.
+        Fetch a page.
 
         Args:
             url: URL to fetch
 
         Returns:
-            BeautifulSoup object or None if request fails
+            Response body or None if request fails
         """
         try:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            return BeautifulSoup(response.content, "html.parser")
+            return response.content
         except requests.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
 
+    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+        """
+        Fetch and parse a page.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            BeautifulSoup object or None if request fails
+        """
+        content = self._fetch_content(url)
+        return BeautifulSoup(content, "html.parser") if content is not None else None
+
     def get_total_pages(self) -> int:
         """
         Get the total number of pages from the first page.
@@ -141,178 +171,7 @@ class BGGScraper:
             Dictionary with game information or None if extraction fails
         """
         try:
-            game_data: Dict[str, Any] = {}
-
-            # Get all table cells
-            cells = row.find_all("td")
-            if not cells:
-                return None
-
-            # Extract rank (first column)
-            try:
-                rank_text = cells[0].get_text(strip=True)
-                game_data["rank"] = int(rank_text) if rank_text.isdigit() else None
-            except (ValueError, IndexError):
-                game_data["rank"] = None
-
-            # Extract thumbnail image
-            try:
-                img = row.find("img")
-                if img:
-                    game_data["thumbnailUrl"] = img.get("src") or None
-                    game_data["thumbnailAlt"] = img.get("alt") or None
-                    # Make URL absolute if relative
-                    if game_data["thumbnailUrl"] and not game_data[
-                        "thumbnailUrl"
-                    ].startswith("http"):
-                        game_data["thumbnailUrl"] = urljoin(
-                            self.BASE_URL, game_data["thumbnailUrl"]
-                        )
-                else:
-                    game_data["thumbnailUrl"] = None
-                    game_data["thumbnailAlt"] = None
-            except Exception:
-                game_data["thumbnailUrl"] = None
-                game_data["thumbnailAlt"] = None
-
-            # Extract game name (most important)
-            try:
-                # Find the td with class "collection_objectname" which contains the game name
-                name_td = row.find("td", class_="collection_objectname")
-                if not name_td:
-                    logger.warning("Could not find collection_objectname td in row")
-                    return None
-
-                # Find the div with id starting with "results_objectname"
-                name_div = name_td.find("div", id=re.compile(r"results_objectname\d+"))
-                if not name_div:
-                    logger.warning("Could not find results_objectname div in row")
-                    return None
-
-                game_name = name_div.get_text(strip=True)
-                # remove published year from game name
-                game_name = re.sub(r"\s*\(\d{4}\)\s*", "", game_name)
-                game_data["name"] = game_name
-
-            except Exception as e:
-                logger.warning(f"Could not find game name in row: {e}")
-                return None
-
-            # Extract game detail link
-            try:
-                # Find the link within the name div
-                name_td = row.find("td", class_="collection_objectname")
-                if name_td:
-                    name_div = name_td.find(
-                        "div", id=re.compile(r"results_objectname\d+")
-                    )
-                    if name_div:
-                        link_a = name_div.find("a", href=re.compile(r"/boardgame/\d+/"))
-                        if link_a:
-                            href = link_a.get("href")
-                            # Make URL absolute if relative
-                            if href and not href.startswith("http"):
-                                href = urljoin(self.BASE_URL, href)
-                            game_data["detailUrl"] = href
-                            game_data["bggId"] = self._extract_bgg_id_from_url(href)
-                        else:
-                            game_data["detailUrl"] = None
-                            game_data["bggId"] = None
-                    else:
-                        game_data["detailUrl"] = None
-                        game_data["bggId"] = None
-                else:
-                    game_data["detailUrl"] = None
-                    game_data["bggId"] = None
-
-            except Exception as e:
-                logger.warning(f"Could not find game link in row: {e}")
-                game_data["detailUrl"] = None
-                game_data["bggId"] = None
-
-            # Extract year published (usually in parentheses after name)
-            try:
-                # Look for span with class "smallerfont dull" which contains the year
-                name_td = row.find("td", class_="collection_objectname")
-                if name_td:
-                    name_div = name_td.find(
-                        "div", id=re.compile(r"results_objectname\d+")
-                    )
-                    if name_div:
-                        year_span = name_div.find("span", class_="smallerfont")
-                        if year_span:
-                            year_text = year_span.get_text()
-                            year_match = re.search(r"\((\d{4})\)", year_text)
-                            if year_match:
-                                game_data["yearPublished"] = int(year_match.group(1))
-                            else:
-                                game_data["yearPublished"] = None
-                        else:
-                            # Try to find year in the div text
-                            div_text = name_div.get_text()
-                            year_match = re.search(r"\((\d{4})\)", div_text)
-                            if year_match:
-                                game_data["yearPublished"] = int(year_match.group(1))
-                            else:
-                                game_data["yearPublished"] = None
-                    else:
-                        game_data["yearPublished"] = None
-                else:
-                    game_data["yearPublished"] = None
-            except (ValueError, AttributeError):
-                game_data["yearPublished"] = None
-
-            # Extract description (if available)
-            try:
-                description_tag = row.find("p")
-                if description_tag:
-                    description = description_tag.get_text(strip=True)
-                    game_data["description"] = description if description else None
-                else:
-                    game_data["description"] = None
-            except Exception:
-                game_data["description"] = None
-
-            # Extract ratings and voter counts from cells
-            if len(cells) >= 5:
-                try:
-                    # Geek Rating (usually 3rd or 4th column)
-                    geek_rating_text = cells[4].get_text(strip=True)
-                    game_data["geekRating"] = (
-                        float(geek_rating_text) if geek_rating_text else None
-                    )
-                except (ValueError, IndexError):
-                    game_data["geekRating"] = None
-
-                try:
-                    # Average Rating (usually 4th or 5th column)
-                    avg_rating_text = cells[5].get_text(strip=True)
-                    game_data["avgRating"] = (
-                        float(avg_rating_text) if avg_rating_text else None
-                    )
-                except (ValueError, IndexError):
-                    game_data["avgRating"] = None
-
-                try:
-                    # Number of Voters (usually 5th or 6th column)
-                    voters_text = cells[6].get_text(strip=True)
-                    # Remove commas from numbers
-                    voters_text = voters_text.replace(",", "")
-                    game_data["numVoters"] = (
-                        int(voters_text) if voters_text.isdigit() else None
-                    )
-                except (ValueError, IndexError):
-                    game_data["numVoters"] = None
-            else:
-                game_data["geekRating"] = None
-                game_data["avgRating"] = None
-                game_data["numVoters"] = None
-
-            # Store raw HTML for additional processing if needed
-            game_data["_rawHtml"] = str(row)
-
-            return game_data
-
+            return extract_soup_row(row, self.BASE_URL, self.include_raw_html)
         except Exception as e:
             logger.warning(f"Error extracting game from row: {e}")
             return None
@@ -327,14 +186,7 @@ class BGGScraper:
         Returns:
             BGG game ID or None
         """
-        try:
-            # URLs are typically: /boardgame/224517/brass-birmingham
-            match = re.search(r"/boardgame/(\d+)/", url)
-            if match:
-                return int(match.group(1))
-        except (ValueError, AttributeError):
-            pass
-        return None
+        return extract_bgg_id(url)
 
     def scrape_page(self, page_num: int) -> List[Dict[str, Any]]:
         """
@@ -349,36 +201,19 @@ class BGGScraper:
         url = f"{self.BROWSE_URL}{page_num}"
         logger.info(f"Scraping page {page_num}: {url}")
 
-        soup = self._fetch_page(url)
-        if not soup:
+        content = self._fetch_content(url)
+        if content is None:
             logger.error(f"Failed to fetch page {page_num}")
             return []
 
         try:
-            # Find the collection div
-            collection_div = soup.find("div", id="collection")
-            if not collection_div:
-                logger.error(f"Could not find collection div on page {page_num}")
+            games = parse_browse_page(content, self.BASE_URL, self.include_raw_html, self.parser_backend)
+            if games is None:
+                logger.error(f"Could not find collection table on page {page_num}")
                 return []
 
-            # Find all table rows (skip header row)
-            table = collection_div.find("table")
-            if not table:
-                logger.error(f"Could not find table on page {page_num}")
-                return []
-
-            rows = table.find_all("tr")
-
-            games = []
-            for row in rows:
-                # Skip header row (usually contains "Title", "Geek Rating", etc.)
-                if row.find("th"):
-                    continue
-
-                game = self.extract_game_from_row(row)
-                if game:
-                    game["page"] = page_num
-                    games.append(game)
+            for game in games:
+                game["page"] = page_num
 
             logger.info(f"Extracted {len(games)} games from page {page_num}")
             return games
@@ -391,16 +226,16 @@ class BGGScraper:
         self,
         max_pages: Optional[int] = None,
         start_page: int = 1,
-        delay_between_pages: float = 2.0,
         progress_callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Scrape all pages or up to max_pages.
 
+        Pages are requested as fast as the session's rate controller allows.
+
         Args:
             max_pages: Maximum number of pages to scrape (None for all)
             start_page: Page number to start from
-            delay_between_pages: Delay between page requests (seconds)
             progress_callback: Optional callback function(games_list) called after each page
 
         Returns:
@@ -427,10 +262,6 @@ class BGGScraper:
                     if progress_callback:
                         progress_callback(all_games)
 
-                    # Delay between pages to be respectful
-                    if page_num < end_page:
-                        time.sleep(delay_between_pages)
-
                 except Exception as e:
                     logger.error(f"Failed to scrape page {page_num}: {e}")
                     continue
@@ -477,8 +308,11 @@ def scrape_bgg_games(
     start_page: int = 1,
     output_file: Optional[Path] = None,
     output_format: str = "csv",
-    delay_between_pages: float = 2.0,
+    delay_between_pages: Optional[float] = None,
     cookie: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    include_raw_html: bool = False,
+    max_rate: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """
     Convenience function to scrape BGG games.
@@ -488,8 +322,13 @@ def scrape_bgg_games(
         start_page: Page number to start from
         output_file: Optional path to save output (CSV or JSON)
         output_format: Output format - "csv" or "json" (default: "csv")
-        delay_between_pages: Delay between page requests (seconds)
+        delay_between_pages: Delay between page requests (seconds) to start at, ahead of a learned rate
+            (default: the learned rate, else DELAY_BETWEEN_PAGES)
         cookie: Optional Cookie header value for authenticated requests
+        cache: Response cache for the browse pages (default: from the environment)
+        include_raw_html: Keep each row's HTML as "_rawHtml" (JSON output only; never written to CSV)
+        max_rate: Highest requests per second (default: $ETL_SCRAPER_MAX_RATE, else the requested rate,
+            else the controller default)
 
     Returns:
         List of extracted game dictionaries
@@ -515,11 +354,18 @@ def scrape_bgg_games(
                 )
 
     try:
-        with BGGScraper(delay_between_requests=1.0, cookie=cookie) as scraper:
+        controller = RateController.shared(
+            rate=rate_for_delay(delay_between_pages), initial_rate=1.0 / DELAY_BETWEEN_PAGES, max_rate=max_rate
+        )
+        with BGGScraper(
+            controller=controller,
+            cookie=cookie,
+            cache=cache,
+            include_raw_html=include_raw_html,
+        ) as scraper:
             games = scraper.scrape_all(
                 max_pages=max_pages,
                 start_page=start_page,
-                delay_between_pages=delay_between_pages,
                 progress_callback=save_progress if output_file else None,
             )
 
@@ -597,15 +443,23 @@ if __name__ == "__main__":
     parser.add_argument(
         "--delay",
         type=float,
-        default=5.0,
-        help="Delay between pages in seconds (default: 5.0 seconds defined by BGG)",
+        default=None,
+        help="Delay between pages in seconds to start at, ahead of the learned request rate "
+        f"(default: the learned rate, else {DELAY_BETWEEN_PAGES} seconds defined by BGG)",
     )
+    add_max_rate_argument(parser)
     parser.add_argument(
         "--cookie",
         type=str,
         default=None,
         help="Cookie header value for authenticated requests (e.g., 'cc_cookie=...; bggusername=...; SessionID=...')",
     )
+    parser.add_argument(
+        "--raw-html",
+        action="store_true",
+        help="Keep each row's HTML as _rawHtml in JSON output",
+    )
+    add_cache_arguments(parser)
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -616,6 +470,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     setup_logging(level=args.log_level)
+    cache = cache_from_args(args)
 
     try:
         games = scrape_bgg_games(
@@ -625,6 +480,9 @@ if __name__ == "__main__":
             output_format=args.format,
             delay_between_pages=args.delay,
             cookie=args.cookie,
+            cache=cache,
+            include_raw_html=args.raw_html,
+            max_rate=args.max_rate,
         )
 
         print(f"\nScraped {len(games)} games successfully!")
@@ -633,3 +491,6 @@ if __name__ == "__main__":
         # Already handled in scrape_bgg_games, just exit gracefully
         print("\nScraping cancelled by user.")
         exit(0)
+    finally:
+        if cache:
+            cache.close()
@@ -0,0 +1,151 @@
+"""
+Browse Page Parser Benchmark
+
+Parses saved BGG browse pages with every available parser backend and
+reports rows parsed per second, after checking that the backends extract
+identical games.
+
+Pages are read from a directory of .html files and/or from the HTTP response
+cache (browse pages fetched with `bgg_scraper --cache`).
+
+Usage:
+    python -m etl.extraction.browse_benchmark --fixtures data/fixtures/browse
+    python -m etl.extraction.browse_benchmark --from-cache --repeat 5 --raw-html
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add project root to Python path for imports
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from etl.extraction.bgg_scraper import BGGScraper
+from etl.extraction.browse_parser import PARSER_BACKENDS, lxml_html, parse_browse_page
+from etl.extraction.http_cache import ResponseCache, default_cache_file
+from etl.logger import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_REPEAT = 3
+
+
+def load_pages(fixtures: Optional[Path] = None, cache_file: Optional[Path] = None) -> list[bytes]:
+    """
+    Read browse pages from a fixtures directory and/or a response cache file.
+
+    Args:
+        fixtures: Directory of saved pages (*.html)
+        cache_file: ResponseCache file whose browse page responses are used
+
+    Returns:
+        Page bodies
+    """
+    pages = []
+    if fixtures:
+        pages.extend(path.read_bytes() for path in sorted(Path(fixtures).glob("*.html")))
+    if cache_file:
+        cache = ResponseCache(cache_file, offline=True)
+        try:
+            pages.extend(entry.body for entry in cache.entries(BGGScraper.BROWSE_URL))
+        finally:
+            cache.close()
+    return pages
+
+
+def _without_raw_html(games: list[list[dict]]) -> list[list[dict]]:
+    return [[{key: value for key, value in game.items() if key != "_rawHtml"} for game in page] for page in games]
+
+
+def run_benchmark(pages: list[bytes], repeat: int = DEFAULT_REPEAT, include_raw_html: bool = False) -> dict:
+    """
+    Time parse_browse_page over all pages with each available backend.
+
+    Args:
+        pages: Page bodies
+        repeat: Timed passes per backend; the fastest is reported
+        include_raw_html: Capture "_rawHtml" as well
+
+    Returns:
+        Result record with rows, seconds and rows/s per backend and whether their games match
+    """
+    backends = [backend for backend in PARSER_BACKENDS if backend != "lxml" or lxml_html is not None]
+    results: dict[str, dict] = {}
+    games_by_backend = {}
+    for backend in backends:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            games = [
+                parse_browse_page(page, BGGScraper.BASE_URL, include_raw_html=include_raw_html, backend=backend) or []
+                for page in pages
+            ]
+            timings.append(time.perf_counter() - start)
+        rows = sum(len(page_games) for page_games in games)
+        seconds = min(timings)
+        games_by_backend[backend] = _without_raw_html(games)
+        results[backend] = {"rows": rows, "seconds": round(seconds, 4), "rows_per_second": round(rows / seconds, 1)}
+
+    reference = games_by_backend[backends[-1]]
+    return {
+        "pages": len(pages),
+        "repeat": repeat,
+        "include_raw_html": include_raw_html,
+        "backends": results,
+        "identical": all(games == reference for games in games_by_backend.values()),
+    }
+
+
+def main():
+    """CLI entry point: benchmark the browse page parser backends."""
+    parser = argparse.ArgumentParser(description="Benchmark BGG browse page parsing on saved pages")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of saved browse pages (*.html)")
+    parser.add_argument(
+        "--from-cache",
+        action="store_true",
+        help=f"Also use the browse pages in the HTTP response cache ({default_cache_file()})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timed passes per backend, fastest reported (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument("--raw-html", action="store_true", help="Include _rawHtml capture in the timings")
+    parser.add_argument("--output", type=Path, default=None, help="Write the result record as JSON")
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (default: INFO)",
+    )
+    args = parser.parse_args()
+    setup_logging(level=args.log_level, log_to_file=False)
+
+    pages = load_pages(args.fixtures, default_cache_file() if args.from_cache else None)
+    if not pages:
+        parser.error("No browse pages found (pass --fixtures DIR and/or --from-cache)")
+
+    record = run_benchmark(pages, repeat=args.repeat, include_raw_html=args.raw_html)
+    slowest = min(result["rows_per_second"] for result in record["backends"].values())
+    for backend, result in record["backends"].items():
+        logger.info(
+            f"{backend:>12}: {result['rows']} rows from {record['pages']} pages in {result['seconds']:.3f}s "
+            f"= {result['rows_per_second']:,.0f} rows/s ({result['rows_per_second'] / slowest:.1f}x)"
+        )
+    if not record["identical"]:
+        logger.warning("⚠ Backends extracted different games")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        logger.info(f"Wrote benchmark record to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+BoardGameGeek Browse Page Parser
+
+Extracts the game rows of a browse page (/browse/boardgame/page/N). Each row
+is walked once to pick out the cells the fields come from; the fields are
+then built from those texts by one function shared by both backends:
+
+- "lxml": lxml.html, much faster (used when lxml is installed)
+- "html.parser": Beautiful Soup with the standard library parser
+
+Usage:
+    from etl.extraction.browse_parser import parse_browse_page
+
+    games = parse_browse_page(response.content, base_url="https://boardgamegeek.com")
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+from etl.logger import get_logger
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - falls back to html.parser without lxml
+    lxml_html = None
+
+logger = get_logger(__name__)
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+DEFAULT_BACKEND = "lxml" if lxml_html is not None else "html.parser"
+
+OBJECTNAME_CLASS = "collection_objectname"
+OBJECTNAME_ID_RE = re.compile(r"results_objectname\d+")
+DETAIL_HREF_RE = re.compile(r"/boardgame/\d+/")
+BGG_ID_RE = re.compile(r"/boardgame/(\d+)/")
+YEAR_RE = re.compile(r"\((\d{4})\)")
+NAME_YEAR_RE = re.compile(r"\s*\(\d{4}\)\s*")
+
+# Cells holding Geek Rating, Average Rating and Number of Voters
+GEEK_RATING_CELL = 4
+AVG_RATING_CELL = 5
+VOTERS_CELL = 6
+
+
+def extract_bgg_id(url: Optional[str]) -> Optional[int]:
+    """
+    Extract the BGG game ID from a detail page URL (/boardgame/224517/brass-birmingham).
+
+    Returns:
+        BGG game ID or None
+    """
+    match = BGG_ID_RE.search(url) if url else None
+    return int(match.group(1)) if match else None
+
+
+def _to_float(text: Optional[str]) -> Optional[float]:
+    try:
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+
+def _build_game(
+    base_url: str,
+    cell_texts: Dict[int, str],
+    n_cells: int,
+    img: Optional[tuple[Optional[str], Optional[str]]],
+    name_text: str,
+    href: Optional[str],
+    year_text: Optional[str],
+    description: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Build a game dictionary from the texts of one row.
+
+    Args:
+        base_url: Site URL relative links are resolved against
+        cell_texts: Stripped text of the rank and rating cells, by cell position
+        n_cells: Number of cells in the row
+        img: (src, alt) of the first image, or None
+        name_text: Stripped text of the name div
+        href: Detail link of the name div, or None
+        year_text: Text of the year span (or of the whole name div without one)
+        description: Stripped text of the first paragraph, or None
+    """
+    rank_text = cell_texts.get(0, "")
+    game: Dict[str, Any] = {"rank": int(rank_text) if rank_text.isdigit() else None}
+
+    src, alt = img or (None, None)
+    src = src or None
+    if src and not src.startswith("http"):
+        src = urljoin(base_url, src)
+    game["thumbnailUrl"] = src
+    game["thumbnailAlt"] = alt or None
+
+    game["name"] = NAME_YEAR_RE.sub("", name_text)
+
+    if href and not href.startswith("http"):
+        href = urljoin(base_url, href)
+    game["detailUrl"] = href
+    game["bggId"] = extract_bgg_id(href)
+
+    year_match = YEAR_RE.search(year_text) if year_text else None
+    game["yearPublished"] = int(year_match.group(1)) if year_match else None
+
+    game["description"] = description or None
+
+    if n_cells >= 5:
+        game["geekRating"] = _to_float(cell_texts.get(GEEK_RATING_CELL))
+        game["avgRating"] = _to_float(cell_texts.get(AVG_RATING_CELL))
+        voters_text = cell_texts.get(VOTERS_CELL, "").replace(",", "")
+        game["numVoters"] = int(voters_text) if voters_text.isdigit() else None
+    else:
+        game["geekRating"] = None
+        game["avgRating"] = None
+        game["numVoters"] = None
+    return game
+
+
+# Elements whose text Beautiful Soup's get_text leaves out
+_NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+def _lxml_strings(element, strings: List[str]) -> List[str]:
+    """Append the text of element's subtree to strings, as Beautiful Soup's get_text sees it."""
+    if element.text and element.tag not in _NON_TEXT_TAGS:
+        strings.append(element.text)
+    for child in element:
+        # Comments and processing instructions have non-string tags; only their tail is text
+        if isinstance(child.tag, str):
+            _lxml_strings(child, strings)
+        if child.tail:
+            strings.append(child.tail)
+    return strings
+
+
+def _lxml_text(element, strip: bool = True) -> str:
+    strings = _lxml_strings(element, [])
+    return "".join(text.strip() for text in strings) if strip else "".join(strings)
+
+
+def _has_class(element, name: str) -> bool:
+    classes = element.get("class")
+    return bool(classes) and name in classes.split()
+
+
+def _extract_lxml_row(row, base_url: str, include_raw_html: bool) -> Optional[Dict[str, Any]]:
+    """Extract a game from an lxml <tr>, walking the row once."""
+    cells = []
+    img = None
+    name_td = None
+    paragraph = None
+    for element in row.iterdescendants("td", "img", "p"):
+        tag = element.tag
+        if tag == "td":
+            cells.append(element)
+            if name_td is None and _has_class(element, OBJECTNAME_CLASS):
+                name_td = element
+        elif tag == "img":
+            if img is None:
+                img = element
+        elif paragraph is None:
+            paragraph = element
+
+    if not cells:
+        return None
+    if name_td is None:
+        logger.warning("Could not find collection_objectname td in row")
+        return None
+
+    name_div = next(
+        (div for div in name_td.iterdescendants("div") if OBJECTNAME_ID_RE.search(div.get("id") or "")), None
+    )
+    if name_div is None:
+        logger.warning("Could not find results_objectname div in row")
+        return None
+
+    href = None
+    year_span = None
+    for element in name_div.iterdescendants("a", "span"):
+        if element.tag == "a":
+            if href is None and DETAIL_HREF_RE.search(element.get("href") or ""):
+                href = element.get("href")
+        elif year_span is None and _has_class(element, "smallerfont"):
+            year_span = element
+
+    cell_texts = {
+        position: _lxml_text(cells[position])
+        for position in (0, GEEK_RATING_CELL, AVG_RATING_CELL, VOTERS_CELL)
+        if position < len(cells)
+    }
+    game = _build_game(
+        base_url,
+        cell_texts,
+        len(cells),
+        (img.get("src"), img.get("alt")) if img is not None else None,
+        _lxml_text(name_div),
+        href,
+        _lxml_text(year_span if year_span is not None else name_div, strip=False),
+        _lxml_text(paragraph) if paragraph is not None else None,
+    )
+    if include_raw_html:
+        game["_rawHtml"] = lxml_html.tostring(row, encoding="unicode", with_tail=False)
+    return game
+
+
+def extract_soup_row(row, base_url: str, include_raw_html: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Extract a game from a Beautiful Soup <tr> (the html.parser backend).
+
+    Args:
+        row: BeautifulSoup Tag of the table row
+        base_url: Site URL relative links are resolved against
+        include_raw_html: Add the row's HTML as "_rawHtml"
+
+    Returns:
+        Game dictionary, or None if the row has no cells or no game name
+    """
+    cells = []
+    img = None
+    name_td = None
+    paragraph = None
+    for element in row.find_all(("td", "img", "p")):
+        if element.name == "td":
+            cells.append(element)
+            if name_td is None and OBJECTNAME_CLASS in (element.get("class") or ()):
+                name_td = element
+        elif element.name == "img":
+            if img is None:
+                img = element
+        elif paragraph is None:
+            paragraph = element
+
+    if not cells:
+        return None
+    if name_td is None:
+        logger.warning("Could not find collection_objectname td in row")
+        return None
+
+    name_div = name_td.find("div", id=OBJECTNAME_ID_RE)
+    if name_div is None:
+        logger.warning("Could not find results_objectname div in row")
+        return None
+
+    link = name_div.find("a", href=DETAIL_HREF_RE)
+    year_span = name_div.find("span", class_="smallerfont")
+
+    cell_texts = {
+        position: cells[position].get_text(strip=True)
+        for position in (0, GEEK_RATING_CELL, AVG_RATING_CELL, VOTERS_CELL)
+        if position < len(cells)
+    }
+    game = _build_game(
+        base_url,
+        cell_texts,
+        len(cells),
+        (img.get("src"), img.get("alt")) if img is not None else None,
+        name_div.get_text(strip=True),
+        link.get("href") if link is not None else None,
+        (year_span or name_div).get_text(),
+        paragraph.get_text(strip=True) if paragraph is not None else None,
+    )
+    if include_raw_html:
+        game["_rawHtml"] = str(row)
+    return game
+
+
+def _safe_extract(extract, row, base_url: str, include_raw_html: bool) -> Optional[Dict[str, Any]]:
+    try:
+        return extract(row, base_url, include_raw_html)
+    except Exception as e:
+        logger.warning(f"Error extracting game from row: {e}")
+        return None
+
+
+def parse_browse_page(
+    content: Union[bytes, str],
+    base_url: str,
+    include_raw_html: bool = False,
+    backend: str = DEFAULT_BACKEND,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract the games of a browse page.
+
+    Args:
+        content: Page HTML
+        base_url: Site URL relative links are resolved against
+        include_raw_html: Add each row's HTML (as serialized by the backend) as "_rawHtml"
+        backend: "lxml" or "html.parser"
+
+    Returns:
+        Game dictionaries in page order, or None if the page has no collection table
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend} (expected one of {PARSER_BACKENDS})")
+
+    if backend == "lxml":
+        if lxml_html is None:
+            raise ImportError("The lxml parser backend requires lxml (pip install lxml)")
+        # Decode like Beautiful Soup does; lxml assumes Latin-1 for pages without a charset
+        markup = UnicodeDammit(content, is_html=True).unicode_markup if isinstance(content, bytes) else content
+        root = lxml_html.fromstring(markup)
+        collection = next((div for div in root.iter("div") if div.get("id") == "collection"), None)
+        table = next(collection.iter("table"), None) if collection is not None else None
+        if table is None:
+            return None
+        rows = (row for row in table.iter("tr") if next(row.iterdescendants("th"), None) is None)
+        extract = _extract_lxml_row
+    else:
+        soup = BeautifulSoup(content, "html.parser")
+        collection = soup.find("div", id="collection")
+        table = collection.find("table") if collection else None
+        if table is None:
+            return None
+        rows = (row for row in table.find_all("tr") if not row.find("th"))
+        extract = extract_soup_row
+
+    games = []
+    for row in rows:
+        game = _safe_extract(extract, row, base_url, include_raw_html)
+        if game:
+            games.append(game)
+    return games
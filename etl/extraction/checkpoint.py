@@ -0,0 +1,293 @@
+"""
+Checkpointed Output Writer
+
+Append-only output for the batch scrapers. Each flush writes the records of
+the games scraped since the last one as a new segment file, instead of
+rewriting the whole output CSV, and records the segment and its bggIds in a
+manifest. At the end of a run (or on interruption) the segments are
+compacted into the output CSV.
+
+Files, for an output of data/game_ratings.csv:
+
+    data/game_ratings.csv                  # compacted output
+    data/game_ratings.csv.parts/part-000000.csv ...
+    data/game_ratings.csv.manifest.jsonl   # one line per segment / compaction
+
+A manifest line is appended only once its segment file is in place, and a
+torn last line is dropped on open, so the manifest never lists missing data.
+Resuming reads the completed bggIds from the manifest, not from the output.
+
+Each segment's dtypes are inferred from its own rows, so a numeric column can
+be written as 1 in one segment and 1.0 in another (where a game left it
+empty). Compaction rewrites such columns as floats, as one DataFrame of all
+rows would have. Columns that also hold text are copied as written, so a
+value like 3 next to text may still differ from a single-DataFrame write
+(its type is lost once a segment is on disk).
+
+Usage:
+    writer = CheckpointWriter(Path("data/game_ratings.csv"))
+    if bgg_id not in writer.completed:
+        writer.add(bgg_id, ratings)
+    writer.flush()
+    writer.compact()
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+import pandas as pd
+
+from etl.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_SUFFIX = ".manifest.jsonl"
+PARTS_SUFFIX = ".parts"
+
+# Rows read per chunk while compacting
+COMPACT_CHUNK_SIZE = 100_000
+
+
+# Text of a float as written by to_csv (8.0, 1e-05, inf), as opposed to an int (8)
+_FLOAT_TEXT_RE = r"[.eEnN]"
+
+
+def _read_csv_chunks(path: Path, **kwargs):
+    # Values are kept as the exact text that was written; only float columns are re-formatted
+    return pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=COMPACT_CHUNK_SIZE, **kwargs)
+
+
+def _float_columns(chunks: Iterable[pd.DataFrame], columns: List[str]) -> set[str]:
+    """
+    Columns one DataFrame of all rows in chunks would have inferred as float.
+
+    That is every column whose values are all numeric and that has an empty
+    value (including rows of files without the column) or a float-formatted one.
+    """
+    text, empty, floats = set(), set(), set()
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        empty.update(column for column in columns if column not in chunk.columns)
+        for column in chunk.columns:
+            values = chunk[column]
+            present = values[values != ""]
+            if len(present) < len(values):
+                empty.add(column)
+            if pd.to_numeric(present, errors="coerce").isna().any():
+                text.add(column)
+            elif present.str.contains(_FLOAT_TEXT_RE).any():
+                floats.add(column)
+    return (empty | floats) - text
+
+
+def _format_floats(chunk: pd.DataFrame, columns: set[str]) -> pd.DataFrame:
+    """Rewrite int-formatted values of the float columns as to_csv writes floats (1 -> 1.0)."""
+    for column in columns & set(chunk.columns):
+        values = chunk[column]
+        ints = (values != "") & ~values.str.contains(_FLOAT_TEXT_RE)
+        if ints.any():
+            chunk.loc[ints, column] = values[ints].astype("float64").map(repr)
+    return chunk
+
+
+class CheckpointWriter:
+    """
+    Append-only, resumable writer of per-game records to a CSV.
+
+    Records are buffered per game with add() and written as one segment per
+    flush(); compact() merges the segments into the output CSV. Games only
+    count as completed once their segment is recorded in the manifest.
+    """
+
+    def __init__(self, output_path: Path):
+        """
+        Open the checkpoint of output_path, resuming from its manifest.
+
+        An output CSV without a manifest (written before checkpointing) is
+        adopted: its bggIds are read once and recorded as compacted.
+
+        Args:
+            output_path: Final CSV the segments are compacted into
+        """
+        self.output_path = Path(output_path)
+        self.parts_dir = self.output_path.with_name(self.output_path.name + PARTS_SUFFIX)
+        self.manifest_path = self.output_path.with_name(self.output_path.name + MANIFEST_SUFFIX)
+
+        self.completed: set[str] = set()
+        self.rows_written = 0
+        self._segments: List[Dict[str, Any]] = []
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_ids: List[str] = []
+
+        if self.manifest_path.exists():
+            self._load_manifest()
+        elif self.output_path.exists():
+            self._adopt_output()
+        self._remove_orphan_segments()
+
+        if self.completed:
+            logger.info(f"📋 Found {len(self.completed)} games already scraped ({len(self._segments)} segments)")
+            logger.info("🔄 Resuming from where we left off...")
+
+    @property
+    def pending_games(self) -> int:
+        """Games added since the last flush."""
+        return len(self._pending_ids)
+
+    def _load_manifest(self) -> None:
+        text = self.manifest_path.read_text(encoding="utf-8")
+        lines = text.splitlines()
+        entries = []
+        for number, line in enumerate(lines):
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                if number < len(lines) - 1:
+                    raise
+                # Torn last line of an interrupted append: its segment was never committed
+                logger.warning(f"Dropping incomplete last line of {self.manifest_path}")
+        if text and not text.endswith("\n"):
+            # Rewrite without the torn line so the next append starts on a new line
+            self._write_manifest(entries)
+
+        for entry in entries:
+            if "segment" in entry:
+                self._segments.append(entry)
+            elif not self.output_path.exists():
+                logger.warning(f"⚠ {self.output_path} is missing; its games will be scraped again")
+                continue
+            self.completed.update(entry["bggIds"])
+            self.rows_written += entry["rows"]
+
+    def _adopt_output(self) -> None:
+        try:
+            bgg_ids: set[str] = set()
+            rows = 0
+            for chunk in _read_csv_chunks(self.output_path, usecols=["bggId"]):
+                bgg_ids.update(chunk["bggId"])
+                rows += len(chunk)
+        except (ValueError, pd.errors.ParserError) as e:
+            logger.warning(f"Could not read existing output file: {e}")
+            return
+        bgg_ids.discard("")
+        self.completed = bgg_ids
+        self.rows_written = rows
+        self._write_manifest([{"compacted": self.output_path.name, "rows": rows, "bggIds": sorted(bgg_ids)}])
+
+    def _remove_orphan_segments(self) -> None:
+        """Delete segment files a crash left behind before their manifest line was written."""
+        if not self.parts_dir.exists():
+            return
+        committed = {segment["segment"] for segment in self._segments}
+        for path in self.parts_dir.glob("part-*.csv*"):
+            if path.name not in committed:
+                path.unlink()
+
+    def _write_manifest(self, entries: List[Dict[str, Any]]) -> None:
+        """Atomically replace the manifest with entries."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def add(self, bgg_id: str, records: List[Dict[str, Any]]) -> None:
+        """
+        Buffer the records of one scraped game until the next flush.
+
+        Args:
+            bgg_id: Game the records belong to
+            records: Output rows of the game (flat dictionaries)
+        """
+        self._pending.extend(records)
+        self._pending_ids.append(str(bgg_id))
+
+    def flush(self) -> None:
+        """Write the buffered games as a new segment and commit it to the manifest."""
+        if not self._pending_ids:
+            return
+
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        name = f"part-{len(self._segments):06d}.csv"
+        tmp_path = self.parts_dir / f"{name}.tmp"
+        if self._pending:
+            pd.DataFrame(self._pending).to_csv(tmp_path, index=False, encoding="utf-8")
+        else:
+            tmp_path.write_text("", encoding="utf-8")
+        os.replace(tmp_path, self.parts_dir / name)
+
+        entry = {"segment": name, "rows": len(self._pending), "bggIds": self._pending_ids}
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._segments.append(entry)
+        self.completed.update(self._pending_ids)
+        self.rows_written += len(self._pending)
+        logger.debug(f"💾 Progress saved: {len(self._pending)} rows of {len(self._pending_ids)} games to {name}")
+        self._pending = []
+        self._pending_ids = []
+
+    def _compaction_chunks(self, sources: List[Path], segment_ids: set[str]) -> Iterator[pd.DataFrame]:
+        """Rows to compact, chunk by chunk: output rows of games not in a segment, then every segment row."""
+        for path in sources:
+            for chunk in _read_csv_chunks(path):
+                if path == self.output_path and "bggId" in chunk.columns:
+                    chunk = chunk[~chunk["bggId"].isin(segment_ids)].copy()
+                yield chunk
+
+    def compact(self) -> None:
+        """
+        Flush, then merge the output CSV and all segments into a new output CSV.
+
+        Columns are the union of all files (output columns first); rows of a
+        game that also appears in a segment are taken from the segment, so a
+        compaction interrupted after replacing the output can be rerun.
+        Numeric columns are formatted consistently (see _float_columns).
+        """
+        self.flush()
+        if not self._segments:
+            return
+
+        segment_paths = [self.parts_dir / segment["segment"] for segment in self._segments]
+        segment_ids = {bgg_id for segment in self._segments for bgg_id in segment["bggIds"]}
+        sources = [
+            path for path in [self.output_path, *segment_paths] if path.exists() and path.stat().st_size > 0
+        ]
+
+        columns: List[str] = []
+        for path in sources:
+            for column in pd.read_csv(path, nrows=0).columns:
+                if column not in columns:
+                    columns.append(column)
+        float_columns = _float_columns(self._compaction_chunks(sources, segment_ids), columns)
+
+        tmp_path = self.output_path.with_name(self.output_path.name + ".tmp")
+        rows = 0
+        header = True
+        for chunk in self._compaction_chunks(sources, segment_ids):
+            chunk = _format_floats(chunk, float_columns)
+            chunk.reindex(columns=columns, fill_value="").to_csv(
+                tmp_path, mode="w" if header else "a", header=header, index=False, encoding="utf-8"
+            )
+            header = False
+            rows += len(chunk)
+        if header:
+            tmp_path.write_text("", encoding="utf-8")
+        os.replace(tmp_path, self.output_path)
+
+        self._write_manifest([{"compacted": self.output_path.name, "rows": rows, "bggIds": sorted(self.completed)}])
+        for path in segment_paths:
+            path.unlink(missing_ok=True)
+        if not any(self.parts_dir.iterdir()):
+            self.parts_dir.rmdir()
+
+        logger.info(f"🗜️  Compacted {len(segment_paths)} segments into {self.output_path} ({rows} rows)")
+        self._segments = []
+        self.rows_written = rows
@@ -0,0 +1,260 @@
+"""
+HTTP Response Cache
+
+Opt-in on-disk cache of scraper GET responses, keyed by URL, in one SQLite
+file under the ETL data directory. Bodies are stored zlib-compressed along
+with their ETag and Last-Modified headers.
+
+A cached response younger than max_age is returned without a request (and
+without waiting on the rate controller); an older one is revalidated with
+If-None-Match / If-Modified-Since, and a 304 reuses the stored body. In
+offline mode only the cache is read, so parsers can be developed against
+pages fetched once.
+
+Usage:
+    cache = ResponseCache(max_age=7 * 24 * 3600)
+    session = ThrottledSession(controller, cache=cache)
+
+    # or from the environment (ETL_HTTP_CACHE=true)
+    cache = ResponseCache.shared()
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from etl.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds a cached response is used without revalidating it
+DEFAULT_MAX_AGE = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+def default_cache_file() -> Path:
+    """Cache file in the ETL data directory ($ETL_DATA_DIR, default etl/data)."""
+    data_dir = Path(os.getenv("ETL_DATA_DIR", str(Path(__file__).parent.parent / "data")))
+    return data_dir / "http_cache.sqlite"
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with its validators."""
+
+    url: str
+    content_type: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+    stored_at: float
+
+    def age(self) -> float:
+        """Seconds since the response was stored or last revalidated."""
+        return time.time() - self.stored_at
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a 200 requests.Response from the stored body and headers."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = self.url
+        response._content = self.body
+        headers = {"Content-Type": self.content_type, "ETag": self.etag, "Last-Modified": self.last_modified}
+        response.headers = CaseInsensitiveDict({key: value for key, value in headers.items() if value})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """
+    SQLite store of successful GET responses, keyed by URL.
+
+    One connection is shared by all threads behind a lock; every write is
+    committed, so an interrupted run keeps what it fetched.
+    """
+
+    _shared: Optional["ResponseCache"] = None
+    _shared_loaded = False
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = None, max_age: float = DEFAULT_MAX_AGE, offline: bool = False):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite file (default: default_cache_file())
+            max_age: Seconds a stored response is used without a request
+            offline: Never send requests; URLs missing from the cache fail
+        """
+        self.path = Path(path) if path else default_cache_file()
+        self.max_age = max_age
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        logger.info(f"📦 HTTP cache: {self.path} (max age {max_age:g}s{', offline' if offline else ''})")
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Cache configured by ETL_HTTP_CACHE, ETL_HTTP_CACHE_MAX_AGE and ETL_HTTP_CACHE_OFFLINE.
+
+        Returns:
+            ResponseCache, or None if the cache is not enabled
+        """
+        offline = os.getenv("ETL_HTTP_CACHE_OFFLINE", "false").lower() == "true"
+        if not offline and os.getenv("ETL_HTTP_CACHE", "false").lower() != "true":
+            return None
+        return cls(max_age=float(os.getenv("ETL_HTTP_CACHE_MAX_AGE", str(DEFAULT_MAX_AGE))), offline=offline)
+
+    @classmethod
+    def shared(cls) -> Optional["ResponseCache"]:
+        """Process-wide cache from the environment (see from_env), created on first use."""
+        with cls._shared_lock:
+            if not cls._shared_loaded:
+                cls._shared = cls.from_env()
+                cls._shared_loaded = True
+            return cls._shared
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Stored response for url, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_type, etag, last_modified, body, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        content_type, etag, last_modified, body, stored_at = row
+        return CachedResponse(url, content_type, etag, last_modified, zlib.decompress(body), stored_at)
+
+    def put(self, url: str, response: requests.Response) -> None:
+        """Store a successful response."""
+        body = zlib.compress(response.content, 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.headers.get("Content-Type"),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    body,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def entries(self, url_prefix: str = "") -> Iterator[CachedResponse]:
+        """Stored responses whose URL starts with url_prefix, in URL order."""
+        with self._lock:
+            urls = [row[0] for row in self._conn.execute(
+                "SELECT url FROM responses WHERE substr(url, 1, ?) = ? ORDER BY url", (len(url_prefix), url_prefix)
+            )]
+        for url in urls:
+            entry = self.get(url)
+            if entry is not None:
+                yield entry
+
+    def touch(self, url: str) -> None:
+        """Mark a stored response as revalidated now (after a 304)."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def fetch(self, url: str, send: Callable[[dict[str, str]], requests.Response]) -> requests.Response:
+        """
+        Response for url from the cache, revalidated or fetched as needed.
+
+        Args:
+            url: Full request URL (the cache key)
+            send: Sends the GET request with the given extra headers
+
+        Returns:
+            Cached or fetched response
+
+        Raises:
+            requests.ConnectionError: Offline and url is not cached
+        """
+        entry = self.get(url)
+        if entry is not None and (self.offline or entry.age() < self.max_age):
+            self.hits += 1
+            return entry.to_response()
+        if self.offline:
+            raise requests.ConnectionError(f"Not in the HTTP cache (offline): {url}")
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        response = send(headers)
+        if entry is not None and response.status_code == 304:
+            self.revalidated += 1
+            self.touch(url)
+            return entry.to_response()
+
+        self.misses += 1
+        if response.status_code == 200:
+            self.put(url, response)
+        return response
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+        logger.info(f"📦 HTTP cache: {self.hits} hits, {self.revalidated} revalidated, {self.misses} fetched")
+
+
+def add_cache_arguments(parser) -> None:
+    """Add the --cache, --cache-max-age and --offline options to a scraper CLI."""
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache responses in $ETL_DATA_DIR/http_cache.sqlite and revalidate them instead of refetching",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE,
+        help=f"Seconds a cached response is used without a request (default: {DEFAULT_MAX_AGE})",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve every request from the response cache and never hit BGG (implies --cache)",
+    )
+
+
+def cache_from_args(args) -> Optional[ResponseCache]:
+    """ResponseCache for the options added by add_cache_arguments, or None without --cache/--offline."""
+    if not (args.cache or args.offline):
+        return None
+    return ResponseCache(max_age=args.cache_max_age, offline=args.offline)
@@ -0,0 +1,424 @@
+"""
+Request Rate Limiting
+
+Token bucket shared by every request of a scraping run, so the request rate
+is enforced globally instead of by fixed sleeps around each request, and an
+adaptive (AIMD) controller on top of it that every BGG scraper session goes
+through: the rate grows additively while requests succeed, is cut
+multiplicatively on 429/503, honours Retry-After, and is persisted between
+runs.
+
+Usage:
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    bucket.acquire()              # from threads / synchronous code
+    await bucket.acquire_async()  # from asyncio code
+
+    controller = RateController.shared()           # learned rate, else 1 request/s
+    controller = RateController.shared(rate=0.2)   # explicit rate, ahead of a learned one and never exceeded
+    session = ThrottledSession(controller)
+    session.get(url)              # paced, retried on 429/503
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import requests
+
+from etl.logger import get_logger
+
+if TYPE_CHECKING:
+    from etl.extraction.http_cache import ResponseCache
+
+logger = get_logger(__name__)
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+# AIMD defaults: requests/s bounds, requests/s gained per second of successes, factor applied on throttling.
+# The maximum applies without an explicit rate and can be set with ETL_SCRAPER_MAX_RATE or --max-rate
+DEFAULT_INITIAL_RATE = 1.0
+DEFAULT_MIN_RATE = 0.05
+DEFAULT_MAX_RATE = 5.0
+DEFAULT_INCREASE = 0.05
+DEFAULT_DECREASE = 0.5
+
+# Throttled requests retried by ThrottledSession before the response is returned
+DEFAULT_MAX_RETRIES = 3
+
+# Key of the controller shared by all BGG scrapers in the state file
+BGG_KEY = "bgg"
+
+
+def default_state_file() -> Path:
+    """Learned rates file in the ETL data directory ($ETL_DATA_DIR, default etl/data)."""
+    data_dir = Path(os.getenv("ETL_DATA_DIR", str(Path(__file__).parent.parent / "data")))
+    return data_dir / "scraper_rates.json"
+
+
+def configured_max_rate() -> Optional[float]:
+    """Highest requests per second set by $ETL_SCRAPER_MAX_RATE, None if unset."""
+    value = os.getenv("ETL_SCRAPER_MAX_RATE")
+    return float(value) if value else None
+
+
+def add_max_rate_argument(parser) -> None:
+    """Add the --max-rate option to a scraper CLI."""
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Highest request rate (requests/s) the controller may start at or reach; an explicit --delay / --rate "
+        f"is a ceiling as well (default: $ETL_SCRAPER_MAX_RATE, else {DEFAULT_MAX_RATE})",
+    )
+
+
+def rate_for_delay(delay: Optional[float]) -> Optional[float]:
+    """Requests per second for a delay between requests (seconds), None for no delay given."""
+    return 1.0 / delay if delay else None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date).
+
+    Returns:
+        Seconds (>= 0), or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts of `burst`.
+
+    Tokens are reserved under a lock and the caller sleeps outside it, so
+    waiting callers queue up in order and threads and asyncio tasks can share
+    one bucket. A reservation past the available tokens takes on debt that
+    later callers wait out.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        Start with a full bucket.
+
+        Args:
+            rate: Requests per second
+            burst: Requests allowed back to back after an idle period
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens and return how long the caller must wait before using them.
+
+        Args:
+            tokens: Tokens to take (requests)
+
+        Returns:
+            Seconds to wait (0 if the tokens were available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """Wait without blocking the event loop until tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def hold(self, seconds: float) -> None:
+        """
+        Hand out no tokens for `seconds`, dropping any debt; one token is available when the hold ends.
+
+        Callers already waiting on an earlier reservation are not held back
+        and must reserve again (see RateController.acquire).
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._updated:
+                self._tokens = 1.0
+                self._updated = until
+
+
+class RateController:
+    """
+    Additive-increase / multiplicative-decrease request rate for one site.
+
+    Every request takes a token from the controller's TokenBucket and
+    reports its response with record(). Successes raise the rate by
+    `increase` requests/s per second; a 429 or 503 multiplies it by
+    `decrease`, at most once per window (throttles of requests reserved
+    before the last cut do not cut again), and a Retry-After pauses all
+    requests.
+    With a state file, the learned rate is loaded on creation and written
+    by save(); an explicitly requested rate takes precedence over it.
+
+    A requested rate is also the ceiling the controller recovers to, and is
+    never raised to min_rate; only a lower max_rate (or
+    $ETL_SCRAPER_MAX_RATE) caps it, with a warning.
+    """
+
+    _shared: dict[str, "RateController"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        min_rate: float = DEFAULT_MIN_RATE,
+        max_rate: Optional[float] = None,
+        increase: float = DEFAULT_INCREASE,
+        decrease: float = DEFAULT_DECREASE,
+        state_file: Optional[Path] = None,
+        key: str = BGG_KEY,
+        initial_rate: float = DEFAULT_INITIAL_RATE,
+    ):
+        """
+        Create a controller at the requested rate, else the state file's learned rate, else initial_rate.
+
+        Args:
+            rate: Starting and highest requests per second, ahead of a learned rate (None: use the learned rate)
+            min_rate: Lowest requests per second (lowered to a requested rate below it)
+            max_rate: Highest requests per second (None: $ETL_SCRAPER_MAX_RATE if set, else the
+                requested rate, else DEFAULT_MAX_RATE)
+            increase: Requests/s gained per second of successful requests
+            decrease: Factor applied to the rate on 429/503
+            state_file: JSON file the learned rate is persisted in (None: not persisted)
+            key: Entry of this controller in the state file
+            initial_rate: Starting requests per second without a requested or learned rate
+        """
+        if max_rate is None:
+            max_rate = configured_max_rate()
+        # A requested rate is a ceiling too, so the controller never speeds up past it
+        if rate is not None:
+            max_rate = rate if max_rate is None else min(rate, max_rate)
+        self.max_rate = DEFAULT_MAX_RATE if max_rate is None else max_rate
+        self.min_rate = min(min_rate, self.max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.state_file = Path(state_file) if state_file else None
+        self.key = key
+
+        stored = self._load()
+        if rate is not None:
+            start, source = rate, "requested"
+        elif stored is not None:
+            start, source = stored, "learned"
+        else:
+            start, source = initial_rate, "default, nothing learned yet"
+        self.bucket = TokenBucket(self._clamp(start))
+        self._lock = threading.Lock()
+        self._held_at = float("-inf")
+        self._last_decrease = float("-inf")
+        self.throttled = 0
+        if self.rate != start:
+            logger.warning(
+                f"⚠ Starting {key} rate {start:.2f}/s ({source}) clamped to {self.rate:.2f}/s, "
+                f"the limits are {self.min_rate:.2f}-{self.max_rate:.2f}/s (maximum: --max-rate or ETL_SCRAPER_MAX_RATE)"
+            )
+        if rate is not None and stored is not None:
+            source += f", learned {stored:.2f}/s ignored"
+        logger.info(f"🚦 Starting {key} requests at {self.rate:.2f}/s, at most {self.max_rate:.2f}/s ({source})")
+
+    @classmethod
+    def shared(
+        cls,
+        rate: Optional[float] = None,
+        key: str = BGG_KEY,
+        initial_rate: float = DEFAULT_INITIAL_RATE,
+        max_rate: Optional[float] = None,
+    ) -> "RateController":
+        """
+        Process-wide controller for key, persisted in default_state_file().
+
+        Created on first use, so all scrapers of a site in one process share
+        one rate. It starts at `rate` if given, else at the stored learned
+        rate, else at `initial_rate`, and stays at or below max_rate (see
+        __init__); all of them only apply on creation.
+        """
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(
+                    rate=rate,
+                    max_rate=max_rate,
+                    state_file=default_state_file(),
+                    key=key,
+                    initial_rate=initial_rate,
+                )
+            return cls._shared[key]
+
+    @property
+    def rate(self) -> float:
+        """Current requests per second."""
+        return self.bucket.rate
+
+    def _clamp(self, rate: float) -> float:
+        return min(self.max_rate, max(self.min_rate, rate))
+
+    def acquire(self) -> float:
+        """
+        Block until the next request may be sent.
+
+        If a Retry-After pause starts while waiting, the token is reserved
+        again after the pause instead of being used during it.
+
+        Returns:
+            Reservation time (time.monotonic) to pass to record()
+        """
+        while True:
+            reserved_at = time.monotonic()
+            self.bucket.acquire()
+            if self._held_at < reserved_at:
+                return reserved_at
+
+    async def acquire_async(self) -> float:
+        """Wait without blocking the event loop until the next request may be sent (see acquire)."""
+        while True:
+            reserved_at = time.monotonic()
+            await self.bucket.acquire_async()
+            if self._held_at < reserved_at:
+                return reserved_at
+
+    def record(self, status_code: int, retry_after: Optional[str] = None, reserved_at: Optional[float] = None) -> bool:
+        """
+        Adapt the rate to a response.
+
+        Args:
+            status_code: HTTP status of the response
+            retry_after: Retry-After header of the response, if any
+            reserved_at: Value returned by acquire() for the request
+
+        Returns:
+            True if the response was throttled (429/503) and the request should be retried
+        """
+        now = time.monotonic()
+        with self._lock:
+            if status_code in THROTTLE_STATUSES:
+                self.throttled += 1
+                wait = parse_retry_after(retry_after)
+                if wait:
+                    self.bucket.hold(wait)
+                    self._held_at = now
+                if reserved_at is None or reserved_at >= self._last_decrease:
+                    self.bucket.rate = self._clamp(self.bucket.rate * self.decrease)
+                    self._last_decrease = now
+                    logger.warning(
+                        f"⚠ Throttled ({status_code}): request rate cut to {self.bucket.rate:.2f}/s"
+                        + (f", pausing {wait:.1f}s (Retry-After)" if wait else "")
+                    )
+                return True
+
+            if status_code < 400:
+                # `increase` requests/s per second of successes at the current rate
+                self.bucket.rate = self._clamp(self.bucket.rate + self.increase / self.bucket.rate)
+            return False
+
+    def _load(self) -> Optional[float]:
+        if not self.state_file or not self.state_file.exists():
+            return None
+        try:
+            entry = json.loads(self.state_file.read_text(encoding="utf-8")).get(self.key)
+            return float(entry["rate"]) if entry else None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not read learned request rates from {self.state_file}: {e}")
+            return None
+
+    def save(self) -> None:
+        """Write the current rate to the state file (atomically, keeping other keys)."""
+        if not self.state_file:
+            return
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8")) if self.state_file.exists() else {}
+        except (OSError, ValueError):
+            state = {}
+        state[self.key] = {"rate": round(self.rate, 4), "updatedAt": datetime.now(timezone.utc).isoformat()}
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_name(f"{self.state_file.name}.tmp")
+        tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.state_file)
+        logger.debug(f"Saved request rate {self.rate:.2f}/s for {self.key} to {self.state_file}")
+
+
+class ThrottledSession(requests.Session):
+    """
+    requests session whose requests all go through a RateController.
+
+    Throttled responses (429/503) are retried up to max_retries times after
+    the controller's pause and backoff; the last response is returned as is.
+    With a ResponseCache, GET requests are served from and stored in it, and
+    cache hits are not rate limited.
+    """
+
+    def __init__(
+        self,
+        controller: RateController,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        cache: Optional["ResponseCache"] = None,
+    ):
+        super().__init__()
+        self.controller = controller
+        self.max_retries = max_retries
+        self.cache = cache
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        if self.cache is None or method.upper() != "GET":
+            return self._throttled_request(method, url, *args, **kwargs)
+
+        url = requests.Request(method, url, params=kwargs.pop("params", None)).prepare().url
+        headers = kwargs.pop("headers", None) or {}
+        return self.cache.fetch(
+            url, lambda extra: self._throttled_request(method, url, *args, headers={**headers, **extra}, **kwargs)
+        )
+
+    def _throttled_request(self, method, url, *args, **kwargs) -> requests.Response:
+        for attempt in range(self.max_retries + 1):
+            reserved_at = self.controller.acquire()
+            response = super().request(method, url, *args, **kwargs)
+            throttled = self.controller.record(response.status_code, response.headers.get("Retry-After"), reserved_at)
+            if not throttled or attempt == self.max_retries:
+                return response
+            logger.debug(f"Retrying {url} after {response.status_code} (attempt {attempt + 2}/{self.max_retries + 1})")
+            response.close()
+        return response
+
+    def close(self) -> None:
+        """Close the session and persist the controller's rate."""
+        super().close()
+        self.controller.save()
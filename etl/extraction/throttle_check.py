@@ -0,0 +1,257 @@
+"""
+Rate Controller Throttling Check
+
+Runs ThrottledSession / RateController against a local stub server that
+throttles like BGG: it allows a fixed number of requests per second and
+answers anything over it with 429 and a Retry-After header, then keeps
+answering 429 until the Retry-After has passed. Several worker threads
+share one controller, as the batch scrapers do.
+
+The check fails unless:
+- the controller cut its rate below the starting rate,
+- no request reached the server while a Retry-After pause was in force
+  (apart from requests already in flight when the 429 was sent), and
+- every page was fetched (none lost to exhausted retries).
+
+Usage:
+    python -m etl.extraction.throttle_check
+    python -m etl.extraction.throttle_check --allowed-rate 5 --start-rate 40 --pages 80 --workers 8
+"""
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+# Add project root to Python path for imports
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from etl.extraction.rate_limit import RateController, ThrottledSession
+from etl.logger import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PAGES = 60
+DEFAULT_ALLOWED_RATE = 10.0
+DEFAULT_START_RATE = 40.0
+DEFAULT_RETRY_AFTER = 1
+DEFAULT_WORKERS = 4
+
+# Seconds after a 429 during which requests already in flight may still arrive
+IN_FLIGHT_GRACE = 0.1
+
+# Retries per page; generous so a lost page means the controller misbehaved, not bad luck
+CHECK_MAX_RETRIES = 10
+
+
+@dataclass
+class StubLog:
+    """Requests seen by the stub server."""
+
+    arrivals: list[float] = field(default_factory=list)
+    # (sent at, Retry-After seconds) of each 429 that started a pause
+    pauses: list[tuple[float, float]] = field(default_factory=list)
+    throttled: int = 0
+
+
+class ThrottlingStub(ThreadingHTTPServer):
+    """
+    HTTP server allowing `allowed_rate` requests per second (1s sliding window).
+
+    GET /page/<n> answers "page <n>"; a request over the limit, or during a
+    pause, is answered 429 with Retry-After: `retry_after`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, allowed_rate: float, retry_after: int):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.allowed_rate = allowed_rate
+        self.retry_after = retry_after
+        self.log = StubLog()
+        self._lock = threading.Lock()
+        self._window: list[float] = []
+        self._paused_until = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def admit(self) -> bool:
+        """Record a request and decide whether it is served (False: 429)."""
+        with self._lock:
+            now = time.monotonic()
+            self.log.arrivals.append(now)
+            if now < self._paused_until:
+                self.log.throttled += 1
+                return False
+            self._window = [t for t in self._window if t > now - 1.0]
+            if len(self._window) >= self.allowed_rate:
+                self._paused_until = now + self.retry_after
+                self.log.pauses.append((now, float(self.retry_after)))
+                self.log.throttled += 1
+                return False
+            self._window.append(now)
+            return True
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: ThrottlingStub
+
+    def do_GET(self):
+        if not self.server.admit():
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.path.rsplit("/", 1)[-1].encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def requests_during_pauses(log: StubLog, grace: float = IN_FLIGHT_GRACE) -> list[float]:
+    """Arrival times (relative to their pause) of requests that reached the stub while it was paused."""
+    early = []
+    for start, seconds in log.pauses:
+        for arrival in log.arrivals:
+            if start + grace < arrival < start + seconds:
+                early.append(arrival - start)
+    return early
+
+
+def run_check(
+    pages: int = DEFAULT_PAGES,
+    allowed_rate: float = DEFAULT_ALLOWED_RATE,
+    start_rate: float = DEFAULT_START_RATE,
+    retry_after: int = DEFAULT_RETRY_AFTER,
+    workers: int = DEFAULT_WORKERS,
+) -> dict:
+    """
+    Fetch `pages` pages from a throttling stub through one shared controller.
+
+    Args:
+        pages: Pages to fetch
+        allowed_rate: Requests per second the stub serves before throttling
+        start_rate: Controller's starting requests per second (above allowed_rate to provoke 429s)
+        retry_after: Retry-After seconds sent with each 429
+        workers: Threads fetching at once, each with its own session
+
+    Returns:
+        Result record: rates, counts, lost pages and requests sent during pauses
+    """
+    server = ThrottlingStub(allowed_rate, retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Explicit max_rate, so ETL_SCRAPER_MAX_RATE cannot lower the starting rate
+    controller = RateController(rate=start_rate, max_rate=start_rate)
+    local = threading.local()
+    sessions: list[ThrottledSession] = []
+
+    def fetch(page: int) -> Optional[str]:
+        if not hasattr(local, "session"):
+            local.session = ThrottledSession(controller, max_retries=CHECK_MAX_RETRIES)
+            sessions.append(local.session)
+        response = local.session.get(f"{server.url}/page/{page}", timeout=10)
+        return response.text if response.status_code == 200 else None
+
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            bodies = list(executor.map(fetch, range(pages)))
+    finally:
+        for session in sessions:
+            session.close()
+        server.shutdown()
+        server.server_close()
+
+    return {
+        "seconds": time.monotonic() - started,
+        "start_rate": start_rate,
+        "final_rate": controller.rate,
+        "requests": len(server.log.arrivals),
+        "throttled": server.log.throttled,
+        "pauses": len(server.log.pauses),
+        "lost_pages": [page for page, body in enumerate(bodies) if body != str(page)],
+        "requests_during_pauses": requests_during_pauses(server.log),
+    }
+
+
+def check_failures(result: dict) -> list[str]:
+    """Failed expectations of a run_check result (empty if the controller behaved)."""
+    failures = []
+    if result["throttled"] == 0:
+        failures.append("the stub never throttled; raise --start-rate or lower --allowed-rate")
+    elif result["final_rate"] >= result["start_rate"]:
+        failures.append(f"rate was not cut ({result['start_rate']:g}/s -> {result['final_rate']:.2f}/s)")
+    if result["requests_during_pauses"]:
+        offsets = ", ".join(f"{offset:.2f}s" for offset in result["requests_during_pauses"][:10])
+        failures.append(f"{len(result['requests_during_pauses'])} requests sent during a Retry-After pause ({offsets})")
+    if result["lost_pages"]:
+        failures.append(f"{len(result['lost_pages'])} pages lost: {result['lost_pages'][:10]}")
+    return failures
+
+
+def main():
+    """CLI entry point: check the rate controller against the throttling stub."""
+    parser = argparse.ArgumentParser(description="Check the adaptive rate controller against a throttling stub server")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES, help=f"Pages to fetch (default: {DEFAULT_PAGES})")
+    parser.add_argument(
+        "--allowed-rate",
+        type=float,
+        default=DEFAULT_ALLOWED_RATE,
+        help=f"Requests per second the stub serves before answering 429 (default: {DEFAULT_ALLOWED_RATE})",
+    )
+    parser.add_argument(
+        "--start-rate",
+        type=float,
+        default=DEFAULT_START_RATE,
+        help=f"Starting requests per second of the controller (default: {DEFAULT_START_RATE})",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=DEFAULT_RETRY_AFTER,
+        help=f"Retry-After seconds sent with each 429 (default: {DEFAULT_RETRY_AFTER})",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help=f"Threads sharing the controller (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (default: INFO)",
+    )
+    args = parser.parse_args()
+    setup_logging(level=args.log_level, log_to_file=False)
+
+    result = run_check(args.pages, args.allowed_rate, args.start_rate, args.retry_after, args.workers)
+    logger.info(
+        f"{args.pages} pages in {result['seconds']:.1f}s: {result['requests']} requests, "
+        f"{result['throttled']} throttled, {result['pauses']} Retry-After pauses, "
+        f"rate {result['start_rate']:g}/s -> {result['final_rate']:.2f}/s"
+    )
+
+    failures = check_failures(result)
+    for failure in failures:
+        logger.error(f"❌ {failure}")
+    if not failures:
+        logger.info("✓ Rate cut, no requests during pauses, no pages lost")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Compact ID Maps
+
+Array-backed mappings from natural keys (bggId, username) to ObjectIds,
+used to resolve rating references without a Python dict entry per key.
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from bson import ObjectId
+
+from etl.logger import get_logger
+
+logger = get_logger(__name__)
+
+# ObjectIds are stored as rows of their raw 12 bytes
+_ID_WIDTH = 12
+
+
+def _pack_ids(binaries: list[bytes]) -> np.ndarray:
+    """Pack raw ObjectId bytes into an (n, 12) uint8 array."""
+    return np.frombuffer(b"".join(binaries), dtype=np.uint8).reshape(-1, _ID_WIDTH)
+
+
+class IdMap:
+    """
+    Mapping of natural keys to ObjectIds backed by arrays.
+
+    Keys are held in a pandas Index and ids as 12-byte rows, so a map
+    costs a few dozen bytes per key instead of a dict entry plus an ObjectId
+    object. Bulk lookups are index joins; ObjectId objects are only created
+    for the keys a lookup actually hits.
+    """
+
+    def __init__(self, keys: Optional[Iterable] = None, ids: Optional[np.ndarray] = None):
+        """
+        Build a map from parallel key and id arrays.
+
+        Args:
+            keys: Natural keys (ints or strings); duplicates keep the last id
+            ids: (n, 12) uint8 array of raw ObjectId bytes, one row per key
+        """
+        index = pd.Index([] if keys is None else keys)
+        ids = np.empty((0, _ID_WIDTH), dtype=np.uint8) if ids is None else np.asarray(ids, dtype=np.uint8)
+        if len(index) != len(ids):
+            raise ValueError(f"Got {len(index)} keys but {len(ids)} ids")
+
+        # Same semantics as building a dict: the last id for a key wins
+        if not index.is_unique:
+            keep = ~index.duplicated(keep="last")
+            index, ids = index[keep], ids[keep]
+
+        self._keys = index
+        self._ids = ids
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[dict], key_field: str) -> "IdMap":
+        """
+        Build a map from loaded documents.
+
+        Args:
+            documents: Documents with an _id and the key field
+            key_field: Natural key field (e.g., "bggId", "username")
+
+        Returns:
+            IdMap of key_field to _id
+        """
+        keys, ids = [], []
+        for document in documents:
+            keys.append(document[key_field])
+            ids.append(document["_id"].binary)
+        return cls(keys, _pack_ids(ids))
+
+    @classmethod
+    def from_dict(cls, mapping: Mapping[Any, ObjectId]) -> "IdMap":
+        """Build a map from a plain key -> ObjectId mapping."""
+        return cls(list(mapping.keys()), _pack_ids([oid.binary for oid in mapping.values()]))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def get(self, key: Any, default: Optional[ObjectId] = None) -> Optional[ObjectId]:
+        """Look up a single key, like dict.get."""
+        if key not in self._keys:
+            return default
+        return ObjectId(self._ids[self._keys.get_loc(key)].tobytes())
+
+    def positions(self, keys: pd.Series) -> np.ndarray:
+        """
+        Resolve keys to positions in the map.
+
+        Args:
+            keys: Keys to look up; categorical keys are joined per category
+
+        Returns:
+            Array of positions, -1 for unknown keys
+        """
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            category_positions = np.append(self._keys.get_indexer(keys.cat.categories), -1)
+            return category_positions[keys.cat.codes.to_numpy()]
+
+        return self._keys.get_indexer(keys)
+
+    def lookup(self, keys: pd.Series) -> np.ndarray:
+        """
+        Resolve keys to ObjectIds in bulk.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            Object array of ObjectIds, None for unknown keys
+        """
+        return self.objects(self.positions(keys))
+
+    def objects(self, positions: np.ndarray) -> np.ndarray:
+        """
+        ObjectIds at positions returned by positions().
+
+        Args:
+            positions: Positions in the map, -1 for unknown keys
+
+        Returns:
+            Object array of ObjectIds, None for unknown keys
+        """
+        # Create one ObjectId per distinct hit and share it between rows
+        codes, distinct = pd.factorize(positions)
+        objects = np.array(
+            [ObjectId(self._ids[p].tobytes()) if p >= 0 else None for p in distinct.tolist()] + [None],
+            dtype=object,
+        )
+        return objects[codes]
+
+    def binary(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Raw ObjectId bytes at known positions, without creating ObjectId objects.
+
+        Args:
+            positions: Positions in the map (all >= 0)
+
+        Returns:
+            (n, 12) uint8 array
+        """
+        return self._ids[positions]
+
+    def save(self, path: Path) -> None:
+        """
+        Write the map to an .npz file.
+
+        String keys are stored as one UTF-8 buffer plus offsets rather than
+        a fixed-width array sized for the longest key.
+
+        Args:
+            path: Destination file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays: dict[str, np.ndarray] = {"ids": self._ids}
+        if pd.api.types.is_integer_dtype(self._keys.dtype):
+            arrays["int_keys"] = self._keys.to_numpy(dtype="int64")
+        else:
+            encoded = [str(key).encode("utf-8") for key in self._keys]
+            arrays["key_bytes"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            arrays["key_offsets"] = np.cumsum([0] + [len(key) for key in encoded], dtype=np.int64)
+
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+        logger.info(f"Saved {len(self)} ids to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "IdMap":
+        """
+        Read a map written by save.
+
+        Args:
+            path: Source file
+
+        Returns:
+            IdMap with the saved keys and ids
+        """
+        with np.load(path, allow_pickle=False) as data:
+            ids = data["ids"]
+            if "int_keys" in data:
+                keys = data["int_keys"]
+            else:
+                buffer = data["key_bytes"].tobytes()
+                offsets = data["key_offsets"].tolist()
+                keys = [buffer[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+        return cls(keys, ids)
@@ -10,7 +10,7 @@ from typing import Any, Optional
 from datetime import datetime
 
 import pandas as pd
-from pymongo import MongoClient, UpdateOne
+from pymongo import IndexModel, MongoClient, UpdateOne
 from pymongo.database import Database
 from pymongo.collection import Collection
 from dotenv import load_dotenv
@@ -163,6 +163,42 @@ class MongoDBHelper:
             except Exception as e:
                 logger.warning(f"Index creation failed on {collection_name}: {e}")
 
+    def build_indexes(self, collection_name: str, indexes: list[dict]) -> list[str]:
+        """
+        Build all indexes on a collection with a single createIndexes command.
+
+        Unlike create_indexes, failures (e.g. duplicate keys for a unique
+        index) are raised so callers can abort.
+
+        Args:
+            collection_name: Name of the collection.
+            indexes: List of index definitions with 'key' and optional options.
+
+        Returns:
+            Names of the created indexes.
+        """
+        models = [
+            IndexModel(
+                list(index_def["key"].items()),
+                **{k: v for k, v in index_def.items() if k != "key"},
+            )
+            for index_def in indexes
+        ]
+        index_names = self.get_collection(collection_name).create_indexes(models)
+        logger.info(f"Built {len(index_names)} indexes on {collection_name}: {index_names}")
+        return index_names
+
+    def rename_collection(self, source: str, target: str) -> None:
+        """
+        Atomically rename a collection, replacing the target if it exists.
+
+        Args:
+            source: Name of the collection to rename.
+            target: New name; an existing collection with this name is dropped.
+        """
+        self.get_collection(source).rename(target, dropTarget=True)
+        logger.info(f"Renamed collection {source} -> {target}")
+
 
 # Collection names (must match TypeScript schema)
 COLLECTIONS = {
@@ -181,6 +217,8 @@ INDEXES = {
         {"key": {"categories": 1}},
         {"key": {"mechanics": 1}},
         {"key": {"bggRating.average": -1}},
+        {"key": {"ratingStats.bayesAverage": -1}},
+        {"key": {"ratingStats.count": -1}},
         {"key": {"bggRank": 1}},
         {"key": {"minPlayers": 1, "maxPlayers": 1}},
     ],
@@ -4,24 +4,261 @@ ETL Data Loader
 Loads transformed data into MongoDB.
 """
 
-from typing import Optional
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
 
-from etl.lib.mongodb import MongoDBHelper, COLLECTIONS, initialize_database
+import bson
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.collection import Collection
+
+from etl.bson_columns import iter_raw_documents
+from etl.lib.mongodb import MongoDBHelper, COLLECTIONS, INDEXES, initialize_database
 from etl.logger import get_logger, PipelineProgress
 from etl.config import get_config
 
 logger = get_logger(__name__)
 
+# Number of insert_many batches kept in flight per collection
+DEFAULT_CONCURRENCY = 4
+
+# Suffix of the collections written in staging mode before they are swapped in
+STAGING_SUFFIX = "__staging"
+
+
+@dataclass
+class BulkWriteReport:
+    """Timing and throughput of one bulk load into a collection."""
+
+    collection: str
+    documents: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    batch_latencies: list[float] = field(default_factory=list)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def max_batch_latency(self) -> float:
+        return max(self.batch_latencies, default=0.0)
+
+    @property
+    def mean_batch_latency(self) -> float:
+        if not self.batch_latencies:
+            return 0.0
+        return sum(self.batch_latencies) / len(self.batch_latencies)
+
+
+# Field holding each document's content hash in incremental mode
+CONTENT_HASH_FIELD = "contentHash"
+
+# Field holding the id of the last full incremental sync that saw each document
+SYNC_RUN_FIELD = "syncRunId"
+
+# Fields that do not count as content when hashing a document
+_UNHASHED_FIELDS = frozenset({"_id", "createdAt", "updatedAt", CONTENT_HASH_FIELD, SYNC_RUN_FIELD})
+
+# Natural key fields and ownership scope of the collections synced in
+# incremental mode. Only documents matching the scope are ETL-owned and may be
+# deleted, so app users and app ratings are never touched. Ratings are keyed by
+# (userId, gameId), which is (username, bggId) once user and game ids are reused.
+DELTA_KEYS: dict[str, tuple[tuple[str, ...], dict]] = {
+    COLLECTIONS["GAMES"]: (("bggId",), {}),
+    COLLECTIONS["USERS"]: (("clerkId",), {"clerkId": {"$regex": "^shadow_"}}),
+    COLLECTIONS["RATINGS"]: (("userId", "gameId"), {"origin": "bgg"}),
+}
+
+
+@dataclass
+class DeltaReport:
+    """Outcome of an incremental sync of one collection."""
+
+    collection: str
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    duplicates: int = 0
+
+
+def content_hash(document: dict) -> str:
+    """Hash a document's content, ignoring _id, timestamps and the hash itself."""
+    content = {k: v for k, v in document.items() if k not in _UNHASHED_FIELDS}
+    return hashlib.blake2b(bson.encode(content), digest_size=16).hexdigest()
+
+
+class DeltaSync:
+    """
+    Diffs incoming documents against a collection by natural key and content hash.
+
+    Incoming documents are looked up one batch at a time: by _id first, since
+    ids are derived from natural keys, then by natural key for documents
+    stored under another _id. Each document then becomes an insert, an update
+    or nothing. Documents that match an existing key take over the stored _id
+    (the document is modified in place), so unchanged entities keep their
+    ObjectIds across runs.
+
+    Nothing is kept across batches. A full sync instead stamps every incoming
+    document with its run id, and deletes the documents in scope left
+    without it at the end.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        key_fields: tuple[str, ...],
+        scope: dict,
+        full_set: bool,
+    ):
+        """
+        Initialize the sync.
+
+        Args:
+            collection: Collection to sync
+            key_fields: Fields forming the natural key
+            scope: Filter selecting the ETL-owned documents
+            full_set: Whether the incoming documents are the complete set, so
+                that existing documents not seen can be deleted
+        """
+        self.collection = collection
+        self.key_fields = key_fields
+        self.scope = scope
+        self.full_set = full_set
+        self.run_id = bson.ObjectId() if full_set else None
+        self.report = DeltaReport(collection=collection.name)
+
+    def _key(self, document: dict) -> tuple:
+        return tuple(document.get(field_name) for field_name in self.key_fields)
+
+    def _in_scope(self, query: dict) -> dict:
+        return {"$and": [self.scope, query]} if self.scope else query
+
+    def _existing(self, batch: list[dict]) -> dict[tuple, dict]:
+        """
+        Read the stored documents matching a batch, by natural key.
+
+        Args:
+            batch: Incoming documents
+
+        Returns:
+            Natural key to stored _id, content hash and run id
+        """
+        projection = {field_name: 1 for field_name in self.key_fields}
+        projection[CONTENT_HASH_FIELD] = 1
+        projection[SYNC_RUN_FIELD] = 1
+
+        ids = [document["_id"] for document in batch if "_id" in document]
+        query = self._in_scope({"_id": {"$in": ids}})
+        existing = {self._key(doc): doc for doc in self.collection.find(query, projection)}
+
+        missing = list({key for key in map(self._key, batch) if key not in existing})
+        if missing:
+            if len(self.key_fields) == 1:
+                query = {self.key_fields[0]: {"$in": [key[0] for key in missing]}}
+            else:
+                query = {"$or": [dict(zip(self.key_fields, key)) for key in missing]}
+            existing.update((self._key(doc), doc) for doc in self.collection.find(self._in_scope(query), projection))
+        return existing
+
+    def diff(self, documents: Iterable[dict], batch_size: int) -> Iterator:
+        """
+        Turn incoming documents into insert/update operations, batch by batch.
+
+        Args:
+            documents: Transformed documents (a generator is consumed batch by batch)
+            batch_size: Documents looked up per query
+
+        Yields:
+            InsertOne/UpdateOne operations (an UpdateOne stamping the run id for
+            unchanged documents of a full sync)
+        """
+        for batch in _iter_batches(documents, batch_size):
+            existing = self._existing(batch)
+            batch_keys: set[tuple] = set()
+
+            for document in batch:
+                key = self._key(document)
+                current = existing.get(key)
+                # A stored document carrying this run's id was written by an earlier batch
+                written = self.run_id is not None and current is not None and current.get(SYNC_RUN_FIELD) == self.run_id
+                if key in batch_keys or written:
+                    self.report.duplicates += 1
+                    continue
+                batch_keys.add(key)
+
+                digest = content_hash(document)
+                document[CONTENT_HASH_FIELD] = digest
+                if self.run_id is not None:
+                    document[SYNC_RUN_FIELD] = self.run_id
+
+                if current is None:
+                    yield InsertOne(document)
+                    self.report.inserted += 1
+                    continue
+
+                document["_id"] = current["_id"]
+                if current.get(CONTENT_HASH_FIELD) == digest:
+                    if self.run_id is not None:
+                        yield UpdateOne({"_id": current["_id"]}, {"$set": {SYNC_RUN_FIELD: self.run_id}})
+                    self.report.unchanged += 1
+                    continue
+
+                changes = {k: v for k, v in document.items() if k not in ("_id", "createdAt")}
+                yield UpdateOne({"_id": current["_id"]}, {"$set": changes})
+                self.report.updated += 1
+
+    def delete_unseen(self) -> int:
+        """
+        Delete the documents in scope that this full sync did not stamp.
+
+        Returns:
+            Number of documents deleted (0 unless full_set)
+        """
+        if not self.full_set:
+            return 0
+
+        result = self.collection.delete_many(self._in_scope({SYNC_RUN_FIELD: {"$ne": self.run_id}}))
+        self.report.deleted = result.deleted_count
+        return self.report.deleted
+
+
+def _iter_batches(documents: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    """Split documents into lists of at most batch_size without materializing them all."""
+    iterator = iter(documents)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
 
 class DataLoader:
     """Loads ETL data into MongoDB."""
 
-    def __init__(self, mongo: Optional[MongoDBHelper] = None):
+    def __init__(
+        self,
+        mongo: Optional[MongoDBHelper] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        batch_size: Optional[int] = None,
+        staging: bool = False,
+        incremental: bool = False,
+    ):
         """
         Initialize the data loader.
 
         Args:
             mongo: MongoDB helper instance. If None, creates from config.
+            concurrency: Number of insert_many batches kept in flight
+            batch_size: Documents per batch for every collection. If None,
+                each load method uses its own default.
+            staging: Write full reloads into index-free staging collections
+                that are swapped in by promote_staging().
+            incremental: Sync games, users and ratings by natural key and
+                content hash instead of dropping and reloading them. Deletes
+                are applied by finish_incremental().
         """
         if mongo is None:
             config = get_config()
@@ -32,6 +269,13 @@ class DataLoader:
         else:
             self.mongo = mongo
 
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+        self.staging = staging
+        self.staged: list[str] = []
+        self.incremental = incremental
+        self.syncs: dict[str, DeltaSync] = {}
+        self.reports: list[BulkWriteReport] = []
         self._connected = False
 
     def connect(self) -> None:
@@ -69,24 +313,13 @@ class DataLoader:
         Returns:
             Number of documents loaded
         """
-        self.connect()
-        collection = self.mongo.get_collection(COLLECTIONS["GAMES"])
-
-        if drop_existing:
-            collection.drop()
-            logger.info("Dropped games collection")
-
-        progress = PipelineProgress("games", len(games))
-        loaded = 0
-
-        for i in range(0, len(games), batch_size):
-            batch = games[i : i + batch_size]
-            result = collection.insert_many(batch)
-            loaded += len(result.inserted_ids)
-            progress.update(len(batch))
-
-        progress.complete()
-        return loaded
+        return self._bulk_insert(
+            COLLECTIONS["GAMES"],
+            games,
+            label="games",
+            batch_size=batch_size,
+            drop_existing=drop_existing,
+        )
 
     def load_users(
         self,
@@ -105,24 +338,13 @@ class DataLoader:
         Returns:
             Number of documents loaded
         """
-        self.connect()
-        collection = self.mongo.get_collection(COLLECTIONS["USERS"])
-
-        if drop_existing:
-            collection.drop()
-            logger.info("Dropped users collection")
-
-        progress = PipelineProgress("users", len(users))
-        loaded = 0
-
-        for i in range(0, len(users), batch_size):
-            batch = users[i : i + batch_size]
-            result = collection.insert_many(batch)
-            loaded += len(result.inserted_ids)
-            progress.update(len(batch))
-
-        progress.complete()
-        return loaded
+        return self._bulk_insert(
+            COLLECTIONS["USERS"],
+            users,
+            label="users",
+            batch_size=batch_size,
+            drop_existing=drop_existing,
+        )
 
     def load_ratings(
         self,
@@ -141,24 +363,81 @@ class DataLoader:
         Returns:
             Number of documents loaded
         """
-        self.connect()
-        collection = self.mongo.get_collection(COLLECTIONS["RATINGS"])
+        return self._bulk_insert(
+            COLLECTIONS["RATINGS"],
+            ratings,
+            label="ratings",
+            batch_size=batch_size,
+            drop_existing=drop_existing,
+        )
+
+    def load_rating_columns(
+        self,
+        columns: dict,
+        batch_size: int = 10000,
+        drop_existing: bool = False,
+    ) -> int:
+        """
+        Load ratings from columns (see transform_ratings_to_columns).
 
-        if drop_existing:
-            collection.drop()
-            logger.info("Dropped ratings collection")
+        Documents are encoded to BSON straight from the column arrays, batch
+        by batch, and inserted as raw BSON, so no dict is built per rating.
+        Not available in incremental mode, which diffs documents as dicts.
 
-        progress = PipelineProgress("ratings", len(ratings))
-        loaded = 0
+        Args:
+            columns: Rating field name to column values
+            batch_size: Documents per batch
+            drop_existing: Drop collection before loading
 
-        for i in range(0, len(ratings), batch_size):
-            batch = ratings[i : i + batch_size]
-            result = collection.insert_many(batch)
-            loaded += len(result.inserted_ids)
-            progress.update(len(batch))
+        Returns:
+            Number of documents loaded
+        """
+        if self.incremental:
+            raise ValueError("Columnar rating loads are not supported in incremental mode")
+
+        batch_size = self.batch_size or batch_size
+        return self._bulk_insert(
+            COLLECTIONS["RATINGS"],
+            iter_raw_documents(columns, batch_size),
+            label="ratings",
+            batch_size=batch_size,
+            drop_existing=drop_existing,
+        )
+
+    def update_games(self, operations: list, batch_size: int = 1000) -> int:
+        """
+        Apply update operations (e.g., rating statistics) to the games collection.
 
-        progress.complete()
-        return loaded
+        In staging mode this targets the staging collection of the current run.
+
+        Args:
+            operations: UpdateOne operations
+            batch_size: Operations per bulk_write
+
+        Returns:
+            Number of operations applied
+        """
+        games = self.collection(COLLECTIONS["GAMES"])
+        return self._run_batches(games, operations, "game updates", batch_size, self._write_batch)
+
+    def update_recommendations(self, operations: Iterable, batch_size: int = 1000) -> int:
+        """
+        Apply upserts of precomputed recommendations.
+
+        Args:
+            operations: UpdateOne operations (a generator is consumed batch by batch)
+            batch_size: Operations per bulk_write
+
+        Returns:
+            Number of operations applied
+        """
+        recommendations = self.collection(COLLECTIONS["RECOMMENDATIONS"])
+        return self._run_batches(recommendations, operations, "recommendations", batch_size, self._write_batch)
+
+    def collection(self, collection_name: str) -> Collection:
+        """Collection this run writes collection_name to (its staging collection once staged)."""
+        self.connect()
+        return self._resolve_target(collection_name, collection_name, drop_existing=False)
 
     def load_similarities(
         self,
@@ -177,24 +456,13 @@ class DataLoader:
         Returns:
             Number of documents loaded
         """
-        self.connect()
-        collection = self.mongo.get_collection(COLLECTIONS["GAME_SIMILARITIES"])
-
-        if drop_existing:
-            collection.drop()
-            logger.info("Dropped similarities collection")
-
-        progress = PipelineProgress("similarities", len(similarities))
-        loaded = 0
-
-        for i in range(0, len(similarities), batch_size):
-            batch = similarities[i : i + batch_size]
-            result = collection.insert_many(batch)
-            loaded += len(result.inserted_ids)
-            progress.update(len(batch))
-
-        progress.complete()
-        return loaded
+        return self._bulk_insert(
+            COLLECTIONS["GAME_SIMILARITIES"],
+            similarities,
+            label="similarities",
+            batch_size=batch_size,
+            drop_existing=drop_existing,
+        )
 
     def load_online_games(
         self,
@@ -213,28 +481,247 @@ class DataLoader:
         Returns:
             Number of documents loaded
         """
+        if not online_games:
+            if drop_existing:
+                self.connect()
+                self._resolve_target(COLLECTIONS["ONLINE_GAMES"], "online_games", drop_existing)
+            logger.warning("No online games to load")
+            return 0
+
+        return self._bulk_insert(
+            COLLECTIONS["ONLINE_GAMES"],
+            online_games,
+            label="online_games",
+            batch_size=batch_size,
+            drop_existing=drop_existing,
+        )
+
+    def _bulk_insert(
+        self,
+        collection_name: str,
+        documents: Iterable[dict],
+        label: str,
+        batch_size: int,
+        drop_existing: bool = False,
+    ) -> int:
+        """
+        Insert documents with several unordered insert_many batches in flight.
+
+        Batches are submitted to a thread pool so that network round trips to
+        MongoDB overlap. At most `concurrency` batches are pending at a time,
+        which also bounds how many documents are held beyond the input.
+
+        Args:
+            collection_name: Target collection
+            documents: Documents to insert (list or any iterable)
+            label: Name used in progress and throughput logs
+            batch_size: Documents per batch (overridden by the loader's batch_size)
+            drop_existing: Drop collection before loading
+
+        Returns:
+            Number of documents loaded
+        """
+        if self.incremental and collection_name in DELTA_KEYS:
+            return self._sync(collection_name, documents, label, batch_size, drop_existing)
+
+        self.connect()
+        collection = self._resolve_target(collection_name, label, drop_existing)
+        return self._run_batches(collection, documents, label, batch_size, self._insert_batch)
+
+    def _sync(
+        self,
+        collection_name: str,
+        documents: Iterable[dict],
+        label: str,
+        batch_size: int,
+        full_set: bool,
+    ) -> int:
+        """
+        Write only the inserts and updates needed to bring a collection up to date.
+
+        A full reload (full_set) starts a new DeltaSync; later calls for the
+        same collection (e.g. streamed ratings chunks) extend it.
+
+        Returns:
+            Number of incoming documents now present (inserted, updated or unchanged)
+        """
         self.connect()
-        collection = self.mongo.get_collection(COLLECTIONS["ONLINE_GAMES"])
+        sync = self.syncs.get(collection_name)
+        if sync is None or full_set:
+            key_fields, scope = DELTA_KEYS[collection_name]
+            sync = DeltaSync(self.mongo.get_collection(collection_name), key_fields, scope, full_set)
+            self.syncs[collection_name] = sync
+
+        before = sync.report.inserted + sync.report.updated + sync.report.unchanged
+        operations = sync.diff(documents, self.batch_size or batch_size)
+        self._run_batches(sync.collection, operations, f"{label} changes", batch_size, self._write_batch)
+        return sync.report.inserted + sync.report.updated + sync.report.unchanged - before
+
+    def finish_incremental(self) -> list[DeltaReport]:
+        """
+        Delete documents that disappeared from the source and log each delta.
+
+        Returns:
+            Delta report per synced collection
+        """
+        reports = []
+        for collection_name, sync in self.syncs.items():
+            sync.delete_unseen()
+
+            report = sync.report
+            logger.info(
+                f"{collection_name} delta: {report.inserted} inserted, {report.updated} updated, "
+                f"{report.unchanged} unchanged, {report.deleted} deleted, "
+                f"{report.duplicates} duplicate keys skipped"
+            )
+            reports.append(report)
+
+        self.syncs = {}
+        return reports
+
+    def _run_batches(
+        self,
+        collection: Collection,
+        items: Iterable,
+        label: str,
+        batch_size: int,
+        write_batch: Callable[[Collection, list], tuple[int, float]],
+    ) -> int:
+        """
+        Run write_batch over batches of items on the loader's thread pool.
+
+        Args:
+            collection: Target collection
+            items: Documents or write operations
+            label: Name used in progress and throughput logs
+            batch_size: Items per batch (overridden by the loader's batch_size)
+            write_batch: Writes one batch and returns (items written, latency)
+
+        Returns:
+            Number of items written
+        """
+        batch_size = self.batch_size or batch_size
+        total = len(items) if hasattr(items, "__len__") else 0
+        progress = PipelineProgress(label, total)
+        report = BulkWriteReport(collection=collection.name)
+        start = time.perf_counter()
+
+        def collect(done: set[Future]) -> None:
+            for future in done:
+                written, latency = future.result()
+                report.documents += written
+                report.batches += 1
+                report.batch_latencies.append(latency)
+                progress.update(written, f"batch latency {latency * 1000:.0f}ms")
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix=f"load-{label}",
+        ) as executor:
+            in_flight: set[Future] = set()
+            for batch in _iter_batches(items, batch_size):
+                if len(in_flight) >= self.concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight.add(executor.submit(write_batch, collection, batch))
+
+            done, _ = wait(in_flight)
+            collect(done)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        self.reports.append(report)
+
+        progress.complete()
+        logger.info(
+            f"Wrote {report.documents} {label} in {report.batches} batches: "
+            f"{report.docs_per_second:.0f} docs/s, "
+            f"batch latency mean {report.mean_batch_latency * 1000:.0f}ms / "
+            f"max {report.max_batch_latency * 1000:.0f}ms "
+            f"(concurrency {self.concurrency})"
+        )
+        return report.documents
+
+    def _resolve_target(self, collection_name: str, label: str, drop_existing: bool) -> Collection:
+        """
+        Return the collection a load should write to, dropping it if requested.
 
+        In staging mode, full reloads (drop_existing) and any later appends in
+        the same run go to an empty staging collection without secondary
+        indexes instead of the live one.
+        """
+        if self.staging and (drop_existing or collection_name in self.staged):
+            staging_name = f"{collection_name}{STAGING_SUFFIX}"
+            if drop_existing:
+                self.mongo.get_collection(staging_name).drop()
+                self.mongo.db.create_collection(staging_name)
+                if collection_name not in self.staged:
+                    self.staged.append(collection_name)
+                logger.info(f"Loading {label} into staging collection {staging_name}")
+            return self.mongo.get_collection(staging_name)
+
+        collection = self.mongo.get_collection(collection_name)
         if drop_existing:
             collection.drop()
-            logger.info("Dropped online games collection")
+            logger.info(f"Dropped {label} collection")
+        return collection
 
-        if not online_games:
-            logger.warning("No online games to load")
-            return 0
+    def promote_staging(self) -> None:
+        """
+        Build indexes on every staging collection and swap it over the live one.
 
-        progress = PipelineProgress("online_games", len(online_games))
-        loaded = 0
+        Indexes from INDEXES are built once, after all inserts, instead of
+        being maintained during the bulk load. Each rename is atomic, so
+        readers see either the old or the new collection, never an empty one.
+        If an index build fails (e.g. duplicate keys), the error is raised
+        before any collection is swapped, so the live data stays untouched.
+        """
+        if not self.staged:
+            return
 
-        for i in range(0, len(online_games), batch_size):
-            batch = online_games[i : i + batch_size]
-            result = collection.insert_many(batch)
-            loaded += len(result.inserted_ids)
-            progress.update(len(batch))
+        self.connect()
+        for collection_name in self.staged:
+            staging_name = f"{collection_name}{STAGING_SUFFIX}"
+            indexes = INDEXES.get(collection_name, [])
+            if indexes:
+                self.mongo.build_indexes(staging_name, indexes)
 
-        progress.complete()
-        return loaded
+        for collection_name in self.staged:
+            self.mongo.rename_collection(f"{collection_name}{STAGING_SUFFIX}", collection_name)
+
+        logger.info(f"Promoted staging collections: {self.staged}")
+        self.staged = []
+
+    def discard_staging(self) -> None:
+        """Drop all staging collections written in this run."""
+        if not self.staged:
+            return
+
+        self.connect()
+        for collection_name in self.staged:
+            self.mongo.get_collection(f"{collection_name}{STAGING_SUFFIX}").drop()
+
+        logger.info(f"Discarded staging collections: {self.staged}")
+        self.staged = []
+
+    @staticmethod
+    def _insert_batch(collection: Collection, batch: list[dict]) -> tuple[int, float]:
+        """
+        Insert one unordered batch and return (inserted count, latency in seconds).
+
+        Ids are derived from natural keys and every loader input is collapsed
+        to one document per key first, so a duplicate-key error means a bug
+        (or a target that was not reset) and is raised like any other write error.
+        """
+        start = time.perf_counter()
+        result = collection.insert_many(batch, ordered=False)
+        return len(result.inserted_ids), time.perf_counter() - start
+
+    @staticmethod
+    def _write_batch(collection: Collection, batch: list) -> tuple[int, float]:
+        """Apply one unordered bulk_write batch and return (operation count, latency in seconds)."""
+        start = time.perf_counter()
+        collection.bulk_write(batch, ordered=False)
+        return len(batch), time.perf_counter() - start
 
     def get_stats(self) -> dict[str, int]:
         """Get document counts for all collections."""
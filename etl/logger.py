@@ -14,6 +14,9 @@ from typing import Optional
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Log file of the current process, if file logging is enabled
+_log_file: Optional[Path] = None
+
 
 def setup_logging(
     level: str = "INFO",
@@ -31,6 +34,8 @@ def setup_logging(
     Returns:
         Root logger instance
     """
+    global _log_file
+
     # Get numeric level
     numeric_level = getattr(logging, level.upper(), logging.INFO)
 
@@ -40,6 +45,7 @@ def setup_logging(
 
     # Remove existing handlers
     root_logger.handlers.clear()
+    _log_file = None
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -60,12 +66,18 @@ def setup_logging(
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
         root_logger.addHandler(file_handler)
+        _log_file = log_file
 
         root_logger.info(f"Logging to file: {log_file}")
 
     return root_logger
 
 
+def get_log_file() -> Optional[Path]:
+    """Return the current log file, or None when logging only to the console."""
+    return _log_file
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a named logger.
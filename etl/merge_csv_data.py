@@ -6,12 +6,14 @@ Merges CSV data from different sources into a unified structure for MongoDB.
 
 import json
 import re
-from typing import Optional
+from typing import Iterable, Optional
 
+import numpy as np
 import pandas as pd
 from bson import ObjectId
 
 from etl.logger import get_logger
+from etl.transform import clean_usernames
 from etl.utils import clean_string, safe_int, safe_float
 
 logger = get_logger(__name__)
@@ -156,6 +158,138 @@ def parse_age(value: str) -> Optional[int]:
     return None
 
 
+# A JSON array of strings. Each cell matching this is exactly one JSON value,
+# so a run of them can be decoded with a single json.loads call.
+_JSON_STRING_ARRAY = r'\[\s*(?:"(?:[^"\\]|\\.)*"\s*(?:,\s*"(?:[^"\\]|\\.)*"\s*)*)?\]'
+
+# Leading number, then an optional "–N"/"-N" upper bound or a "+" suffix
+_RANGE_PATTERN = r"^(\d+)(?:[–-](\d+)|(\+))?"
+
+
+def _distinct(values: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    """Factorize a column so parsing runs once per distinct value; missing cells get code -1."""
+    codes, uniques = pd.factorize(values)
+    return codes, pd.Series(uniques, dtype=object)
+
+
+def _broadcast(parsed: pd.Series, codes: np.ndarray, index: pd.Index) -> pd.Series:
+    """Expand per-distinct Int64 results back to one value per row; code -1 becomes NA."""
+    values = np.append(parsed.to_numpy(dtype=object, na_value=None), None)[codes]
+    return pd.Series(pd.array(values, dtype="Int64"), index=index)
+
+
+def _stripped_text(values: pd.Series) -> pd.Series:
+    """Cells as stripped strings, NA wherever the scalar parsers return nothing."""
+    present = values.notna() & values.astype(bool)
+    return values.where(present).astype("string").str.strip()
+
+
+def _digits_to_int(digits: pd.Series) -> pd.Series:
+    """
+    Convert captured digit runs to Int64.
+
+    Non-ASCII digits accepted by re's \\d are converted with int(); runs too
+    long to fit in 64 bits become NA, as MongoDB could not store them anyway.
+    """
+    fits = digits.str.len() <= 18
+    numbers = pd.to_numeric(digits.where(fits), errors="coerce").astype("Int64")
+    unparsed = (fits & numbers.isna()).fillna(False)
+    if unparsed.any():
+        numbers[unparsed] = digits[unparsed].map(int)
+    return numbers
+
+
+def parse_json_array_column(values: pd.Series) -> list[list[str]]:
+    """
+    Parse a column of JSON array strings; column-wise parse_json_array.
+
+    Well-formed arrays of strings are decoded together in one json.loads
+    call. Any other cell, or every cell if the batch fails to decode, goes
+    through parse_json_array and its fallbacks.
+
+    Args:
+        values: Column of JSON array strings
+
+    Returns:
+        List of string lists, one per cell
+    """
+    codes, distinct = _distinct(values)
+    text = _stripped_text(distinct)
+    fast = text.str.fullmatch(_JSON_STRING_ARRAY).fillna(False).to_numpy(dtype=bool)
+
+    decoded: list = []
+    if fast.any():
+        try:
+            decoded = json.loads("[" + ",".join(text[fast].tolist()) + "]")
+        except json.JSONDecodeError:
+            fast[:] = False
+            decoded = []
+
+    arrays = iter(decoded)
+    parsed = [
+        [item.strip() for item in next(arrays) if item] if is_fast else parse_json_array(value)
+        for value, is_fast in zip(distinct.tolist(), fast.tolist())
+    ]
+
+    # Copy per row so no two rows share a list object
+    return [list(parsed[code]) if code >= 0 else [] for code in codes.tolist()]
+
+
+def parse_player_range_column(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Parse a column of player ranges; column-wise parse_player_range.
+
+    Args:
+        values: Column of player range strings
+
+    Returns:
+        Tuple of (min_players, max_players) Int64 Series
+    """
+    codes, distinct = _distinct(values)
+    parts = _stripped_text(distinct).str.extract(_RANGE_PATTERN)
+    low = _digits_to_int(parts[0])
+    high = _digits_to_int(parts[1])
+
+    # "N+" has no upper bound; a bare "N" is both bounds
+    high = high.where(parts[1].notna(), low.where(parts[2].isna()))
+    return _broadcast(low, codes, values.index), _broadcast(high, codes, values.index)
+
+
+def parse_playtime_range_column(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Parse a column of playtime ranges; column-wise parse_playtime_range.
+
+    Args:
+        values: Column of playtime range strings
+
+    Returns:
+        Tuple of (min_playtime, max_playtime) Int64 Series in minutes
+    """
+    codes, distinct = _distinct(values)
+    parts = _stripped_text(distinct).str.extract(_RANGE_PATTERN)
+    low = _digits_to_int(parts[0])
+    high = _digits_to_int(parts[1])
+
+    # Unlike player counts, "N+" reads as a single value here
+    high = high.where(parts[1].notna(), low)
+    return _broadcast(low, codes, values.index), _broadcast(high, codes, values.index)
+
+
+def parse_age_column(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of suggested ages; column-wise parse_age.
+
+    Args:
+        values: Column of age strings
+
+    Returns:
+        Int64 Series of minimum ages
+    """
+    codes, distinct = _distinct(values)
+    ages = _digits_to_int(_stripped_text(distinct).str.extract(r"^(\d+)")[0])
+    return _broadcast(ages, codes, values.index)
+
+
 def merge_game_data(
     games_df: pd.DataFrame, credits_df: Optional[pd.DataFrame]
 ) -> pd.DataFrame:
@@ -190,41 +324,69 @@ def merge_game_data(
     return merged
 
 
-def extract_shadow_profiles(ratings_df: Optional[pd.DataFrame]) -> dict[str, dict]:
+SHADOW_PROFILE_COLUMNS = ["username", "ratingCount", "uniqueGames"]
+
+
+def extract_shadow_profiles(ratings_df: Optional[pd.DataFrame]) -> pd.DataFrame:
     """
-    Extract unique usernames from ratings and create shadow profile mappings.
+    Extract unique usernames from ratings and aggregate shadow profile stats.
+
+    Usernames are stripped before grouping, so names that differ only by
+    whitespace share one profile. Blank usernames are dropped.
 
     Args:
         ratings_df: DataFrame with ratings data (optional)
 
     Returns:
-        Dictionary mapping username to user document data
+        DataFrame with one row per username (username, ratingCount, uniqueGames)
     """
     if ratings_df is None or ratings_df.empty:
         logger.info("No ratings data, skipping shadow profile extraction")
-        return {}
+        return pd.DataFrame(columns=SHADOW_PROFILE_COLUMNS)
 
     logger.info("Extracting shadow profiles from ratings...")
 
     # Group by username to count ratings
-    user_stats = (
-        ratings_df.groupby("username")
-        .agg({"rating": "count", "bggId": "nunique"})
+    shadow_profiles = (
+        ratings_df.groupby(clean_usernames(ratings_df["username"]), observed=True)
+        .agg(ratingCount=("rating", "count"), uniqueGames=("bggId", "nunique"))
+        .rename_axis("username")
         .reset_index()
     )
-    user_stats.columns = ["username", "ratingCount", "uniqueGames"]
+    shadow_profiles["username"] = shadow_profiles["username"].astype(object)
 
-    shadow_profiles = {}
-    for _, row in user_stats.iterrows():
-        username = str(row["username"]).strip()
-        if not username:
-            continue
+    logger.info(f"Extracted {len(shadow_profiles)} shadow profiles")
+    return shadow_profiles
 
-        shadow_profiles[username] = {
-            "username": username,
-            "ratingCount": int(row["ratingCount"]),
-            "uniqueGames": int(row["uniqueGames"]),
-        }
+
+def extract_shadow_profiles_from_chunks(
+    ratings_chunks: Iterable[pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Extract shadow profiles from ratings read in chunks.
+
+    Only per-user rating counts are kept in memory, so this can run over
+    ratings files that do not fit in memory. uniqueGames is not tracked
+    because it would require holding every (username, bggId) pair.
+
+    Args:
+        ratings_chunks: Iterable of ratings DataFrames (username, rating)
+
+    Returns:
+        DataFrame with one row per username (username, ratingCount)
+    """
+    logger.info("Extracting shadow profiles from ratings chunks...")
+
+    rating_counts = pd.Series(dtype="int64")
+    for chunk in ratings_chunks:
+        counts = chunk.groupby(clean_usernames(chunk["username"]), observed=True)["rating"].count()
+        counts.index = counts.index.astype(object)
+        rating_counts = rating_counts.add(counts, fill_value=0)
+
+    shadow_profiles = pd.DataFrame({
+        "username": rating_counts.index.astype(object),
+        "ratingCount": rating_counts.to_numpy(dtype="int64"),
+    })
 
     logger.info(f"Extracted {len(shadow_profiles)} shadow profiles")
     return shadow_profiles
@@ -242,43 +404,32 @@ def prepare_categories_mechanics(merged_df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info("Preparing categories and mechanics...")
 
-    # Parse mechanics from JSON array
-    if "mechanics" in merged_df.columns:
-        merged_df["mechanics"] = merged_df["mechanics"].apply(parse_json_array)
-    else:
-        merged_df["mechanics"] = [[]] * len(merged_df)
-
-    # Parse categories from JSON array
-    if "categories" in merged_df.columns:
-        merged_df["categories"] = merged_df["categories"].apply(parse_json_array)
-    else:
-        merged_df["categories"] = [[]] * len(merged_df)
-
-    # Parse designers from JSON array
-    if "designers" in merged_df.columns:
-        merged_df["designers"] = merged_df["designers"].apply(parse_json_array)
-    else:
-        merged_df["designers"] = [[]] * len(merged_df)
+    # Parse JSON array columns
+    for column in ("mechanics", "categories", "designers"):
+        if column in merged_df.columns:
+            merged_df[column] = parse_json_array_column(merged_df[column])
+        else:
+            merged_df[column] = [[] for _ in range(len(merged_df))]
 
     # Parse gameplay info
     if "gameplay_numberofplayers" in merged_df.columns:
-        player_ranges = merged_df["gameplay_numberofplayers"].apply(parse_player_range)
-        merged_df["minPlayers"] = [r[0] for r in player_ranges]
-        merged_df["maxPlayers"] = [r[1] for r in player_ranges]
+        merged_df["minPlayers"], merged_df["maxPlayers"] = parse_player_range_column(
+            merged_df["gameplay_numberofplayers"]
+        )
     elif "minPlayers" not in merged_df.columns:
         merged_df["minPlayers"] = None
         merged_df["maxPlayers"] = None
 
     if "gameplay_playtime" in merged_df.columns:
-        playtime_ranges = merged_df["gameplay_playtime"].apply(parse_playtime_range)
-        merged_df["minPlaytime"] = [r[0] for r in playtime_ranges]
-        merged_df["maxPlaytime"] = [r[1] for r in playtime_ranges]
+        merged_df["minPlaytime"], merged_df["maxPlaytime"] = parse_playtime_range_column(
+            merged_df["gameplay_playtime"]
+        )
     elif "minPlaytime" not in merged_df.columns:
         merged_df["minPlaytime"] = None
         merged_df["maxPlaytime"] = None
 
     if "gameplay_suggestedage" in merged_df.columns:
-        merged_df["minAge"] = merged_df["gameplay_suggestedage"].apply(parse_age)
+        merged_df["minAge"] = parse_age_column(merged_df["gameplay_suggestedage"])
     elif "minAge" not in merged_df.columns:
         merged_df["minAge"] = None
 
@@ -288,7 +439,7 @@ def prepare_categories_mechanics(merged_df: pd.DataFrame) -> pd.DataFrame:
 
 def merge_csv_data(
     csv_data: dict[str, Optional[pd.DataFrame]],
-) -> tuple[pd.DataFrame, dict[str, dict], Optional[pd.DataFrame]]:
+) -> tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
     """
     Merge all CSV data into unified structure.
 
@@ -296,7 +447,7 @@ def merge_csv_data(
         csv_data: Dictionary of file types to DataFrames
 
     Returns:
-        Tuple of (merged_games_df, shadow_profiles_dict, ratings_df)
+        Tuple of (merged_games_df, shadow_profiles_df, ratings_df)
     """
     logger.info("=" * 60)
     logger.info("Merging CSV data")
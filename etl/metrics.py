@@ -0,0 +1,166 @@
+"""
+ETL Stage Metrics
+
+Per-stage timing, throughput and memory records for pipeline runs, written
+as JSON next to the run's log file so runs can be compared.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sized, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from etl.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Sentinel for the end of an iterator inside timed_iter
+_DONE = object()
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB."""
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus any worker processes that have exited."""
+    if resource is None:
+        return time.process_time()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+@dataclass
+class StageMetrics:
+    """Metrics for one pipeline stage; repeated entries into a stage accumulate."""
+
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    skipped: int = 0
+    peak_rss_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.rows_out / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        record = asdict(self)
+        record["wall_seconds"] = round(self.wall_seconds, 4)
+        record["cpu_seconds"] = round(self.cpu_seconds, 4)
+        record["docs_per_second"] = round(self.docs_per_second, 1)
+        return record
+
+
+class MetricsRecorder:
+    """
+    Collects StageMetrics for a pipeline run.
+
+    Peak RSS is the process high-water mark at the end of each stage. With
+    trace_memory, tracemalloc also records the peak Python allocation seen
+    inside each stage (at a noticeable speed cost).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: dict[str, StageMetrics] = {}
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0) -> Iterator[StageMetrics]:
+        """
+        Time a block of work as (part of) a stage.
+
+        The caller fills in rows_out and skipped on the yielded record.
+
+        Args:
+            name: Stage name
+            rows_in: Rows entering the stage
+
+        Yields:
+            The stage's metrics record
+        """
+        record = self.stages.setdefault(name, StageMetrics(stage=name))
+        record.rows_in += rows_in
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        try:
+            yield record
+        finally:
+            record.wall_seconds += time.perf_counter() - wall_start
+            record.cpu_seconds += _cpu_seconds() - cpu_start
+            record.peak_rss_mb = _peak_rss_mb()
+            if self.trace_memory:
+                traced_peak = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                record.traced_peak_mb = max(record.traced_peak_mb or 0.0, traced_peak)
+
+    def timed_iter(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        Yield from an iterable, charging the time spent producing each item to a stage.
+
+        Sized items (e.g., document batches) are counted as rows_out.
+
+        Args:
+            name: Stage name
+            items: Lazily produced items
+
+        Yields:
+            Items of the iterable
+        """
+        iterator = iter(items)
+        while True:
+            with self.stage(name) as record:
+                item = next(iterator, _DONE)
+                if item is not _DONE and isinstance(item, Sized):
+                    record.rows_out += len(item)
+            if item is _DONE:
+                return
+            yield item
+
+    def to_dicts(self) -> list[dict]:
+        return [record.to_dict() for record in self.stages.values()]
+
+    def log_summary(self) -> None:
+        for record in self.stages.values():
+            logger.info(
+                f"Stage {record.stage}: {record.wall_seconds:.2f}s wall, {record.cpu_seconds:.2f}s CPU, "
+                f"{record.rows_in} in / {record.rows_out} out / {record.skipped} skipped, "
+                f"{record.docs_per_second:.0f} docs/s, peak RSS {record.peak_rss_mb} MiB"
+            )
+
+    def write(self, path: Path, **run_info) -> None:
+        """
+        Write the stage records as JSON.
+
+        Args:
+            path: Destination file
+            **run_info: Extra run-level fields (e.g., load mode, workers)
+        """
+        payload = {**run_info, "stages": self.to_dicts()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, default=str)
+        logger.info(f"Wrote stage metrics to {path}")
@@ -0,0 +1,135 @@
+"""
+Parallel Transform Helpers
+
+Process-pool plumbing for running transforms over shards of a DataFrame.
+Shard results travel back to the parent as one BSON buffer per shard rather
+than as pickled lists of documents.
+"""
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import bson
+import numpy as np
+import pandas as pd
+
+from etl.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Shared, read-only state installed in each worker process by the initializer
+_worker_state: dict[str, Any] = {}
+
+
+def shard_frame(df: pd.DataFrame, key: str, shards: int) -> list[pd.DataFrame]:
+    """
+    Split a DataFrame into shards by an integer key column.
+
+    Rows with the same key always land in the same shard and keep their
+    relative order. Rows with a missing or non-numeric key go to shard 0.
+
+    Args:
+        df: DataFrame to split
+        key: Integer key column (e.g., "bggId")
+        shards: Number of shards
+
+    Returns:
+        Non-empty shards
+    """
+    if shards <= 1 or df.empty:
+        return [df]
+
+    keys = pd.to_numeric(df[key], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    shard_ids = np.where(np.isnan(keys), 0, np.mod(np.nan_to_num(keys), shards)).astype(np.int64)
+
+    # A stable sort keeps the original row order within each shard
+    order = np.argsort(shard_ids, kind="stable")
+    bounds = np.searchsorted(shard_ids[order], np.arange(1, shards))
+    return [df.iloc[rows] for rows in np.split(order, bounds) if len(rows)]
+
+
+def encode_documents(documents: Iterable[dict]) -> bytes:
+    """Encode documents into one buffer of concatenated BSON documents."""
+    return b"".join(bson.encode(document) for document in documents)
+
+
+def decode_documents(buffer: bytes) -> list[dict]:
+    """Decode a buffer written by encode_documents back into documents."""
+    return bson.decode_all(buffer)
+
+
+def worker_state() -> dict[str, Any]:
+    """State shared with the worker processes of the current ShardPool."""
+    return _worker_state
+
+
+def _init_worker(state: dict[str, Any]) -> None:
+    _worker_state.clear()
+    _worker_state.update(state)
+
+
+class ShardPool:
+    """
+    Process pool that runs a task over shards and yields results as they finish.
+
+    State passed at construction (e.g., ID maps) is sent to each worker once
+    and read there through worker_state(), instead of travelling with every
+    shard. At most max_in_flight shards are submitted at a time so results
+    can be consumed while later shards are still being produced.
+
+    Workers are spawned rather than forked: the parent holds MongoDB client
+    and loader threads, which must not be duplicated mid-operation.
+    """
+
+    def __init__(self, workers: int, state: Optional[dict[str, Any]] = None, max_in_flight: Optional[int] = None):
+        """
+        Start the pool.
+
+        Args:
+            workers: Number of worker processes
+            state: Read-only state installed in each worker
+            max_in_flight: Shards submitted at once (default: 2 per worker)
+        """
+        self.workers = workers
+        self.max_in_flight = max_in_flight or 2 * workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(state or {},),
+        )
+
+    def map_unordered(self, task: Callable[[pd.DataFrame], Any], shards: Iterable[pd.DataFrame]) -> Iterator[Any]:
+        """
+        Run a task on every shard.
+
+        Args:
+            task: Module-level function taking one shard
+            shards: Shards (consumed lazily)
+
+        Yields:
+            Task results in completion order
+        """
+        pending: set[Future] = set()
+        for shard in shards:
+            if len(pending) >= self.max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(self._executor.submit(task, shard))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def close(self) -> None:
+        """Shut the pool down, cancelling shards that have not started."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ShardPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -8,52 +8,193 @@ import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 # Add project root to Python path for imports
 _project_root = Path(__file__).parent.parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
+import numpy as np
 import pandas as pd
-from bson import ObjectId
 
 from etl.config import get_config, Config
-from etl.logger import setup_logging, get_logger
+from etl.id_map import IdMap
+from etl.logger import setup_logging, get_logger, get_log_file
+from etl.metrics import MetricsRecorder
+from etl.rating_stats import RatingStats, rating_stats_updates
+from etl.similarity import read_rating_matrix, item_similarities, similarity_documents
+from etl.recommendations import precompute_recommendations
 from etl.transform import (
-    transform_game_from_csv,
-    transform_shadow_user,
-    transform_rating,
+    transform_games_from_dataframe,
+    transform_shadow_users_from_dataframe,
+    transform_ratings_from_dataframe,
+    transform_ratings_to_columns,
+    rating_keys,
+    superseded_rating_rows,
 )
+from etl.bson_columns import encode_columns, raw_documents
+from etl.lib.mongodb import COLLECTIONS, MongoDBHelper
 from etl.load import DataLoader
-from etl.read_csv import read_csv_files
-from etl.merge_csv_data import merge_csv_data
+from etl.parallel import ShardPool, shard_frame, encode_documents, decode_documents, worker_state
+from etl.read_csv import read_csv_files, iter_ratings_chunks
+from etl.merge_csv_data import merge_csv_data, extract_shadow_profiles_from_chunks
 
 logger = get_logger(__name__)
 
+# "direct" drops and refills live collections; "staging" loads into
+# staging collections, builds indexes once and swaps them in at the end;
+# "incremental" writes only the inserts, updates and deletes since the last run
+LOAD_MODES = ("direct", "staging", "incremental")
+
+# Ratings shards per worker when splitting an in-memory ratings frame, so
+# loading can start while later shards are still being transformed
+RATING_SHARDS_PER_WORKER = 4
+
+# Columns read by the streaming pre-pass that finds repeated ratings across chunks
+RATING_KEY_COLUMNS = ["username", "bggId", "rating", "rating_tstamp"]
+
+
+def _select_games(games_df: pd.DataFrame) -> tuple[list[dict], list]:
+    """
+    Transform games, keeping only those with a name and BGG ID.
+
+    A bggId repeated in the frame (e.g. overlapping games CSVs) keeps its
+    first row, since game ids are derived from the bggId.
+
+    Args:
+        games_df: Merged games DataFrame
+
+    Returns:
+        Tuple of (game documents, index labels of skipped rows)
+    """
+    games = []
+    skipped_rows = []
+    bgg_ids = set()
+
+    for idx, game in zip(games_df.index, transform_games_from_dataframe(games_df)):
+        if game["name"] and game["bggId"] and game["bggId"] not in bgg_ids:
+            bgg_ids.add(game["bggId"])
+            games.append(game)
+        else:
+            skipped_rows.append(idx)
+
+    return games, skipped_rows
+
+
+def _games_shard_task(games_df: pd.DataFrame) -> tuple[bytes, list]:
+    """Worker task: transform a games shard into a BSON buffer."""
+    games, skipped_rows = _select_games(games_df)
+    return encode_documents(games), skipped_rows
+
+
+def _ratings_shard_task(ratings_df: pd.DataFrame) -> tuple[object, dict[str, int], RatingStats]:
+    """
+    Worker task: transform a ratings shard into BSON using the pool's ID maps.
+
+    Returns a decode_documents buffer, or encode_columns (buffer, offsets)
+    when the pool state asks for columnar loads, along with the skip counts
+    and the shard's per-game rating sums.
+    """
+    state = worker_state()
+    stats = RatingStats(len(state["game_id_map"]))
+    if state.get("columnar_load"):
+        columns, skipped = transform_ratings_to_columns(
+            ratings_df,
+            game_id_map=state["game_id_map"],
+            username_id_map=state["username_id_map"],
+            origin="bgg",
+            stats=stats,
+        )
+        return encode_columns(columns), skipped, stats
+
+    ratings, skipped = transform_ratings_from_dataframe(
+        ratings_df,
+        game_id_map=state["game_id_map"],
+        username_id_map=state["username_id_map"],
+        origin="bgg",
+        stats=stats,
+    )
+    return encode_documents(ratings), skipped, stats
+
 
 class ETLPipeline:
     """Main ETL pipeline orchestrator."""
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        load_concurrency: Optional[int] = None,
+        load_batch_size: Optional[int] = None,
+        load_mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        trace_memory: Optional[bool] = None,
+        mongo: Optional[MongoDBHelper] = None,
+        columnar_load: Optional[bool] = None,
+        similarities: Optional[bool] = None,
+        recommendations: Optional[bool] = None,
+    ):
         """
         Initialize the pipeline.
 
         Args:
             config: Configuration instance. If None, loads from environment.
+            load_concurrency: Override number of in-flight insert batches from config
+            load_batch_size: Override documents per insert batch (default: per collection)
+            load_mode: Override load mode from config ("direct", "staging" or "incremental")
+            workers: Override number of transform worker processes from config
+            trace_memory: Override recording tracemalloc peaks per stage from config
+            mongo: MongoDB helper to load into. If None, the loader creates one from config.
+            columnar_load: Override encoding ratings to BSON straight from columns from config
+            similarities: Override computing gameSimilarities from the loaded ratings from config
+            recommendations: Override precomputing recommendations of all active users from config
         """
         self.config = config or get_config()
-        self.loader = DataLoader()
+        self.load_mode = load_mode or self.config.pipeline.load_mode
+        if self.load_mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode: {self.load_mode} (expected one of {LOAD_MODES})")
+
+        self.workers = max(1, workers or self.config.pipeline.workers)
+
+        self.loader = DataLoader(
+            mongo=mongo,
+            concurrency=load_concurrency or self.config.pipeline.load_concurrency,
+            batch_size=load_batch_size,
+            staging=self.load_mode == "staging",
+            incremental=self.load_mode == "incremental",
+        )
+
+        # Ratings are encoded from columns instead of dicts (not in incremental mode,
+        # which diffs documents as dicts)
+        self.columnar_load = self.config.pipeline.columnar_load if columnar_load is None else columnar_load
+        if self.columnar_load and self.loader.incremental:
+            logger.warning("Columnar loads are not supported in incremental mode; loading ratings as documents")
+            self.columnar_load = False
+
+        self.run_similarities = self.config.pipeline.run_similarities if similarities is None else similarities
+        self.run_recommendations = (
+            self.config.pipeline.run_recommendations if recommendations is None else recommendations
+        )
+
+        # Per-stage metrics of the current run
+        self.trace_memory = self.config.pipeline.trace_memory if trace_memory is None else trace_memory
+        self.metrics = MetricsRecorder(trace_memory=self.trace_memory)
 
         # ID mappings
-        self.game_id_map: dict[int, ObjectId] = {}  # bggId -> ObjectId
-        self.username_id_map: dict[str, ObjectId] = {}  # username -> ObjectId
+        self.game_id_map = IdMap()  # bggId -> ObjectId
+        self.username_id_map = IdMap()  # username -> ObjectId
+
+        # Per-game sums over the loaded ratings, indexed like game_id_map
+        self.rating_stats = RatingStats(0)
 
     def run(
         self,
         data_dir: Optional[Path] = None,
         pattern: Optional[str] = None,
         files_to_import: Optional[list[str]] = None,
+        stream: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
+        use_cache: Optional[bool] = None,
     ) -> dict:
         """
         Run the full ETL pipeline.
@@ -62,11 +203,15 @@ class ETLPipeline:
             data_dir: Override data directory from config
             pattern: Override CSV file pattern from config
             files_to_import: Override files to import from config
+            stream: Override streaming mode for the ratings stage from config
+            chunk_size: Override ratings rows per chunk in streaming mode
+            use_cache: Override use of the typed Parquet cache next to each CSV
 
         Returns:
             Statistics about the pipeline run
         """
         start_time = datetime.now()
+        self.metrics = MetricsRecorder(trace_memory=self.trace_memory)
         logger.info("=" * 60)
         logger.info("Starting ETL Pipeline")
         logger.info("=" * 60)
@@ -75,6 +220,9 @@ class ETLPipeline:
         csv_data_dir = data_dir or self.config.csv_import.data_dir
         csv_pattern = pattern or self.config.csv_import.file_pattern
         csv_files = files_to_import or self.config.csv_import.files_to_import
+        stream_ratings = self.config.csv_import.stream_ratings if stream is None else stream
+        csv_chunk_size = chunk_size or self.config.csv_import.chunk_size
+        csv_use_cache = self.config.csv_import.use_cache if use_cache is None else use_cache
 
         # Resolve relative paths
         if csv_data_dir and not csv_data_dir.is_absolute():
@@ -83,6 +231,8 @@ class ETLPipeline:
         logger.info(f"CSV data directory: {csv_data_dir}")
         logger.info(f"CSV file pattern: {csv_pattern}")
         logger.info(f"Files to import: {csv_files}")
+        if stream_ratings:
+            logger.info(f"Streaming ratings in chunks of {csv_chunk_size} rows")
 
         # Check data directory
         if not csv_data_dir.exists():
@@ -94,13 +244,36 @@ class ETLPipeline:
             logger.info("Initializing database...")
             self.loader.initialize()
 
-            # Read CSV files
+            # Read CSV files (ratings are read later, chunk by chunk, when streaming)
+            stream_ratings = stream_ratings and "ratings" in csv_files
             logger.info("Reading CSV files...")
-            csv_data = read_csv_files(csv_data_dir, csv_pattern, csv_files)
+            with self.metrics.stage("read_csv") as stage:
+                csv_data = read_csv_files(
+                    csv_data_dir,
+                    csv_pattern,
+                    [f for f in csv_files if not (stream_ratings and f == "ratings")],
+                    use_cache=csv_use_cache,
+                )
+                stage.rows_out = sum(len(df) for df in csv_data.values() if df is not None)
 
             # Merge CSV data
             logger.info("Merging CSV data...")
-            merged_games_df, shadow_profiles_dict, ratings_df = merge_csv_data(csv_data)
+            with self.metrics.stage("merge", rows_in=stage.rows_out) as stage:
+                merged_games_df, shadow_profiles_df, ratings_df = merge_csv_data(csv_data)
+                stage.rows_out = len(merged_games_df)
+
+            if stream_ratings:
+                with self.metrics.stage("extract_profiles") as stage:
+                    shadow_profiles_df = extract_shadow_profiles_from_chunks(
+                        iter_ratings_chunks(
+                            csv_data_dir,
+                            csv_pattern,
+                            chunk_size=csv_chunk_size,
+                            usecols=["username", "rating"],
+                            use_cache=csv_use_cache,
+                        )
+                    )
+                    stage.rows_out = len(shadow_profiles_df)
 
             # Transform and load games
             logger.info("Transforming and loading games...")
@@ -108,16 +281,66 @@ class ETLPipeline:
 
             # Create and load shadow profiles
             logger.info("Creating and loading shadow profiles...")
-            users_loaded = self._process_shadow_profiles(shadow_profiles_dict)
+            users_loaded = self._process_shadow_profiles(shadow_profiles_df)
 
             # Transform and load ratings
             ratings_loaded = 0
-            if ratings_df is not None and not ratings_df.empty:
+            if stream_ratings:
+                logger.info("Finding superseded ratings across chunks...")
+                superseded = self._find_superseded_ratings(
+                    iter_ratings_chunks(
+                        csv_data_dir,
+                        csv_pattern,
+                        chunk_size=csv_chunk_size,
+                        usecols=RATING_KEY_COLUMNS,
+                        use_cache=csv_use_cache,
+                    )
+                )
+                logger.info("Streaming, transforming and loading ratings...")
+                ratings_loaded = self._process_ratings_stream(
+                    iter_ratings_chunks(
+                        csv_data_dir,
+                        csv_pattern,
+                        chunk_size=csv_chunk_size,
+                        use_cache=csv_use_cache,
+                    ),
+                    superseded=superseded,
+                )
+            elif ratings_df is not None and not ratings_df.empty:
                 logger.info("Transforming and loading ratings...")
                 ratings_loaded = self._process_ratings(ratings_df)
             else:
                 logger.info("No ratings data to process")
 
+            if ratings_loaded:
+                logger.info("Writing per-game rating statistics...")
+                self._write_rating_stats(ratings_loaded)
+
+            similarities_loaded = 0
+            if ratings_loaded and self.run_similarities:
+                logger.info("Computing item-item similarities...")
+                similarities_loaded = self._process_similarities()
+
+            if self.loader.staging:
+                logger.info("Building indexes and swapping in staging collections...")
+                with self.metrics.stage("promote_staging"):
+                    self.loader.promote_staging()
+
+            if self.loader.incremental:
+                logger.info("Applying incremental deletes...")
+                with self.metrics.stage("apply_deletes"):
+                    self.loader.finish_incremental()
+
+            recommendations_written = 0
+            if ratings_loaded and self.run_recommendations:
+                logger.info("Precomputing recommendations...")
+                with self.metrics.stage("recommendations") as stage:
+                    written = precompute_recommendations(
+                        self.loader,
+                        algorithms=tuple(self.config.pipeline.recommendation_algorithms),
+                    )
+                    recommendations_written = stage.rows_out = sum(written.values())
+
             # Get final stats
             stats = self.loader.get_stats()
 
@@ -125,21 +348,53 @@ class ETLPipeline:
             logger.info("=" * 60)
             logger.info(f"ETL Pipeline completed in {elapsed.total_seconds():.1f}s")
             logger.info(f"Final stats: {stats}")
+            self.metrics.log_summary()
             logger.info("=" * 60)
 
             return {
                 "games": games_loaded,
                 "users": users_loaded,
                 "ratings": ratings_loaded,
+                "similarities": similarities_loaded,
+                "recommendations": recommendations_written,
                 "elapsed_seconds": elapsed.total_seconds(),
+                "metrics": self.metrics.to_dicts(),
             }
 
         except Exception as e:
             logger.exception(f"Pipeline failed: {e}")
-            return {"error": str(e)}
+            try:
+                self.loader.discard_staging()
+            except Exception as cleanup_error:
+                logger.warning(f"Could not discard staging collections: {cleanup_error}")
+            return {"error": str(e), "metrics": self.metrics.to_dicts()}
 
         finally:
             self.loader.disconnect()
+            self._write_metrics(start_time)
+
+    def _write_metrics(self, start_time: datetime) -> None:
+        """
+        Write this run's stage metrics as JSON next to the log file.
+
+        Nothing is written when logging only to the console.
+
+        Args:
+            start_time: Start of the run
+        """
+        log_file = get_log_file()
+        if log_file is None:
+            return
+
+        try:
+            self.metrics.write(
+                log_file.with_suffix(".metrics.json"),
+                started_at=start_time.isoformat(),
+                load_mode=self.load_mode,
+                workers=self.workers,
+            )
+        except OSError as e:
+            logger.warning(f"Could not write stage metrics: {e}")
 
     def _process_games(self, games_df: pd.DataFrame) -> int:
         """
@@ -151,61 +406,57 @@ class ETLPipeline:
         Returns:
             Number of games loaded
         """
-        games = []
-        errors = 0
+        # Only include games with valid names and BGG IDs
+        with self.metrics.stage("transform_games", rows_in=len(games_df)) as stage:
+            if self.workers > 1:
+                games, skipped_rows = [], []
+                with ShardPool(self.workers) as pool:
+                    shards = shard_frame(games_df, "bggId", self.workers)
+                    for buffer, shard_skipped in pool.map_unordered(_games_shard_task, shards):
+                        games.extend(decode_documents(buffer))
+                        skipped_rows.extend(shard_skipped)
+                skipped_rows.sort()
+            else:
+                games, skipped_rows = _select_games(games_df)
+            stage.rows_out = len(games)
+            stage.skipped = len(skipped_rows)
 
-        for idx, row in games_df.iterrows():
-            try:
-                raw = row.to_dict()
-                game = transform_game_from_csv(raw)
-
-                # Only include games with valid names and BGG IDs
-                if game["name"] and game["bggId"]:
-                    # Store BGG ID mapping for rating references
-                    self.game_id_map[game["bggId"]] = game["_id"]
-                    games.append(game)
-                else:
-                    errors += 1
-                    if errors <= 5:
-                        logger.warning(f"Skipping row {idx}: missing name or bggId")
-            except Exception as e:
-                errors += 1
-                if errors <= 5:
-                    logger.warning(f"Error processing game row {idx}: {e}")
-
-        if errors > 5:
-            logger.warning(f"Total game errors: {errors}")
+        for idx in skipped_rows[:5]:
+            logger.warning(f"Skipping row {idx}: missing name or bggId, or repeated bggId")
+        if len(skipped_rows) > 5:
+            logger.warning(f"Total game errors: {len(skipped_rows)}")
 
         logger.info(f"Transformed {len(games)} games")
-        return self.loader.load_games(games, drop_existing=True)
+        with self.metrics.stage("load_games", rows_in=len(games)) as stage:
+            loaded = stage.rows_out = self.loader.load_games(games, drop_existing=True)
+
+        # Store BGG ID mapping for rating references (after loading, because
+        # incremental loads reuse the _id of games that already exist)
+        self.game_id_map = IdMap.from_documents(games, "bggId")
+        return loaded
 
-    def _process_shadow_profiles(self, shadow_profiles_dict: dict[str, dict]) -> int:
+    def _process_shadow_profiles(self, shadow_profiles_df: pd.DataFrame) -> int:
         """
         Create and load shadow profile users.
 
         Args:
-            shadow_profiles_dict: Dictionary mapping username to profile data
+            shadow_profiles_df: Shadow profiles DataFrame (username, ratingCount, ...)
 
         Returns:
             Number of users loaded
         """
-        users = []
-
-        for username, profile_data in shadow_profiles_dict.items():
-            try:
-                user = transform_shadow_user(
-                    username=username,
-                    rating_count=profile_data.get("ratingCount", 0),
-                    origin="bgg",
-                )
-                # Store username mapping for rating references
-                self.username_id_map[username] = user["_id"]
-                users.append(user)
-            except Exception as e:
-                logger.warning(f"Error creating shadow profile for {username}: {e}")
+        with self.metrics.stage("transform_users", rows_in=len(shadow_profiles_df)) as stage:
+            users = transform_shadow_users_from_dataframe(shadow_profiles_df, origin="bgg")
+            stage.rows_out = len(users)
 
         logger.info(f"Created {len(users)} shadow profiles")
-        return self.loader.load_users(users, drop_existing=True)
+        with self.metrics.stage("load_users", rows_in=len(users)) as stage:
+            loaded = stage.rows_out = self.loader.load_users(users, drop_existing=True)
+
+        # Store username mapping for rating references (after loading, because
+        # incremental loads reuse the _id of users that already exist)
+        self.username_id_map = IdMap.from_documents(users, "username")
+        return loaded
 
     def _process_ratings(self, ratings_df: pd.DataFrame) -> int:
         """
@@ -217,57 +468,257 @@ class ETLPipeline:
         Returns:
             Number of ratings loaded
         """
-        ratings = []
-        skipped = 0
+        if self.workers > 1:
+            # Shards by bggId are transformed in parallel and loaded as they finish
+            shards = shard_frame(ratings_df, "bggId", self.workers * RATING_SHARDS_PER_WORKER)
+            return self._process_ratings_stream(shards)
+
+        self.rating_stats = RatingStats(len(self.game_id_map))
+
+        with self.metrics.stage("transform_ratings", rows_in=len(ratings_df)) as stage:
+            transform = transform_ratings_to_columns if self.columnar_load else transform_ratings_from_dataframe
+            ratings, skipped = transform(
+                ratings_df,
+                game_id_map=self.game_id_map,
+                username_id_map=self.username_id_map,
+                origin="bgg",
+                stats=self.rating_stats,
+            )
+            # Columnar ratings are encoded lazily, during the load stage
+            count = len(ratings["_id"]) if self.columnar_load else len(ratings)
+            stage.rows_out = count
+            stage.skipped = sum(skipped.values())
+
+        total_skipped = sum(skipped.values())
+        if total_skipped:
+            logger.warning(
+                f"Total skipped ratings: {total_skipped} "
+                f"(missing fields: {skipped['missing_fields']}, "
+                f"superseded duplicates: {skipped['duplicate']}, "
+                f"unknown game: {skipped['unknown_game']}, "
+                f"unknown user: {skipped['unknown_user']})"
+            )
+
+        logger.info(f"Transformed {count} ratings")
+        with self.metrics.stage("load_ratings", rows_in=count) as stage:
+            if self.columnar_load:
+                stage.rows_out = self.loader.load_rating_columns(ratings, drop_existing=True)
+            else:
+                stage.rows_out = self.loader.load_ratings(ratings, drop_existing=True)
+        return stage.rows_out
 
-        for idx, row in ratings_df.iterrows():
-            try:
-                bgg_id = row.get("bggId")
-                username = str(row.get("username", "")).strip()
-                rating_value = row.get("rating")
-
-                # Skip if missing required fields
-                if pd.isna(bgg_id) or not username or pd.isna(rating_value):
-                    skipped += 1
-                    continue
-
-                bgg_id_int = int(bgg_id)
-
-                # Find game and user IDs
-                game_id = self.game_id_map.get(bgg_id_int)
-                user_id = self.username_id_map.get(username)
-
-                if not game_id:
-                    skipped += 1
-                    if skipped <= 10:
-                        logger.debug(
-                            f"Skipping rating: game bggId {bgg_id_int} not found"
-                        )
-                    continue
-
-                if not user_id:
-                    skipped += 1
-                    if skipped <= 10:
-                        logger.debug(f"Skipping rating: username {username} not found")
-                    continue
-
-                rating = transform_rating(
-                    row.to_dict(),
-                    user_id=user_id,
-                    game_id=game_id,
+    def _write_rating_stats(self, ratings_loaded: int) -> None:
+        """
+        Write count, mean, stddev, histogram and Bayesian average of the loaded ratings onto every game.
+
+        Args:
+            ratings_loaded: Ratings written by the load, which the stats should cover exactly
+        """
+        counted = int(self.rating_stats.count.sum())
+        if counted != ratings_loaded:
+            logger.warning(f"Rating statistics cover {counted} ratings but {ratings_loaded} were loaded")
+        with self.metrics.stage("rating_stats", rows_in=counted) as stage:
+            updates = rating_stats_updates(
+                self.rating_stats,
+                self.game_id_map,
+                prior_weight=self.config.pipeline.stats_prior_weight,
+            )
+            stage.rows_out = self.loader.update_games(updates)
+
+        rated = int((self.rating_stats.count > 0).sum())
+        logger.info(f"Wrote rating statistics for {rated} of {len(self.game_id_map)} games")
+
+    def _process_similarities(self) -> int:
+        """
+        Compute top-k item-item similarities from the loaded ratings and load them.
+
+        Ratings are read back from the collection this run wrote (the staging
+        collection in staging mode), so every load mode sees the same data.
+
+        Returns:
+            Number of similarity documents loaded
+        """
+        with self.metrics.stage("similarities") as stage:
+            matrix, _, game_ids = read_rating_matrix(self.loader.collection(COLLECTIONS["RATINGS"]))
+            stage.rows_in = matrix.nnz
+            neighbours, scores = item_similarities(
+                matrix,
+                top_k=self.config.pipeline.similarity_top_k,
+                method=self.config.pipeline.similarity_method,
+            )
+            documents = similarity_documents(game_ids, neighbours, scores)
+            stage.rows_out = len(documents)
+
+        with self.metrics.stage("load_similarities", rows_in=len(documents)) as stage:
+            stage.rows_out = self.loader.load_similarities(documents, drop_existing=True)
+        return stage.rows_out
+
+    def _iter_rating_batches(
+        self,
+        ratings_chunks: Iterable[pd.DataFrame],
+        skipped: dict[str, int],
+    ) -> Iterator[list[dict]]:
+        """
+        Lazily transform ratings chunks into batches of rating documents.
+
+        With more than one worker, chunks are transformed in a process pool
+        and batches are yielded in completion order.
+
+        Args:
+            ratings_chunks: Iterable of ratings DataFrames
+            skipped: Per-reason skip counters, updated in place
+
+        Yields:
+            List of rating documents (RawBSONDocuments with columnar loads) for each chunk
+        """
+        if self.workers > 1:
+            state = {
+                "game_id_map": self.game_id_map,
+                "username_id_map": self.username_id_map,
+                "columnar_load": self.columnar_load,
+            }
+            with ShardPool(self.workers, state=state) as pool:
+                for encoded, chunk_skipped, chunk_stats in pool.map_unordered(_ratings_shard_task, ratings_chunks):
+                    for reason, count in chunk_skipped.items():
+                        skipped[reason] = skipped.get(reason, 0) + count
+                    self.rating_stats.merge(chunk_stats)
+                    # Columnar BSON is inserted as-is; nothing is decoded in the parent
+                    yield raw_documents(*encoded) if self.columnar_load else decode_documents(encoded)
+            return
+
+        for chunk in ratings_chunks:
+            if self.columnar_load:
+                columns, chunk_skipped = transform_ratings_to_columns(
+                    chunk,
+                    game_id_map=self.game_id_map,
+                    username_id_map=self.username_id_map,
+                    origin="bgg",
+                    stats=self.rating_stats,
+                )
+                ratings = raw_documents(*encode_columns(columns))
+            else:
+                ratings, chunk_skipped = transform_ratings_from_dataframe(
+                    chunk,
+                    game_id_map=self.game_id_map,
+                    username_id_map=self.username_id_map,
                     origin="bgg",
+                    stats=self.rating_stats,
                 )
-                ratings.append(rating)
-            except Exception as e:
-                skipped += 1
-                if skipped <= 10:
-                    logger.warning(f"Error processing rating row {idx}: {e}")
+            for reason, count in chunk_skipped.items():
+                skipped[reason] = skipped.get(reason, 0) + count
+            yield ratings
 
-        if skipped > 10:
-            logger.warning(f"Total skipped ratings: {skipped}")
+    def _find_superseded_ratings(self, ratings_chunks: Iterable[pd.DataFrame]) -> np.ndarray:
+        """
+        Find ratings superseded by a newer rating of the same game by the same user in any chunk.
+
+        Chunks are only collapsed within themselves while transforming, so
+        streaming first reads the key columns of every chunk. This keeps two
+        int64 values per rating until the superseded rows are picked.
+
+        Args:
+            ratings_chunks: Iterable of ratings DataFrames with RATING_KEY_COLUMNS, in loading order
+
+        Returns:
+            Sorted row numbers (counted across all chunks) of the superseded ratings
+        """
+        with self.metrics.stage("dedup_ratings") as stage:
+            keys, stamps = [], []
+            for chunk in ratings_chunks:
+                chunk_keys, chunk_stamps = rating_keys(chunk, self.game_id_map, self.username_id_map)
+                keys.append(chunk_keys)
+                stamps.append(chunk_stamps)
+                stage.rows_in += len(chunk)
+            if not keys:
+                return np.empty(0, dtype=np.int64)
+            superseded = superseded_rating_rows(np.concatenate(keys), np.concatenate(stamps))
+            stage.rows_out = stage.rows_in - len(superseded)
+        logger.info(f"Found {len(superseded)} superseded ratings in {stage.rows_in} rows")
+        return superseded
+
+    @staticmethod
+    def _drop_rows(
+        ratings_chunks: Iterable[pd.DataFrame],
+        rows: np.ndarray,
+        skipped: dict[str, int],
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Drop rows (numbered across all chunks) from a stream of chunks, counting them as duplicates.
+
+        Args:
+            ratings_chunks: Iterable of ratings DataFrames, in the order rows were numbered
+            rows: Sorted row numbers to drop
+            skipped: Per-reason skip counters, updated in place
+
+        Yields:
+            Chunks without the dropped rows
+        """
+        offset = 0
+        for chunk in ratings_chunks:
+            start, stop = np.searchsorted(rows, [offset, offset + len(chunk)])
+            if stop > start:
+                keep = np.ones(len(chunk), dtype=bool)
+                keep[rows[start:stop] - offset] = False
+                skipped["duplicate"] = skipped.get("duplicate", 0) + int(stop - start)
+            offset += len(chunk)
+            yield chunk[keep] if stop > start else chunk
+
+    def _process_ratings_stream(
+        self,
+        ratings_chunks: Iterable[pd.DataFrame],
+        superseded: Optional[np.ndarray] = None,
+    ) -> int:
+        """
+        Transform and load ratings chunk by chunk.
+
+        Each chunk is handed to the loader as soon as it is transformed, so
+        peak memory is bounded by the chunk size instead of the dataset size.
+        The ratings target is reset once up front, so a stream without any
+        chunks still replaces the previous ratings.
 
-        logger.info(f"Transformed {len(ratings)} ratings")
-        return self.loader.load_ratings(ratings, drop_existing=True)
+        Args:
+            ratings_chunks: Iterable of ratings DataFrames
+            superseded: Sorted row numbers (across all chunks) of repeated ratings to drop,
+                as _find_superseded_ratings returns them
+
+        Returns:
+            Number of ratings loaded
+        """
+        skipped: dict[str, int] = {}
+        loaded = 0
+        self.rating_stats = RatingStats(len(self.game_id_map))
+        if superseded is not None and len(superseded):
+            # Dropped before transforming, so rating stats only see the surviving ratings
+            ratings_chunks = self._drop_rows(ratings_chunks, superseded, skipped)
+
+        with self.metrics.stage("load_ratings"):
+            self.loader.load_ratings([], drop_existing=True)
+
+        # Producing a batch is charged to transform_ratings, writing it to load_ratings
+        batches = self.metrics.timed_iter("transform_ratings", self._iter_rating_batches(ratings_chunks, skipped))
+        for chunk_number, ratings in enumerate(batches):
+            with self.metrics.stage("load_ratings", rows_in=len(ratings)) as stage:
+                chunk_loaded = self.loader.load_ratings(ratings)
+                stage.rows_out += chunk_loaded
+            loaded += chunk_loaded
+            logger.info(f"Loaded ratings chunk {chunk_number + 1}: {loaded} ratings so far")
+
+        total_skipped = sum(skipped.values())
+        transform_stage = self.metrics.stages.get("transform_ratings")
+        if transform_stage is not None:
+            transform_stage.skipped = total_skipped
+            transform_stage.rows_in = transform_stage.rows_out + total_skipped
+        if total_skipped:
+            logger.warning(
+                f"Total skipped ratings: {total_skipped} "
+                f"(missing fields: {skipped['missing_fields']}, "
+                f"superseded duplicates: {skipped['duplicate']}, "
+                f"unknown game: {skipped['unknown_game']}, "
+                f"unknown user: {skipped['unknown_user']})"
+            )
+
+        logger.info(f"Transformed and loaded {loaded} ratings")
+        return loaded
 
 
 def main():
@@ -286,6 +737,21 @@ Examples:
     # Override pattern and files
     python pipeline.py --pattern "_1_100" --files games ratings credits
 
+    # Stream ratings in bounded-memory chunks
+    python pipeline.py --stream --chunk-size 200000
+
+    # Transform games and ratings in 4 worker processes
+    python pipeline.py --workers 4
+
+    # Encode ratings to BSON straight from columns
+    python pipeline.py --columnar-load
+
+    # Also compute item-item similarities into gameSimilarities
+    python pipeline.py --similarities
+
+    # Also precompute recommendations of all active users
+    python pipeline.py --similarities --recommendations
+
     # Verbose logging
     python pipeline.py --log-level DEBUG
         """,
@@ -306,6 +772,73 @@ Examples:
         choices=["games", "ratings", "credits"],
         help="Files to import (default: from config)",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=None,
+        help="Stream ratings in chunks to bound memory use (default: from config)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Ratings rows per chunk in streaming mode (default: from config)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        default=None,
+        help="Do not read or write the typed Parquet cache next to each CSV",
+    )
+    parser.add_argument(
+        "--load-concurrency",
+        type=int,
+        help="Insert batches kept in flight per collection (default: from config)",
+    )
+    parser.add_argument(
+        "--load-batch-size",
+        type=int,
+        help="Documents per insert batch (default: per collection)",
+    )
+    parser.add_argument(
+        "--load-mode",
+        choices=LOAD_MODES,
+        help="direct: refill live collections; staging: load into staging collections, "
+        "build indexes once and swap them in; incremental: write only changed documents "
+        "(default: from config)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for the games and ratings transforms (default: from config)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        default=None,
+        help="Record tracemalloc peaks in the per-stage metrics (slower; default: from config)",
+    )
+    parser.add_argument(
+        "--similarities",
+        action="store_true",
+        default=None,
+        help="Compute top-k item-item similarities into gameSimilarities after loading ratings "
+        "(default: from config)",
+    )
+    parser.add_argument(
+        "--recommendations",
+        action="store_true",
+        default=None,
+        help="Precompute recommendations of all active users after loading "
+        "(default: from config)",
+    )
+    parser.add_argument(
+        "--columnar-load",
+        action="store_true",
+        default=None,
+        help="Encode ratings to BSON straight from columns instead of dicts "
+        "(not in incremental mode; default: from config)",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -328,11 +861,23 @@ Examples:
     )
 
     # Run pipeline
-    pipeline = ETLPipeline()
+    pipeline = ETLPipeline(
+        load_concurrency=args.load_concurrency,
+        load_batch_size=args.load_batch_size,
+        load_mode=args.load_mode,
+        workers=args.workers,
+        trace_memory=args.trace_memory,
+        columnar_load=args.columnar_load,
+        similarities=args.similarities,
+        recommendations=args.recommendations,
+    )
     result = pipeline.run(
         data_dir=args.data_dir,
         pattern=args.pattern,
         files_to_import=args.files,
+        stream=args.stream,
+        chunk_size=args.chunk_size,
+        use_cache=args.use_cache,
     )
 
     if "error" in result:
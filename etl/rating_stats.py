@@ -0,0 +1,281 @@
+"""
+Per-Game Rating Statistics
+
+Aggregates ratings per game (count, mean, standard deviation, histogram and
+Bayesian average) with vectorized bincounts, and writes them onto game
+documents as `ratingStats`, so sorting and "top rated" pages read an indexed
+field instead of aggregating the ratings collection at request time.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from etl.id_map import IdMap
+from etl.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Field on game documents holding the statistics
+RATING_STATS_FIELD = "ratingStats"
+
+# One histogram bin per rating point, by rounding to the nearest point:
+# bin k holds ratings in [k + 0.5, k + 1.5), i.e. [0.5, 1.5) -> 1, ..., [9.5, 10] -> 10.
+# Ratings below 0.5 (BGG allows 0-1) are clamped into the first bin.
+HISTOGRAM_BINS = 10
+
+# Weight of the prior (the mean of all ratings) in the Bayesian average,
+# in ratings: a game needs about this many ratings to pull halfway away from it
+DEFAULT_PRIOR_WEIGHT = 100.0
+
+
+def rating_bins(ratings: np.ndarray) -> np.ndarray:
+    """Histogram bin of each rating on the 1-10 scale (rounded half up, see HISTOGRAM_BINS)."""
+    return np.clip(np.floor(ratings + 0.5).astype(np.int64) - 1, 0, HISTOGRAM_BINS - 1)
+
+
+class RatingStats:
+    """
+    Running per-game rating sums, indexed by position in the game IdMap.
+
+    Batches of ratings are added with add(); partial results (e.g., from
+    worker processes) are combined with merge(). Only games that have
+    ratings are pickled, so partials for a shard stay small.
+    """
+
+    def __init__(self, size: int):
+        """
+        Start empty sums.
+
+        Args:
+            size: Number of games (length of the game IdMap)
+        """
+        self.count = np.zeros(size, dtype=np.int64)
+        self.total = np.zeros(size, dtype=np.float64)
+        self.total_squares = np.zeros(size, dtype=np.float64)
+        self.histogram = np.zeros((size, HISTOGRAM_BINS), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    def add(self, positions: np.ndarray, ratings: np.ndarray) -> None:
+        """
+        Add a batch of ratings.
+
+        Args:
+            positions: Game position of each rating (all >= 0)
+            ratings: Rating values
+        """
+        size = len(self.count)
+        ratings = np.asarray(ratings, dtype=np.float64)
+        self.count += np.bincount(positions, minlength=size)
+        self.total += np.bincount(positions, weights=ratings, minlength=size)
+        self.total_squares += np.bincount(positions, weights=ratings * ratings, minlength=size)
+        cells = positions * HISTOGRAM_BINS + rating_bins(ratings)
+        self.histogram += np.bincount(cells, minlength=size * HISTOGRAM_BINS).reshape(size, HISTOGRAM_BINS)
+
+    def merge(self, other: "RatingStats") -> None:
+        """Add the sums of another RatingStats over the same games."""
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.histogram += other.histogram
+
+    def __getstate__(self) -> dict:
+        rated = np.flatnonzero(self.count)
+        return {
+            "size": len(self.count),
+            "rated": rated,
+            "count": self.count[rated],
+            "total": self.total[rated],
+            "total_squares": self.total_squares[rated],
+            "histogram": self.histogram[rated],
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["size"])
+        rated = state["rated"]
+        self.count[rated] = state["count"]
+        self.total[rated] = state["total"]
+        self.total_squares[rated] = state["total_squares"]
+        self.histogram[rated] = state["histogram"]
+
+    def prior_mean(self) -> float:
+        """Mean of all ratings added so far (0.0 if none)."""
+        ratings = int(self.count.sum())
+        return float(self.total.sum() / ratings) if ratings else 0.0
+
+    def summary(self, prior_weight: float = DEFAULT_PRIOR_WEIGHT, prior_mean: Optional[float] = None) -> dict:
+        """
+        Per-game statistics as arrays.
+
+        Games without ratings get a mean, standard deviation and Bayesian
+        average of NaN.
+
+        Args:
+            prior_weight: Weight of the prior in the Bayesian average, in ratings
+            prior_mean: Prior rating (default: mean of all ratings added)
+
+        Returns:
+            Dict of count, average, stddev, bayesAverage and histogram arrays
+        """
+        if prior_mean is None:
+            prior_mean = self.prior_mean()
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average = self.total / self.count
+            variance = np.maximum(self.total_squares / self.count - average * average, 0.0)
+            bayes_average = (prior_weight * prior_mean + self.total) / (prior_weight + self.count)
+
+        rated = self.count > 0
+        return {
+            "count": self.count,
+            "average": np.where(rated, average, np.nan),
+            "stddev": np.where(rated, np.sqrt(variance), np.nan),
+            "bayesAverage": np.where(rated, bayes_average, np.nan),
+            "histogram": self.histogram,
+        }
+
+    def updates(
+        self,
+        game_ids: np.ndarray,
+        prior_weight: float = DEFAULT_PRIOR_WEIGHT,
+        prior_mean: Optional[float] = None,
+        only_rated: bool = False,
+    ) -> list[UpdateOne]:
+        """
+        Build $set operations writing ratingStats onto game documents.
+
+        Args:
+            game_ids: ObjectId of each game position
+            prior_weight: Weight of the prior in the Bayesian average, in ratings
+            prior_mean: Prior rating (default: mean of all ratings added)
+            only_rated: Skip games without ratings instead of setting their stats to null
+
+        Returns:
+            One UpdateOne per game
+        """
+        summary = self.summary(prior_weight, prior_mean)
+        now = datetime.utcnow()
+
+        operations = []
+        for game_id, count, average, stddev, bayes_average, histogram in zip(
+            game_ids.tolist(),
+            summary["count"].tolist(),
+            np.round(summary["average"], 4).tolist(),
+            np.round(summary["stddev"], 4).tolist(),
+            np.round(summary["bayesAverage"], 4).tolist(),
+            summary["histogram"].tolist(),
+        ):
+            if count == 0:
+                if not only_rated:
+                    operations.append(UpdateOne({"_id": game_id}, {"$set": {RATING_STATS_FIELD: None}}))
+                continue
+
+            stats = {
+                "count": count,
+                "average": average,
+                "stddev": stddev,
+                "bayesAverage": bayes_average,
+                "histogram": histogram,
+                "updatedAt": now,
+            }
+            operations.append(UpdateOne({"_id": game_id}, {"$set": {RATING_STATS_FIELD: stats}}))
+
+        return operations
+
+
+def rating_stats_updates(
+    stats: RatingStats,
+    game_id_map: IdMap,
+    prior_weight: float = DEFAULT_PRIOR_WEIGHT,
+) -> list[UpdateOne]:
+    """
+    Build ratingStats updates for every game in the map after a full load.
+
+    Args:
+        stats: Sums over all loaded ratings, indexed like game_id_map
+        game_id_map: Map whose positions the stats use
+        prior_weight: Weight of the prior in the Bayesian average, in ratings
+
+    Returns:
+        One UpdateOne per game (games without ratings get null stats)
+    """
+    if len(stats) != len(game_id_map):
+        raise ValueError(f"Stats cover {len(stats)} games but the map has {len(game_id_map)}")
+
+    game_ids = game_id_map.objects(np.arange(len(game_id_map)))
+    return stats.updates(game_ids, prior_weight)
+
+
+def update_rating_stats(
+    games: Collection,
+    ratings: Iterable[dict],
+    prior_weight: float = DEFAULT_PRIOR_WEIGHT,
+) -> int:
+    """
+    Fold new ratings into the stored ratingStats of their games.
+
+    For ratings added since the last full ETL run (e.g., by the app). The
+    stored count, mean and standard deviation are turned back into sums,
+    the new ratings are added, and only the affected games are rewritten.
+    The prior mean is re-read from the catalog, so other games keep theirs
+    until the next full run. Changed or deleted ratings need a full run.
+
+    Args:
+        games: Games collection
+        ratings: New rating documents (gameId, rating)
+        prior_weight: Weight of the prior in the Bayesian average, in ratings
+
+    Returns:
+        Number of games updated
+    """
+    frame = pd.DataFrame(
+        [(rating["gameId"], rating["rating"]) for rating in ratings],
+        columns=["gameId", "rating"],
+    )
+    frame = frame[frame["rating"].notna()]
+    if frame.empty:
+        return 0
+
+    positions, game_ids = pd.factorize(frame["gameId"])
+    stats = RatingStats(len(game_ids))
+    stats.add(positions, frame["rating"].to_numpy(dtype=np.float64))
+    new_count, new_total = int(stats.count.sum()), float(stats.total.sum())
+
+    existing = {
+        doc["_id"]: doc.get(RATING_STATS_FIELD)
+        for doc in games.find({"_id": {"$in": list(game_ids)}}, {RATING_STATS_FIELD: 1})
+    }
+    for position, game_id in enumerate(game_ids):
+        stored = existing.get(game_id)
+        if not stored or not stored.get("count"):
+            continue
+        count, average, stddev = stored["count"], stored["average"], stored["stddev"]
+        stats.count[position] += count
+        stats.total[position] += average * count
+        stats.total_squares[position] += (stddev * stddev + average * average) * count
+        stats.histogram[position] += np.asarray(stored["histogram"], dtype=np.int64)
+
+    # Prior: mean over every stored rating plus the new ones
+    catalog = list(games.aggregate([
+        {"$match": {f"{RATING_STATS_FIELD}.count": {"$gt": 0}}},
+        {"$group": {
+            "_id": None,
+            "count": {"$sum": f"${RATING_STATS_FIELD}.count"},
+            "total": {"$sum": {"$multiply": [f"${RATING_STATS_FIELD}.count", f"${RATING_STATS_FIELD}.average"]}},
+        }},
+    ]))
+    catalog_count = catalog[0]["count"] if catalog else 0
+    catalog_total = catalog[0]["total"] if catalog else 0.0
+    prior_mean = (catalog_total + new_total) / (catalog_count + new_count)
+
+    operations = stats.updates(np.asarray(game_ids, dtype=object), prior_weight, prior_mean, only_rated=True)
+    if operations:
+        games.bulk_write(operations, ordered=False)
+    logger.info(f"Updated rating stats of {len(operations)} games with {new_count} new ratings")
+    return len(operations)
@@ -5,16 +5,79 @@ Finds and reads CSV files matching a pattern for ETL processing.
 """
 
 import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 from etl.logger import get_logger
 from etl.utils import clean_string, safe_int, safe_float
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - cache is skipped without pyarrow
+    pa = None
+    pq = None
+
 logger = get_logger(__name__)
 
+# Typed Parquet cache written next to each CSV (e.g. game_ratings_1_100.csv.cache.parquet)
+CSV_CACHE_SUFFIX = ".cache.parquet"
+
+# Bump when reader logic or dtypes change so stale caches are rebuilt
+CSV_CACHE_VERSION = 3
+
+# Columns read per file type and their dtypes (None: inferred, used for text).
+# Columns not listed are never parsed; listed columns missing from a file are skipped.
+CSV_SCHEMAS: dict[str, dict[str, Optional[str]]] = {
+    "games": {
+        "bggId": "Int64",
+        "rank": "Int64",
+        "name": None,
+        "description": None,
+        "detailUrl": None,
+        "thumbnailUrl": None,
+        "imageUrl": None,
+        "yearPublished": "Int64",
+        "geekRating": "float64",
+        "avgRating": "float64",
+        "numVoters": "Int64",
+        "minPlayers": None,
+        "maxPlayers": None,
+        "minPlaytime": None,
+        "maxPlaytime": None,
+        "minAge": None,
+    },
+    "ratings": {
+        "bggId": "Int64",
+        "rating": "float32",
+        "rating_tstamp": None,
+        "username": "category",
+        "isocountry": "category",
+        "origin": "category",
+        "user_origin": "category",
+    },
+    "credits": {
+        "bggId": "Int64",
+        "mechanics": None,
+        "categories": None,
+        "designers": None,
+        "imageUrl": None,
+        "gameplay_numberofplayers": None,
+        "gameplay_playtime": None,
+        "gameplay_suggestedage": None,
+    },
+}
+
+# Multithreaded pyarrow parser where available (it does not support chunked reads)
+CSV_ENGINE = "pyarrow" if pa is not None else "c"
+
+# Parquet schema metadata key holding the source CSV fingerprint
+_CACHE_METADATA_KEY = b"etl_csv_source"
+
 
 def find_csv_files(data_dir: Path, pattern: str, file_type: str) -> list[Path]:
     """
@@ -59,6 +122,48 @@ def find_csv_files(data_dir: Path, pattern: str, file_type: str) -> list[Path]:
     return files
 
 
+def _schema_columns(file_path: Path, file_type: str) -> list[str]:
+    """Columns of the file type's schema that are present in the CSV header."""
+    header = pd.read_csv(file_path, encoding="utf-8", nrows=0).columns
+    return [column for column in CSV_SCHEMAS[file_type] if column in header]
+
+
+def _apply_schema(df: pd.DataFrame, file_type: str) -> pd.DataFrame:
+    """Coerce already-parsed columns to the file type's schema dtypes."""
+    for column, dtype in CSV_SCHEMAS[file_type].items():
+        if dtype is None or column not in df.columns or df[column].dtype == dtype:
+            continue
+        if dtype == "category":
+            df[column] = df[column].astype("category")
+        else:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+    return df
+
+
+def _read_with_schema(file_path: Path, file_type: str) -> pd.DataFrame:
+    """
+    Read a CSV with column projection and the declared dtypes.
+
+    Falls back to an inferred read plus coercion when a value does not
+    parse as its declared type, so one bad cell does not fail the file.
+    """
+    columns = _schema_columns(file_path, file_type)
+    dtypes = {c: t for c, t in CSV_SCHEMAS[file_type].items() if t is not None and c in columns}
+
+    try:
+        return pd.read_csv(
+            file_path,
+            encoding="utf-8",
+            usecols=columns,
+            dtype=dtypes,
+            engine=CSV_ENGINE,
+        )
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Typed read of {file_path.name} failed ({e}), coercing instead")
+        df = pd.read_csv(file_path, encoding="utf-8", usecols=columns)
+        return _apply_schema(df, file_type)
+
+
 def read_games_csv(file_path: Path) -> pd.DataFrame:
     """
     Read and parse games CSV file.
@@ -70,11 +175,7 @@ def read_games_csv(file_path: Path) -> pd.DataFrame:
         DataFrame with games data
     """
     logger.info(f"Reading games CSV: {file_path.name}")
-    df = pd.read_csv(file_path, encoding="utf-8")
-
-    # Ensure bggId is integer
-    if "bggId" in df.columns:
-        df["bggId"] = df["bggId"].astype("Int64")
+    df = _read_with_schema(file_path, "games")
 
     logger.info(f"Loaded {len(df)} games from {file_path.name}")
     return df
@@ -91,20 +192,62 @@ def read_ratings_csv(file_path: Path) -> pd.DataFrame:
         DataFrame with ratings data
     """
     logger.info(f"Reading ratings CSV: {file_path.name}")
-    df = pd.read_csv(file_path, encoding="utf-8")
-
-    # Ensure bggId is integer
-    if "bggId" in df.columns:
-        df["bggId"] = df["bggId"].astype("Int64")
-
-    # Ensure rating is float
-    if "rating" in df.columns:
-        df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
+    df = _read_with_schema(file_path, "ratings")
 
     logger.info(f"Loaded {len(df)} ratings from {file_path.name}")
     return df
 
 
+def iter_ratings_chunks(
+    data_dir: Path,
+    pattern: str,
+    chunk_size: int = 100_000,
+    usecols: Optional[list[str]] = None,
+    use_cache: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read all ratings CSV files matching the pattern in bounded-size chunks.
+
+    Unlike read_csv_files, the files are never concatenated, so memory use is
+    bounded by chunk_size rather than by the size of the dataset. A valid
+    typed cache is streamed in record batches instead of parsing the CSV;
+    streaming never writes the cache, since that needs the whole file.
+
+    Args:
+        data_dir: Directory containing CSV files
+        pattern: Pattern suffix (e.g., "_1_100")
+        chunk_size: Maximum number of rows per yielded chunk
+        usecols: Optional subset of columns to read
+        use_cache: Stream from the typed Parquet cache when it is valid
+
+    Yields:
+        DataFrames with at most chunk_size ratings each
+    """
+    for file_path in find_csv_files(data_dir, pattern, "ratings"):
+        if use_cache and _cache_is_valid(file_path, "ratings"):
+            logger.info(f"Streaming ratings cache: {file_path.name} ({chunk_size} rows per chunk)")
+            parquet_file = pq.ParquetFile(_cache_path(file_path))
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=usecols):
+                yield batch.to_pandas()
+            continue
+
+        logger.info(f"Streaming ratings CSV: {file_path.name} ({chunk_size} rows per chunk)")
+        columns = _schema_columns(file_path, "ratings")
+        if usecols is not None:
+            columns = [column for column in columns if column in usecols]
+
+        # Numeric columns are coerced per chunk so one bad cell cannot fail the stream
+        with pd.read_csv(
+            file_path,
+            encoding="utf-8",
+            usecols=columns,
+            dtype={c: "category" for c in columns if CSV_SCHEMAS["ratings"][c] == "category"},
+            chunksize=chunk_size,
+        ) as reader:
+            for chunk in reader:
+                yield _apply_schema(chunk, "ratings")
+
+
 def read_credits_csv(file_path: Path) -> pd.DataFrame:
     """
     Read and parse credits CSV file.
@@ -116,28 +259,142 @@ def read_credits_csv(file_path: Path) -> pd.DataFrame:
         DataFrame with credits data
     """
     logger.info(f"Reading credits CSV: {file_path.name}")
-    df = pd.read_csv(file_path, encoding="utf-8")
-
-    # Ensure bggId is integer
-    if "bggId" in df.columns:
-        df["bggId"] = df["bggId"].astype("Int64")
+    df = _read_with_schema(file_path, "credits")
 
     logger.info(f"Loaded {len(df)} credits records from {file_path.name}")
     return df
 
 
+def _cache_path(file_path: Path) -> Path:
+    """Path of the typed cache for a CSV file."""
+    return file_path.with_name(file_path.name + CSV_CACHE_SUFFIX)
+
+
+def _source_fingerprint(file_path: Path, file_type: str) -> dict:
+    """Fingerprint of a CSV file used to invalidate its cache."""
+    stat = file_path.stat()
+    return {
+        "version": CSV_CACHE_VERSION,
+        "type": file_type,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _cache_is_valid(file_path: Path, file_type: str) -> bool:
+    """Whether a CSV file has a cache matching its current size and mtime."""
+    cache_path = _cache_path(file_path)
+    if pq is None or not cache_path.exists():
+        return False
+
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+        fingerprint = json.loads(metadata.get(_CACHE_METADATA_KEY, b"{}"))
+    except Exception as e:
+        logger.warning(f"Could not read cache {cache_path.name}: {e}")
+        return False
+
+    if fingerprint != _source_fingerprint(file_path, file_type):
+        logger.info(f"Cache for {file_path.name} is stale, re-reading CSV")
+        return False
+    return True
+
+
+def read_csv_cache(file_path: Path, file_type: str) -> Optional[pd.DataFrame]:
+    """
+    Read the typed cache of a CSV file if it is still valid.
+
+    Args:
+        file_path: Path to the source CSV file
+        file_type: Type of file ("games", "ratings", "credits")
+
+    Returns:
+        Cached DataFrame, or None if there is no valid cache
+    """
+    if not _cache_is_valid(file_path, file_type):
+        return None
+
+    cache_path = _cache_path(file_path)
+    try:
+        df = pq.read_table(cache_path).to_pandas()
+        logger.info(f"Loaded {len(df)} {file_type} rows from cache {cache_path.name}")
+        return df
+    except Exception as e:
+        logger.warning(f"Could not read cache {cache_path.name}: {e}")
+        return None
+
+
+def write_csv_cache(file_path: Path, file_type: str, df: pd.DataFrame) -> None:
+    """
+    Write the typed cache of a CSV file next to it.
+
+    The cache is written to a temporary file and renamed into place, so a
+    crashed run never leaves a truncated cache behind.
+
+    Args:
+        file_path: Path to the source CSV file
+        file_type: Type of file ("games", "ratings", "credits")
+        df: DataFrame as returned by the file type's reader
+    """
+    if pq is None:
+        logger.debug("pyarrow not installed, skipping CSV cache")
+        return
+
+    cache_path = _cache_path(file_path)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_CACHE_METADATA_KEY] = json.dumps(_source_fingerprint(file_path, file_type)).encode()
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Wrote cache {cache_path.name}")
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(f"Could not write cache for {file_path.name}: {e}")
+
+
+def _concat_frames(dfs: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate frames, unifying categoricals so they stay categorical."""
+    if len(dfs) > 1:
+        for column in dfs[0].columns:
+            if all(
+                column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype)
+                for df in dfs
+            ):
+                union = union_categoricals([df[column] for df in dfs]).categories
+                for df in dfs:
+                    df[column] = df[column].cat.set_categories(union)
+
+    return pd.concat(dfs, ignore_index=True)
+
+
+# Reader per file type
+CSV_READERS = {
+    "games": read_games_csv,
+    "ratings": read_ratings_csv,
+    "credits": read_credits_csv,
+}
+
+
 def read_csv_files(
     data_dir: Path,
     pattern: str,
     files_to_import: list[str],
+    use_cache: bool = True,
 ) -> dict[str, Optional[pd.DataFrame]]:
     """
     Read all CSV files matching the pattern.
 
+    With use_cache, each file is read from its typed Parquet cache when the
+    cache matches the CSV's size and mtime; otherwise the CSV is parsed and
+    the cache is (re)written as a side effect.
+
     Args:
         data_dir: Directory containing CSV files
         pattern: Pattern suffix (e.g., "_1_100")
         files_to_import: List of file types to import ("games", "ratings", "credits")
+        use_cache: Read and write the typed Parquet cache next to each CSV
 
     Returns:
         Dictionary mapping file types to DataFrames (None if file not found/not imported)
@@ -161,17 +418,18 @@ def read_csv_files(
         dfs = []
         for file_path in files:
             try:
-                if file_type == "games":
-                    df = read_games_csv(file_path)
-                elif file_type == "ratings":
-                    df = read_ratings_csv(file_path)
-                elif file_type == "credits":
-                    df = read_credits_csv(file_path)
-                else:
+                reader = CSV_READERS.get(file_type)
+                if reader is None:
                     logger.warning(f"Unknown file type: {file_type}")
                     result[file_type] = None
                     continue
 
+                df = read_csv_cache(file_path, file_type) if use_cache else None
+                if df is None:
+                    df = reader(file_path)
+                    if use_cache:
+                        write_csv_cache(file_path, file_type, df)
+
                 dfs.append(df)
             except Exception as e:
                 logger.error(f"Error reading {file_path}: {e}")
@@ -179,7 +437,7 @@ def read_csv_files(
 
         if dfs:
             # Concatenate all dataframes
-            combined_df = pd.concat(dfs, ignore_index=True)
+            combined_df = _concat_frames(dfs)
             logger.info(
                 f"Combined {len(dfs)} file(s) for {file_type}: {len(combined_df)} total rows"
             )
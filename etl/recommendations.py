@@ -0,0 +1,408 @@
+"""
+Batch Recommendations
+
+Precomputes the recommendations the app would otherwise compute on demand
+(lib/recommender) for every active user, and upserts them into the
+recommendations collection in the app's cache format. Serving a
+recommendation list is then a single indexed read on (userId, algorithm).
+
+Users are scored a chunk at a time with sparse matrix products against the
+whole catalog, and each chunk's top N is taken with a per-row argpartition,
+so memory stays bounded by one dense chunk x games block.
+
+Algorithms:
+    popularity  Normalized BGG average (70%) and rating count (30%), as in popularity.ts
+    knn         Item-based prediction from gameSimilarities, as in knn.ts
+
+Usage:
+    python -m etl.recommendations
+    python -m etl.recommendations --algorithms knn --top-n 50 --memory-mb 512
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Add project root to Python path for imports
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+import numpy as np
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from scipy import sparse
+
+from etl.config import get_config
+from etl.lib.mongodb import COLLECTIONS
+from etl.load import DataLoader
+from etl.logger import setup_logging, get_logger
+from etl.similarity import read_rating_matrix, top_k_rows
+
+logger = get_logger(__name__)
+
+RECOMMENDATION_ALGORITHMS = ("popularity", "knn")
+
+# Ratings a user needs before an algorithm is precomputed for them
+# (mirrors precomputeRecommendations in lib/recommender/index.ts)
+MIN_RATINGS = {"popularity": 1, "knn": 3}
+
+# Games kept per user and algorithm (the app caches max(limit, 100))
+DEFAULT_TOP_N = 100
+
+# Lifetime of a precomputed list (the app's CACHE_TTL)
+DEFAULT_TTL_HOURS = 24
+
+# Budget for one dense chunk of user x game scores and its temporaries
+DEFAULT_MEMORY_MB = 256
+
+# Popularity: games need this many BGG ratings to be recommended
+POPULARITY_MIN_COUNT = 100
+
+# KNN: rated neighbours needed for a prediction, and the mean used for games without a BGG average
+KNN_MIN_NEIGHBOURS = 5
+DEFAULT_GAME_MEAN = 6.5
+
+
+class Catalog:
+    """
+    Rating matrix and per-game inputs shared by all algorithms.
+
+    Columns of the matrix are all games of the games collection (rated or
+    not) followed by any rated game missing from it.
+    """
+
+    def __init__(self, games: Collection, ratings: Collection):
+        """
+        Read games and ratings.
+
+        Args:
+            games: Games collection
+            ratings: Ratings collection
+        """
+        game_ids, averages, counts = [], [], []
+        for doc in games.find({}, {"bggRating.average": 1, "bggRating.count": 1}):
+            bgg_rating = doc.get("bggRating") or {}
+            game_ids.append(doc["_id"])
+            averages.append(bgg_rating.get("average"))
+            counts.append(bgg_rating.get("count"))
+
+        self.matrix, self.user_ids, self.game_ids = read_rating_matrix(ratings, game_ids=game_ids)
+        extra = len(self.game_ids) - len(game_ids)
+        self.bgg_average = np.array(averages + [None] * extra, dtype=np.float64)
+        self.bgg_count = np.array(counts + [None] * extra, dtype=np.float64)
+        self.rating_counts = np.diff(self.matrix.indptr)
+
+    @property
+    def n_games(self) -> int:
+        return self.matrix.shape[1]
+
+    def game_index(self) -> dict[ObjectId, int]:
+        """Column of each game."""
+        return {game_id: position for position, game_id in enumerate(self.game_ids)}
+
+
+def popularity_scores(catalog: Catalog) -> np.ndarray:
+    """
+    Popularity score of every game (-inf for games that are never recommended).
+
+    Args:
+        catalog: Games and ratings
+
+    Returns:
+        float32 score per column
+    """
+    eligible = ~np.isnan(catalog.bgg_average) & (np.nan_to_num(catalog.bgg_count) >= POPULARITY_MIN_COUNT)
+    scores = np.full(catalog.n_games, -np.inf, dtype=np.float32)
+    if not eligible.any():
+        return scores
+
+    average, count = catalog.bgg_average[eligible], catalog.bgg_count[eligible]
+    average_range = (average.max() - average.min()) or 1.0
+    count_range = (count.max() - count.min()) or 1.0
+    scores[eligible] = (average - average.min()) / average_range * 0.7 + (count - count.min()) / count_range * 0.3
+    return scores
+
+
+def read_similarity_matrix(similarities: Collection, game_index: dict[ObjectId, int]) -> sparse.csr_matrix:
+    """
+    Read gameSimilarities into a sparse game x game matrix.
+
+    Row a holds the similarGames of game a; only positive similarities
+    between known games are kept.
+
+    Args:
+        similarities: gameSimilarities collection
+        game_index: Column of each game
+
+    Returns:
+        float32 CSR matrix of similarities
+    """
+    rows, columns, values = [], [], []
+    projection = {"_id": 0, "gameId": 1, "similarGames": 1}
+    for doc in similarities.find({}, projection, batch_size=1000):
+        row = game_index.get(doc["gameId"])
+        if row is None:
+            continue
+        for similar in doc.get("similarGames") or []:
+            column = game_index.get(similar["gameId"])
+            if column is not None and similar["similarity"] > 0:
+                rows.append(row)
+                columns.append(column)
+                values.append(similar["similarity"])
+
+    n_games = len(game_index)
+    matrix = sparse.csr_matrix(
+        (np.array(values, dtype=np.float32), (np.array(rows, dtype=np.int32), np.array(columns, dtype=np.int32))),
+        shape=(n_games, n_games),
+    )
+    logger.info(f"Read {matrix.nnz} similarities of {np.count_nonzero(np.diff(matrix.indptr))} games")
+    return matrix
+
+
+def knn_scorer(catalog: Catalog, similarity: sparse.csr_matrix):
+    """
+    Build the scorer of the item-based KNN algorithm.
+
+    A game's prediction is its BGG average plus the similarity-weighted mean
+    of the user's deviations from the BGG averages of rated games listing it
+    as similar, clamped to 1-10 and scaled to 0-1. Games with fewer than
+    KNN_MIN_NEIGHBOURS such rated games get no prediction. Unlike knn.ts,
+    every such rated game counts, not only the 40 most similar.
+
+    Args:
+        catalog: Games and ratings
+        similarity: Game x game similarities
+
+    Returns:
+        Function mapping a CSR chunk of user ratings to dense scores
+    """
+    means = np.where(np.isnan(catalog.bgg_average), DEFAULT_GAME_MEAN, catalog.bgg_average).astype(np.float32)
+    linked = similarity.copy()
+    linked.data[:] = 1.0
+
+    def score(ratings: sparse.csr_matrix) -> np.ndarray:
+        deviations = ratings.copy()
+        deviations.data -= means[deviations.indices]
+        rated = ratings.copy()
+        rated.data[:] = 1.0
+
+        weighted = (deviations @ similarity).toarray()
+        weights = (rated @ similarity).toarray()
+        neighbours = (rated @ linked).toarray()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prediction = np.clip(means + weighted / weights, 1.0, 10.0) / 10.0
+        prediction[neighbours < KNN_MIN_NEIGHBOURS] = -np.inf
+        return prediction
+
+    return score
+
+
+def popularity_scorer(catalog: Catalog):
+    """Build the scorer of the popularity algorithm (the same scores for every user)."""
+    scores = popularity_scores(catalog)
+
+    def score(ratings: sparse.csr_matrix) -> np.ndarray:
+        return np.tile(scores, (ratings.shape[0], 1))
+
+    return score
+
+
+def top_n_recommendations(
+    catalog: Catalog,
+    score,
+    min_ratings: int = 1,
+    top_n: int = DEFAULT_TOP_N,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    chunk_size: Optional[int] = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Score active users a chunk at a time and keep their top N games.
+
+    Games a user has rated are never recommended to them.
+
+    Args:
+        catalog: Games and ratings
+        score: Function mapping a CSR chunk of user ratings to dense (users, games) scores
+        min_ratings: Ratings a user needs to be scored
+        top_n: Games kept per user
+        memory_mb: Budget for one dense chunk of scores, used when chunk_size is None
+        chunk_size: Users per chunk
+
+    Yields:
+        Tuple of (user rows, game columns, scores) per chunk; columns and
+        scores are (users, top_n), sorted by score, with -1 and -inf past
+        the last recommendable game
+    """
+    active = np.flatnonzero(catalog.rating_counts >= min_ratings)
+    n_games = catalog.n_games
+    top_n = min(top_n, n_games)
+    if top_n == 0:
+        return
+
+    # A few float32 products and the argpartition indices per cell
+    if chunk_size is None:
+        chunk_size = max(1, memory_mb * 1024 * 1024 // (max(n_games, 1) * 24))
+
+    for start in range(0, len(active), chunk_size):
+        users = active[start:start + chunk_size]
+        ratings = catalog.matrix[users]
+        block = score(ratings)
+        block[np.repeat(np.arange(len(users)), np.diff(ratings.indptr)), ratings.indices] = -np.inf
+
+        top, top_scores = top_k_rows(block, top_n)
+        yield users, np.where(np.isfinite(top_scores), top, -1), top_scores
+
+
+def recommendation_updates(
+    catalog: Catalog,
+    algorithm: str,
+    chunks: Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]],
+    generated_at: datetime,
+    ttl_hours: float = DEFAULT_TTL_HOURS,
+) -> Iterator[UpdateOne]:
+    """
+    Turn top-N chunks into upserts of the app's cached recommendation documents.
+
+    Users without any recommendable game get an empty list, which replaces
+    any stale one.
+
+    Args:
+        catalog: Games and ratings
+        algorithm: Algorithm name stored with the list
+        chunks: Output of top_n_recommendations
+        generated_at: Timestamp of this run
+        ttl_hours: Hours until the app recomputes the list on demand
+
+    Yields:
+        One UpdateOne per user
+    """
+    expires_at = generated_at + timedelta(hours=ttl_hours)
+    for users, columns, scores in chunks:
+        rounded = np.round(scores.astype(np.float64), 4)
+        for user, user_columns, user_scores in zip(users.tolist(), columns.tolist(), rounded.tolist()):
+            games = [
+                {"gameId": catalog.game_ids[column], "score": score, "rank": rank}
+                for rank, (column, score) in enumerate(zip(user_columns, user_scores), start=1)
+                if column >= 0
+            ]
+            yield UpdateOne(
+                {"userId": catalog.user_ids[user], "algorithm": algorithm},
+                {"$set": {
+                    "games": games,
+                    "generatedAt": generated_at,
+                    "expiresAt": expires_at,
+                    "inputRatingCount": int(catalog.rating_counts[user]),
+                }},
+                upsert=True,
+            )
+
+
+def precompute_recommendations(
+    loader: DataLoader,
+    algorithms: tuple[str, ...] = RECOMMENDATION_ALGORITHMS,
+    top_n: int = DEFAULT_TOP_N,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    ttl_hours: float = DEFAULT_TTL_HOURS,
+) -> dict[str, int]:
+    """
+    Precompute recommendations of every active user and upsert them.
+
+    Scoring runs lazily while the loader writes earlier batches, so only
+    one chunk of scores and a few batches of upserts are in memory.
+
+    Args:
+        loader: Connected loader (its target collections are read and written)
+        algorithms: Algorithms to precompute
+        top_n: Games kept per user and algorithm
+        memory_mb: Budget for one dense chunk of scores
+        ttl_hours: Hours until the app recomputes a list on demand
+
+    Returns:
+        Number of users written per algorithm
+    """
+    unknown = set(algorithms) - set(RECOMMENDATION_ALGORITHMS)
+    if unknown:
+        raise ValueError(f"Unknown recommendation algorithms: {sorted(unknown)} (expected {RECOMMENDATION_ALGORITHMS})")
+
+    catalog = Catalog(loader.collection(COLLECTIONS["GAMES"]), loader.collection(COLLECTIONS["RATINGS"]))
+    generated_at = datetime.utcnow()
+
+    written = {}
+    for algorithm in algorithms:
+        start_time = time.perf_counter()
+        if algorithm == "knn":
+            similarity = read_similarity_matrix(loader.collection(COLLECTIONS["GAME_SIMILARITIES"]), catalog.game_index())
+            score = knn_scorer(catalog, similarity)
+        else:
+            score = popularity_scorer(catalog)
+
+        chunks = top_n_recommendations(catalog, score, MIN_RATINGS[algorithm], top_n, memory_mb)
+        updates = recommendation_updates(catalog, algorithm, chunks, generated_at, ttl_hours)
+        written[algorithm] = loader.update_recommendations(updates)
+        logger.info(
+            f"Precomputed {algorithm} recommendations of {written[algorithm]} users "
+            f"({time.perf_counter() - start_time:.1f}s)"
+        )
+
+    return written
+
+
+def main():
+    """CLI entry point: precompute recommendations of all active users."""
+    config = get_config()
+
+    parser = argparse.ArgumentParser(description="Precompute recommendations into the recommendations collection")
+    parser.add_argument(
+        "--algorithms",
+        default=",".join(config.pipeline.recommendation_algorithms),
+        help="Comma-separated algorithms to precompute (default: from config)",
+    )
+    parser.add_argument(
+        "--top-n",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f"Games kept per user and algorithm (default: {DEFAULT_TOP_N})",
+    )
+    parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=DEFAULT_MEMORY_MB,
+        help=f"Budget for one dense chunk of scores (default: {DEFAULT_MEMORY_MB})",
+    )
+    parser.add_argument(
+        "--ttl-hours",
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help=f"Hours until the app recomputes a list on demand (default: {DEFAULT_TTL_HOURS})",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (default: INFO)",
+    )
+    args = parser.parse_args()
+    setup_logging(level=args.log_level, log_to_file=False)
+
+    algorithms = tuple(name.strip() for name in args.algorithms.split(",") if name.strip())
+    loader = DataLoader()
+    try:
+        loader.connect()
+        precompute_recommendations(
+            loader,
+            algorithms=algorithms,
+            top_n=args.top_n,
+            memory_mb=args.memory_mb,
+            ttl_hours=args.ttl_hours,
+        )
+    finally:
+        loader.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Item-Item Similarity
+
+Builds a sparse user x game rating matrix from the ratings collection and
+computes mean-centered similarities between games, keeping only the top k
+neighbours of each game for the gameSimilarities collection.
+
+Similarities are computed for a block of games at a time, so peak memory is
+the sparse matrix plus one dense block x games slice, not games x games.
+
+Usage:
+    python -m etl.similarity
+    python -m etl.similarity --method pearson --top-k 50 --memory-mb 512
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add project root to Python path for imports
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+import numpy as np
+from bson import ObjectId
+from pymongo.collection import Collection
+from scipy import sparse
+
+from etl.config import get_config
+from etl.lib.mongodb import COLLECTIONS
+from etl.load import DataLoader
+from etl.logger import setup_logging, get_logger
+from etl.transform import transform_similarity
+
+logger = get_logger(__name__)
+
+# "cosine" centers each rating on its user's mean (adjusted cosine);
+# "pearson" centers it on its game's mean
+SIMILARITY_METHODS = ("cosine", "pearson")
+
+DEFAULT_TOP_K = 100
+
+# Budget for the dense similarity block and its temporaries
+DEFAULT_MEMORY_MB = 256
+
+# Ratings read from MongoDB per chunk while building the matrix
+READ_CHUNK_SIZE = 500_000
+
+
+def read_rating_matrix(
+    ratings: Collection,
+    chunk_size: int = READ_CHUNK_SIZE,
+    game_ids: Optional[list[ObjectId]] = None,
+) -> tuple[sparse.csr_matrix, list[ObjectId], list[ObjectId]]:
+    """
+    Read all ratings into a sparse user x game matrix.
+
+    Ids are mapped to matrix positions while reading, so only compact code
+    arrays are kept, not a Python object per rating.
+
+    Args:
+        ratings: Ratings collection
+        chunk_size: Ratings converted to arrays at a time
+        game_ids: Games that take the first columns, in order, whether rated or not;
+            other rated games follow
+
+    Returns:
+        Tuple of (float32 CSR matrix of ratings, user ObjectId of each row, game ObjectId of each column)
+    """
+    user_index: dict[ObjectId, int] = {}
+    game_index: dict[ObjectId, int] = {game_id: position for position, game_id in enumerate(game_ids or [])}
+    user_chunks, game_chunks, rating_chunks = [], [], []
+    users, games, values = [], [], []
+
+    def flush() -> None:
+        user_chunks.append(np.array(users, dtype=np.int32))
+        game_chunks.append(np.array(games, dtype=np.int32))
+        rating_chunks.append(np.array(values, dtype=np.float32))
+        users.clear()
+        games.clear()
+        values.clear()
+
+    projection = {"_id": 0, "userId": 1, "gameId": 1, "rating": 1}
+    for doc in ratings.find({"rating": {"$ne": None}}, projection, batch_size=10_000):
+        users.append(user_index.setdefault(doc["userId"], len(user_index)))
+        games.append(game_index.setdefault(doc["gameId"], len(game_index)))
+        values.append(doc["rating"])
+        if len(values) >= chunk_size:
+            flush()
+    flush()
+
+    matrix = sparse.csr_matrix(
+        (np.concatenate(rating_chunks), (np.concatenate(user_chunks), np.concatenate(game_chunks))),
+        shape=(len(user_index), len(game_index)),
+        dtype=np.float32,
+    )
+    logger.info(f"Read {matrix.nnz} ratings of {len(game_index)} games by {len(user_index)} users")
+    return matrix, list(user_index), list(game_index)
+
+
+def top_k_rows(block: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Columns and values of the k largest entries of every row, largest first.
+
+    Args:
+        block: Dense (rows, columns) scores, with k <= columns
+        k: Entries kept per row
+
+    Returns:
+        Tuple of (column positions, values), both (rows, k)
+    """
+    top = np.argpartition(block, -k, axis=1)[:, -k:]
+    top_scores = np.take_along_axis(block, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _normalized_columns(matrix: sparse.csr_matrix, method: str) -> sparse.csr_matrix:
+    """Mean-center the ratings and scale every game column to unit length."""
+    if method not in SIMILARITY_METHODS:
+        raise ValueError(f"Unknown similarity method: {method} (expected one of {SIMILARITY_METHODS})")
+
+    centered = matrix.copy()
+    n_users, n_games = centered.shape
+    if method == "cosine":
+        counts = np.diff(centered.indptr)
+        means = np.asarray(centered.sum(axis=1)).ravel() / np.maximum(counts, 1)
+        centered.data -= np.repeat(means, counts).astype(np.float32)
+    else:
+        counts = np.bincount(centered.indices, minlength=n_games)
+        means = np.bincount(centered.indices, weights=centered.data, minlength=n_games) / np.maximum(counts, 1)
+        centered.data -= means[centered.indices].astype(np.float32)
+
+    norms = np.sqrt(np.bincount(centered.indices, weights=centered.data.astype(np.float64) ** 2, minlength=n_games))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(norms > 0, 1.0 / norms, 0.0).astype(np.float32)
+    centered.data *= scale[centered.indices]
+    centered.eliminate_zeros()
+    return centered
+
+
+def item_similarities(
+    matrix: sparse.csr_matrix,
+    top_k: int = DEFAULT_TOP_K,
+    method: str = "cosine",
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    block_size: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k most similar games of every game.
+
+    Only positive similarities are kept: after mean-centering, zero means
+    no relation and negative means opposite tastes.
+
+    Args:
+        matrix: User x game rating matrix
+        top_k: Neighbours kept per game
+        method: "cosine" (adjusted cosine, centered per user) or "pearson" (centered per game)
+        memory_mb: Budget for one dense block of similarities, used when block_size is None
+        block_size: Games per block
+
+    Returns:
+        Tuple of (neighbour positions, similarities), both (games, top_k)
+        and sorted by similarity; missing neighbours are -1 with similarity 0
+    """
+    normalized = _normalized_columns(matrix, method)
+    by_game = normalized.T.tocsr()
+    n_games = matrix.shape[1]
+    top_k = min(top_k, max(n_games - 1, 0))
+
+    # The sparse product, its dense copy and the argpartition indices each
+    # take about block x games x 4-8 bytes
+    if block_size is None:
+        block_size = max(1, memory_mb * 1024 * 1024 // (max(n_games, 1) * 20))
+
+    neighbours = np.full((n_games, top_k), -1, dtype=np.int32)
+    scores = np.zeros((n_games, top_k), dtype=np.float32)
+    if top_k == 0:
+        return neighbours, scores
+
+    start_time = time.perf_counter()
+    for start in range(0, n_games, block_size):
+        stop = min(start + block_size, n_games)
+        block = (by_game[start:stop] @ normalized).toarray()
+        rows = np.arange(stop - start)
+        block[rows, np.arange(start, stop)] = -np.inf
+
+        top, top_scores = top_k_rows(block, top_k)
+        related = top_scores > 0
+        neighbours[start:stop] = np.where(related, top, -1)
+        scores[start:stop] = np.where(related, top_scores, 0.0)
+
+    logger.info(
+        f"Computed {method} similarities of {n_games} games in blocks of {block_size} "
+        f"({time.perf_counter() - start_time:.1f}s)"
+    )
+    return neighbours, scores
+
+
+def similarity_documents(game_ids: list[ObjectId], neighbours: np.ndarray, scores: np.ndarray) -> list[dict]:
+    """
+    Build gameSimilarities documents from top-k neighbours.
+
+    Games without any positive neighbour get no document.
+
+    Args:
+        game_ids: Game ObjectId of each position
+        neighbours: Neighbour positions per game (-1 for none)
+        scores: Similarity per neighbour
+
+    Returns:
+        List of similarity documents
+    """
+    rounded = np.round(scores.astype(np.float64), 4)
+    documents = []
+    for game_id, game_neighbours, game_scores in zip(game_ids, neighbours.tolist(), rounded.tolist()):
+        similar = [(game_ids[j], score) for j, score in zip(game_neighbours, game_scores) if j >= 0]
+        if similar:
+            documents.append(transform_similarity(game_id, similar))
+    return documents
+
+
+def compute_similarity_documents(
+    ratings: Collection,
+    top_k: int = DEFAULT_TOP_K,
+    method: str = "cosine",
+    memory_mb: int = DEFAULT_MEMORY_MB,
+) -> list[dict]:
+    """
+    Read ratings and build the top-k gameSimilarities documents.
+
+    Args:
+        ratings: Ratings collection
+        top_k: Neighbours kept per game
+        method: "cosine" or "pearson"
+        memory_mb: Budget for one dense block of similarities
+
+    Returns:
+        List of similarity documents
+    """
+    matrix, _, game_ids = read_rating_matrix(ratings)
+    neighbours, scores = item_similarities(matrix, top_k=top_k, method=method, memory_mb=memory_mb)
+    return similarity_documents(game_ids, neighbours, scores)
+
+
+def main():
+    """CLI entry point: recompute gameSimilarities from the ratings collection."""
+    config = get_config()
+
+    parser = argparse.ArgumentParser(description="Compute top-k item-item similarities into gameSimilarities")
+    parser.add_argument(
+        "--method",
+        choices=SIMILARITY_METHODS,
+        default=config.pipeline.similarity_method,
+        help="cosine: centered per user (adjusted cosine); pearson: centered per game (default: from config)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=config.pipeline.similarity_top_k,
+        help="Neighbours kept per game (default: from config)",
+    )
+    parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=DEFAULT_MEMORY_MB,
+        help=f"Budget for one dense block of similarities (default: {DEFAULT_MEMORY_MB})",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (default: INFO)",
+    )
+    args = parser.parse_args()
+    setup_logging(level=args.log_level, log_to_file=False)
+
+    loader = DataLoader()
+    try:
+        loader.connect()
+        documents = compute_similarity_documents(
+            loader.mongo.get_collection(COLLECTIONS["RATINGS"]),
+            top_k=args.top_k,
+            method=args.method,
+            memory_mb=args.memory_mb,
+        )
+        loader.load_similarities(documents, drop_existing=True)
+    finally:
+        loader.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,56 @@ ETL Data Transformers
 Transforms raw data into MongoDB-compatible documents.
 """
 
+import hashlib
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
 from bson import ObjectId
 
+from etl.id_map import IdMap
+from etl.rating_stats import RatingStats
 from etl.logger import get_logger
 from etl.utils import clean_string, safe_int, safe_float
 
 logger = get_logger(__name__)
 
 
+# Namespace of rating ids, derived from the user and game ids
+_RATING_NAMESPACE = b"bgr.rating"
+
+
+def _derived_id_bytes(namespace: bytes, key: bytes) -> bytes:
+    """Raw 12 bytes of the ObjectId derived from a namespaced natural key."""
+    return hashlib.blake2b(key, digest_size=12, person=namespace).digest()
+
+
+def _derived_object_id(namespace: bytes, key: bytes) -> ObjectId:
+    """Derive a stable ObjectId from a namespaced natural key."""
+    return ObjectId(_derived_id_bytes(namespace, key))
+
+
+def game_object_id(bgg_id: int) -> ObjectId:
+    """
+    Stable ObjectId for a game, derived from its BGG ID.
+
+    Derived ids are 12-byte hashes, so unlike generated ObjectIds their
+    leading bytes are not a creation timestamp.
+    """
+    return _derived_object_id(b"bgr.game", str(int(bgg_id)).encode())
+
+
+def shadow_user_object_id(username: str, origin: str = "bgg") -> ObjectId:
+    """Stable ObjectId for a shadow user, derived from its clerkId."""
+    return _derived_object_id(b"bgr.user", f"shadow_{origin}_{username}".encode())
+
+
+def rating_object_id(user_id: ObjectId, game_id: ObjectId) -> ObjectId:
+    """Stable ObjectId for a rating, derived from its user and game ids."""
+    return _derived_object_id(_RATING_NAMESPACE, user_id.binary + game_id.binary)
+
+
 def transform_game(
     raw: dict,
     categories: list[str],
@@ -129,7 +169,7 @@ def transform_rating(
         rating_origin = "bgg"
 
     return {
-        "_id": ObjectId(),
+        "_id": rating_object_id(user_id, game_id),
         "userId": user_id,
         "gameId": game_id,
         "rating": safe_float(raw.get("rating")) or 0.0,
@@ -214,7 +254,7 @@ def transform_similarity(
         MongoDB-compatible similarity document
     """
     return {
-        "_id": ObjectId(),
+        "_id": _derived_object_id(b"bgr.similarity", game_id.binary),
         "gameId": game_id,
         "similarGames": [
             {"gameId": gid, "similarity": score} for gid, score in similar_games
@@ -258,9 +298,11 @@ def transform_merged_game(raw: dict) -> dict:
             "count": rating_count,
         }
 
+    bgg_id = safe_int(raw.get("bggId"))
+
     return {
-        "_id": ObjectId(),
-        "bggId": safe_int(raw.get("bggId")),
+        "_id": game_object_id(bgg_id) if bgg_id is not None else ObjectId(),
+        "bggId": bgg_id,
         "name": clean_string(raw.get("name")),
         "description": clean_string(raw.get("description")),
         "yearPublished": safe_int(raw.get("yearPublished")),
@@ -340,9 +382,11 @@ def transform_game_from_csv(raw: dict) -> dict:
             "count": rating_count,
         }
 
+    bgg_id = safe_int(raw.get("bggId"))
+
     return {
-        "_id": ObjectId(),
-        "bggId": safe_int(raw.get("bggId")),
+        "_id": game_object_id(bgg_id) if bgg_id is not None else ObjectId(),
+        "bggId": bgg_id,
         "name": clean_string(raw.get("name")),
         "description": clean_string(raw.get("description")),
         "yearPublished": safe_int(raw.get("yearPublished")),
@@ -383,7 +427,7 @@ def transform_shadow_user(username: str, rating_count: int = 0, origin: str = "b
     username_clean = clean_string(username) or ""
 
     return {
-        "_id": ObjectId(),
+        "_id": shadow_user_object_id(username_clean, origin),
         "clerkId": f"shadow_{origin}_{username_clean}",
         "username": username_clean,
         "displayName": None,
@@ -392,3 +436,512 @@ def transform_shadow_user(username: str, rating_count: int = 0, origin: str = "b
         "createdAt": now,
         "updatedAt": now,
     }
+
+
+def _int_column(df: pd.DataFrame, column: str) -> list[Optional[int]]:
+    """Column-wise equivalent of safe_int: truncate to int, None for missing/unparseable."""
+    if column not in df.columns:
+        return [None] * len(df)
+
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    missing = ~np.isfinite(values)
+    out = np.trunc(np.where(missing, 0, values)).astype(np.int64).astype(object)
+    out[missing] = None
+    return out.tolist()
+
+
+def _string_column(df: pd.DataFrame, column: str) -> list[Optional[str]]:
+    """Column-wise equivalent of clean_string: stripped text, None for missing/blank."""
+    if column not in df.columns:
+        return [None] * len(df)
+
+    series = df[column]
+    present = series.notna()
+    cleaned = series[present].astype(str).str.strip()
+    cleaned = cleaned.where(cleaned != "")
+
+    out = np.full(len(series), None, dtype=object)
+    out[present.to_numpy()] = cleaned.astype(object).where(cleaned.notna(), None).to_numpy()
+    return out.tolist()
+
+
+def _list_column(df: pd.DataFrame, column: str) -> list[list]:
+    """Return a list-valued column, replacing non-list cells with empty lists."""
+    if column not in df.columns:
+        return [[] for _ in range(len(df))]
+
+    return [value if isinstance(value, list) else [] for value in df[column].tolist()]
+
+
+def _designer_column(df: pd.DataFrame) -> list[list[dict]]:
+    """Expand designer name lists into embedded designer objects for every row."""
+    designers: list[list[dict]] = [[] for _ in range(len(df))]
+    if "designers" not in df.columns or df.empty:
+        return designers
+
+    lists = pd.Series(_list_column(df, "designers"), index=pd.RangeIndex(len(df)))
+    exploded = lists.explode()
+    exploded = exploded[exploded.notna() & exploded.astype(bool)]
+    if exploded.empty:
+        return designers
+
+    names = exploded.astype(str).str.strip()
+    names = names.where(names != "")
+    ids = names.fillna("")
+    names_obj = names.astype(object).where(names.notna(), None)
+
+    for row, designer_id, name in zip(exploded.index.tolist(), ids.tolist(), names_obj.tolist()):
+        designers[row].append({
+            "id": designer_id,
+            "name": name,
+            "url": None,
+            "imageUrl": None,
+        })
+
+    return designers
+
+
+def _safe_float_values(series: pd.Series) -> list[Optional[float]]:
+    """Column-wise equivalent of safe_float: None for missing (None) or unparseable values, NaN kept as NaN."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype="float64", na_value=np.nan).tolist()
+    return [safe_float(value) for value in series.tolist()]
+
+
+def _bgg_rating_column(df: pd.DataFrame) -> list[Optional[dict]]:
+    """Assemble bggRating sub-documents (average/count) for every row."""
+    n = len(df)
+    counts = _int_column(df, "numVoters")
+
+    def cells(column: str) -> pd.Series:
+        return df[column] if column in df.columns else pd.Series([None] * n, dtype=object)
+
+    # Mirrors `avgRating or geekRating`: None, "" and 0 fall back, NaN is truthy and does not
+    avg = cells("avgRating")
+    if pd.api.types.is_numeric_dtype(avg):
+        falsy = (avg == 0).to_numpy()
+    else:
+        falsy = np.array([not value for value in avg.tolist()], dtype=bool)
+    averages = _safe_float_values(cells("geekRating").where(falsy, avg))
+
+    return [
+        {"average": average, "count": count} if average is not None and count is not None else None
+        for average, count in zip(averages, counts)
+    ]
+
+
+def transform_games_from_dataframe(games_df: pd.DataFrame) -> list[dict]:
+    """
+    Transform a merged games DataFrame into MongoDB documents column-wise.
+
+    Produces the same documents as calling transform_game_from_csv on every
+    row, but does type coercion, null handling and sub-document assembly on
+    whole columns. Documents are returned in row order, including rows that
+    are missing a name or bggId (callers filter those).
+
+    Args:
+        games_df: Merged games DataFrame from merge_csv_data
+
+    Returns:
+        List of MongoDB-compatible game documents
+    """
+    n = len(games_df)
+    if n == 0:
+        return []
+
+    now = datetime.utcnow()
+    df = games_df.reset_index(drop=True)
+
+    columns = {
+        "bggId": _int_column(df, "bggId"),
+        "name": _string_column(df, "name"),
+        "description": _string_column(df, "description"),
+        "yearPublished": _int_column(df, "yearPublished"),
+        "minPlayers": _int_column(df, "minPlayers"),
+        "maxPlayers": _int_column(df, "maxPlayers"),
+        "minPlaytime": _int_column(df, "minPlaytime"),
+        "maxPlaytime": _int_column(df, "maxPlaytime"),
+        "minAge": _int_column(df, "minAge"),
+        "thumbnailUrl": _string_column(df, "thumbnailUrl"),
+        "imageUrl": _string_column(df, "imageUrl"),
+        "categories": _list_column(df, "categories"),
+        "mechanics": _list_column(df, "mechanics"),
+        "designers": _designer_column(df),
+        "bggRating": _bgg_rating_column(df),
+        "officialUrl": _string_column(df, "detailUrl"),
+        "bggRank": _int_column(df, "rank"),
+    }
+
+    return [
+        {
+            "_id": game_object_id(bgg_id) if bgg_id is not None else ObjectId(),
+            "bggId": bgg_id,
+            "name": name,
+            "description": description,
+            "yearPublished": year,
+            "minPlayers": min_players,
+            "maxPlayers": max_players,
+            "minPlaytime": min_playtime,
+            "maxPlaytime": max_playtime,
+            "minAge": min_age,
+            "complexity": None,
+            "thumbnailUrl": thumbnail_url,
+            "imageUrl": image_url,
+            "categories": categories,
+            "mechanics": mechanics,
+            "designers": designers,
+            "publishers": [],
+            "bggRating": bgg_rating,
+            "officialUrl": official_url,
+            "priceUs": None,
+            "bggRank": bgg_rank,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for (
+            bgg_id, name, description, year, min_players, max_players, min_playtime,
+            max_playtime, min_age, thumbnail_url, image_url, categories, mechanics,
+            designers, bgg_rating, official_url, bgg_rank,
+        ) in zip(*columns.values())
+    ]
+
+
+def transform_shadow_users_from_dataframe(profiles_df: pd.DataFrame, origin: str = "bgg") -> list[dict]:
+    """
+    Build shadow user documents for every row of a profiles DataFrame.
+
+    Produces the same documents as calling transform_shadow_user on every
+    row, with one timestamp shared by the whole batch.
+
+    Args:
+        profiles_df: Shadow profiles DataFrame (username, ratingCount, ...)
+        origin: User origin identifier (default: "bgg")
+
+    Returns:
+        List of MongoDB-compatible user documents, in row order
+    """
+    if profiles_df.empty:
+        return []
+
+    usernames = [name or "" for name in _string_column(profiles_df, "username")]
+    if "ratingCount" in profiles_df.columns:
+        rating_counts = profiles_df["ratingCount"].fillna(0).astype("int64").tolist()
+    else:
+        rating_counts = [0] * len(profiles_df)
+
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": shadow_user_object_id(username, origin),
+            "clerkId": f"shadow_{origin}_{username}",
+            "username": username,
+            "displayName": None,
+            "ratingCount": rating_count,
+            "preferences": None,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for username, rating_count in zip(usernames, rating_counts)
+    ]
+
+
+def clean_usernames(usernames: pd.Series) -> pd.Series:
+    """
+    Strip usernames as a categorical, treating blank names as missing.
+
+    Stripping happens once per distinct name rather than once per row.
+    """
+    codes_in = usernames.astype("category")
+    stripped = codes_in.cat.categories.astype(str).str.strip()
+    remap = pd.Categorical(stripped.where(stripped != ""))
+    codes = codes_in.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, np.append(remap.codes, -1)[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, remap.categories), index=usernames.index)
+
+
+def _rating_values(ratings: pd.Series) -> np.ndarray:
+    """Ratings as float64, undoing float32 storage noise (7.1 -> 7.099999...)."""
+    values = ratings.to_numpy(dtype="float64", na_value=np.nan)
+    if ratings.dtype == "float32":
+        values = np.round(values, 6)
+    return values
+
+
+def _rating_stamps(stamps: pd.Series) -> np.ndarray:
+    """
+    rating_tstamp as int64 nanoseconds for ordering repeats.
+
+    Unparseable or missing timestamps become NaT, the smallest int64, so
+    undated rows sort first (oldest).
+    """
+    parsed = pd.to_datetime(stamps, errors="coerce", utc=True).dt.tz_localize(None)
+    return parsed.to_numpy().view("int64")
+
+
+def _superseded_ratings(df: pd.DataFrame, user_codes: np.ndarray, bgg_ids: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """
+    Flag candidate rows superseded by another rating of the same game by the same user.
+
+    The row with the newest rating_tstamp wins. Rows without a parseable
+    timestamp count as oldest, and ties go to the row that comes later.
+    Timestamps are only parsed for rows whose key actually repeats.
+
+    Args:
+        df: Ratings DataFrame
+        user_codes: Cleaned username codes per row
+        bgg_ids: bggId per row
+        candidates: Rows that can be loaded (all key fields and a rating present)
+
+    Returns:
+        Boolean mask of superseded rows
+    """
+    superseded = np.zeros(len(df), dtype=bool)
+    rows = np.flatnonzero(candidates)
+    repeated = pd.DataFrame({"user": user_codes[rows], "game": bgg_ids[rows]}).duplicated(keep=False).to_numpy()
+    if not repeated.any():
+        return superseded
+
+    rows = rows[repeated]
+    if "rating_tstamp" in df.columns:
+        rows = rows[np.argsort(_rating_stamps(df["rating_tstamp"].iloc[rows]), kind="stable")]
+
+    keys = pd.DataFrame({"user": user_codes[rows], "game": bgg_ids[rows]})
+    superseded[rows[keys.duplicated(keep="last").to_numpy()]] = True
+    return superseded
+
+
+def rating_keys(
+    ratings_df: pd.DataFrame,
+    game_id_map: Union[IdMap, dict[int, ObjectId]],
+    username_id_map: Union[IdMap, dict[str, ObjectId]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (user, game) key and timestamp of each rating row, for finding repeats across chunks.
+
+    Keys are user map position * len(game_id_map) + game map position; rows
+    that cannot be loaded (missing field, unknown user or game) get -1.
+
+    Args:
+        ratings_df: Ratings DataFrame (username, bggId, rating and, if present, rating_tstamp)
+        game_id_map: IdMap (or plain dict) of bggId to game ObjectId
+        username_id_map: IdMap (or plain dict) of username to user ObjectId
+
+    Returns:
+        Tuple of (int64 keys, int64 rating_tstamp nanoseconds with NaT for undated rows)
+    """
+    game_id_map = _as_id_map(game_id_map)
+    username_id_map = _as_id_map(username_id_map)
+    df = ratings_df.reset_index(drop=True)
+    n = len(df)
+    keys = np.full(n, -1, dtype=np.int64)
+    stamps = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+    if n == 0 or not {"username", "bggId", "rating"}.issubset(df.columns):
+        return keys, stamps
+
+    bgg_ids = pd.to_numeric(df["bggId"], errors="coerce")
+    usernames = clean_usernames(df["username"])
+    valid = (bgg_ids.notna() & pd.to_numeric(df["rating"], errors="coerce").notna() & usernames.notna()).to_numpy()
+
+    game_positions = np.full(n, -1, dtype=np.int64)
+    game_positions[valid] = game_id_map.positions(bgg_ids[valid].astype("int64"))
+    user_positions = np.full(n, -1, dtype=np.int64)
+    has_game = game_positions >= 0
+    user_positions[has_game] = username_id_map.positions(usernames[has_game])
+
+    known = user_positions >= 0
+    keys[known] = user_positions[known] * len(game_id_map) + game_positions[known]
+    if "rating_tstamp" in df.columns:
+        stamps = _rating_stamps(df["rating_tstamp"])
+    return keys, stamps
+
+
+def superseded_rating_rows(keys: np.ndarray, stamps: np.ndarray) -> np.ndarray:
+    """
+    Rows superseded by a newer rating with the same key, as rating_keys returns them.
+
+    Applies the rule of the in-frame collapse to rows of any number of
+    chunks: the newest timestamp wins, undated rows count as oldest and
+    ties go to the row that comes later. Rows keyed -1 are never superseded.
+
+    Args:
+        keys: Rating keys of all rows, in reading order
+        stamps: Rating timestamps of all rows, in reading order
+
+    Returns:
+        Sorted row numbers of the superseded rows
+    """
+    rows = np.flatnonzero(keys >= 0)
+    # lexsort is stable, so equal (key, timestamp) rows stay in reading order
+    rows = rows[np.lexsort((stamps[rows], keys[rows]))]
+    sorted_keys = keys[rows]
+    superseded = rows[:-1][sorted_keys[1:] == sorted_keys[:-1]]
+    return np.sort(superseded)
+
+
+def _resolve_ratings(
+    ratings_df: pd.DataFrame,
+    game_id_map: IdMap,
+    username_id_map: IdMap,
+    origin: str,
+    stats: Optional[RatingStats] = None,
+) -> tuple[dict[str, np.ndarray], dict[str, int]]:
+    """
+    Resolve the loadable ratings of a DataFrame to positions in the ID maps.
+
+    Repeated ratings of a game by the same user collapse to the newest one
+    (by rating_tstamp), so the result never repeats a (userId, gameId) key.
+    The kept ratings are added to stats, if given.
+
+    Returns:
+        Tuple of (columns of the kept rows: game and user map positions,
+        rating and origin; skipped row counts per reason)
+    """
+    skipped = {"missing_fields": 0, "duplicate": 0, "unknown_game": 0, "unknown_user": 0}
+    df = ratings_df.reset_index(drop=True)
+    n = len(df)
+
+    bgg_ids = pd.to_numeric(df["bggId"], errors="coerce") if "bggId" in df.columns else pd.Series(np.nan, index=df.index)
+    ratings = pd.to_numeric(df["rating"], errors="coerce") if "rating" in df.columns else pd.Series(np.nan, index=df.index)
+    if "username" in df.columns:
+        usernames = clean_usernames(df["username"])
+    else:
+        usernames = pd.Series(pd.Categorical([None] * n), index=df.index)
+
+    valid = (bgg_ids.notna() & ratings.notna() & usernames.notna()).to_numpy()
+    skipped["missing_fields"] = int(n - valid.sum())
+
+    game_keys = bgg_ids.to_numpy(dtype="float64", na_value=np.nan)
+    superseded = _superseded_ratings(df, usernames.cat.codes.to_numpy(), game_keys, valid)
+    skipped["duplicate"] = int(superseded.sum())
+    valid = valid & ~superseded
+
+    game_positions = np.full(n, -1, dtype=np.int64)
+    game_positions[valid] = game_id_map.positions(bgg_ids[valid].astype("int64"))
+    has_game = game_positions >= 0
+    skipped["unknown_game"] = int(valid.sum() - has_game.sum())
+
+    user_positions = np.full(n, -1, dtype=np.int64)
+    user_positions[has_game] = username_id_map.positions(usernames[has_game])
+    keep = user_positions >= 0
+    skipped["unknown_user"] = int(has_game.sum() - keep.sum())
+
+    # Origin column precedence mirrors transform_rating
+    rating_origin = pd.Series(origin, index=df.index, dtype=object)
+    for column in ("origin", "user_origin"):
+        if column in df.columns:
+            values = df[column].astype(object)
+            rating_origin = values.where(values.notna() & values.astype(bool), rating_origin)
+    rating_origin = rating_origin.where(rating_origin.isin(["app", "bgg"]), "bgg")
+
+    columns = {
+        "game": game_positions[keep],
+        "user": user_positions[keep],
+        "rating": _rating_values(ratings)[keep],
+        "origin": rating_origin.to_numpy()[keep],
+    }
+    if stats is not None:
+        stats.add(columns["game"], columns["rating"])
+    return columns, skipped
+
+
+def _as_id_map(id_map: Union[IdMap, dict]) -> IdMap:
+    return id_map if isinstance(id_map, IdMap) else IdMap.from_dict(id_map)
+
+
+def transform_ratings_from_dataframe(
+    ratings_df: pd.DataFrame,
+    game_id_map: Union[IdMap, dict[int, ObjectId]],
+    username_id_map: Union[IdMap, dict[str, ObjectId]],
+    origin: str = "bgg",
+    stats: Optional[RatingStats] = None,
+) -> tuple[list[dict], dict[str, int]]:
+    """
+    Resolve ratings to user/game ObjectIds and build rating documents in bulk.
+
+    Rows are matched against the ID maps with index joins instead of per-row
+    dictionary lookups. Produces the same documents as transform_rating.
+
+    Repeated ratings of a game by the same user collapse to the newest one
+    (by rating_tstamp), so the batch never repeats a (userId, gameId) key.
+
+    Args:
+        ratings_df: Ratings DataFrame (bggId, username, rating, ...)
+        game_id_map: IdMap (or plain dict) of bggId to game ObjectId
+        username_id_map: IdMap (or plain dict) of username to user ObjectId
+        origin: Default rating origin (app, bgg)
+        stats: Per-game rating sums (indexed like game_id_map) to add the kept ratings to
+
+    Returns:
+        Tuple of (rating documents, skipped row counts per reason)
+    """
+    game_id_map = _as_id_map(game_id_map)
+    username_id_map = _as_id_map(username_id_map)
+    columns, skipped = _resolve_ratings(ratings_df, game_id_map, username_id_map, origin, stats)
+
+    now = datetime.utcnow()
+    documents = [
+        {
+            "_id": rating_object_id(user_id, game_id),
+            "userId": user_id,
+            "gameId": game_id,
+            "rating": rating or 0.0,
+            "origin": doc_origin,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for user_id, game_id, rating, doc_origin in zip(
+            username_id_map.objects(columns["user"]).tolist(),
+            game_id_map.objects(columns["game"]).tolist(),
+            columns["rating"].tolist(),
+            columns["origin"].tolist(),
+        )
+    ]
+
+    return documents, skipped
+
+
+def transform_ratings_to_columns(
+    ratings_df: pd.DataFrame,
+    game_id_map: Union[IdMap, dict[int, ObjectId]],
+    username_id_map: Union[IdMap, dict[str, ObjectId]],
+    origin: str = "bgg",
+    stats: Optional[RatingStats] = None,
+) -> tuple[dict[str, np.ndarray], dict[str, int]]:
+    """
+    Resolve ratings into rating document columns for etl.bson_columns.
+
+    Same rows, fields and field order as transform_ratings_from_dataframe,
+    but ids stay raw 12-byte rows and no per-document objects are created.
+
+    Args:
+        ratings_df: Ratings DataFrame (bggId, username, rating, ...)
+        game_id_map: IdMap (or plain dict) of bggId to game ObjectId
+        username_id_map: IdMap (or plain dict) of username to user ObjectId
+        origin: Default rating origin (app, bgg)
+        stats: Per-game rating sums (indexed like game_id_map) to add the kept ratings to
+
+    Returns:
+        Tuple of (field name to column, skipped row counts per reason)
+    """
+    game_id_map = _as_id_map(game_id_map)
+    username_id_map = _as_id_map(username_id_map)
+    resolved, skipped = _resolve_ratings(ratings_df, game_id_map, username_id_map, origin, stats)
+
+    user_ids = username_id_map.binary(resolved["user"])
+    game_ids = game_id_map.binary(resolved["game"])
+    pairs = np.hstack([user_ids, game_ids]).tobytes()
+    rating_ids = b"".join(
+        _derived_id_bytes(_RATING_NAMESPACE, pairs[start:start + 24]) for start in range(0, len(pairs), 24)
+    )
+
+    now = np.full(len(user_ids), np.datetime64(datetime.utcnow(), "ms"))
+    columns = {
+        "_id": np.frombuffer(rating_ids, dtype=np.uint8).reshape(-1, 12),
+        "userId": user_ids,
+        "gameId": game_ids,
+        "rating": resolved["rating"],
+        "origin": resolved["origin"],
+        "createdAt": now,
+        "updatedAt": now,
+    }
+    return columns, skipped
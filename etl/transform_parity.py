@@ -0,0 +1,164 @@
+"""
+Game Transform Parity Check
+
+transform_games_from_dataframe is the column-wise version of
+transform_game_from_csv, which is kept as the reference implementation.
+This check runs both on the same frames and reports every field where
+their documents differ. The built-in frames cover NaN, blank strings,
+unparseable numbers, missing average/geek ratings and multi-designer rows,
+in both numeric and object (all-text) dtypes; merged CSVs can be checked too.
+
+Usage:
+    python -m etl.transform_parity
+    python -m etl.transform_parity --data-dir etl/data --pattern _1_100
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+# Add project root to Python path for imports
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+import numpy as np
+import pandas as pd
+
+from etl.logger import setup_logging, get_logger
+from etl.transform import transform_game_from_csv, transform_games_from_dataframe
+
+logger = get_logger(__name__)
+
+# Fields set from the clock (or a random ObjectId without a bggId), not from the row
+_UNCOMPARED_FIELDS = ("createdAt", "updatedAt")
+
+
+def sample_games_frame() -> pd.DataFrame:
+    """Merged-games frame with the edge cases the column-wise transform must match."""
+    nan = np.nan
+    return pd.DataFrame({
+        "bggId": [224517, 174430, nan, 12.0, 342942, 7],
+        "name": ["Brass: Birmingham", "  Gloomhaven  ", "No Id", "", nan, "Zero Average"],
+        "description": ["Build networks", nan, "  ", "Text", "More", None],
+        "yearPublished": [2018, 2017.0, nan, 1995, 2022, nan],
+        "minPlayers": [2, 1, nan, 3, 1, 2],
+        "maxPlayers": [4, 4, nan, 4, 4, 2],
+        "minPlaytime": [60, 60, nan, 45, 30, nan],
+        "maxPlaytime": [120, 120, nan, 90, 150, nan],
+        "minAge": [14, 14, nan, 10, 14, nan],
+        "thumbnailUrl": ["https://cf.geekdo-images.com/a.jpg", nan, "", " ", "x", None],
+        "imageUrl": [nan, "https://cf.geekdo-images.com/b.jpg", nan, nan, "", nan],
+        "categories": [["Economic", "Industry"], [], nan, ["Card Game"], None, ["Abstract"]],
+        "mechanics": [["Hand Management"], ["Campaign", "Cooperative Game"], nan, [], None, []],
+        "designers": [
+            ["Gavan Brown", "Matt Tolman", "Martin Wallace"],
+            ["Isaac Childres"],
+            nan,
+            ["", "  Reiner Knizia  ", None],
+            [],
+            ["Solo"],
+        ],
+        "avgRating": [8.6, nan, nan, 0.0, 7.9, 0],
+        "geekRating": [8.4, 8.3, nan, 6.1, nan, 5.5],
+        "numVoters": [45000, 60000, nan, 1200, nan, 10],
+        "detailUrl": ["https://boardgamegeek.com/boardgame/224517/brass-birmingham", nan, "", nan, "u", nan],
+        "rank": [1, 3.0, nan, 250, nan, nan],
+    })
+
+
+def sample_text_frame() -> pd.DataFrame:
+    """Object-dtype variant of sample_games_frame, with text and unparseable numbers."""
+    df = sample_games_frame().astype(object)
+    df["avgRating"] = ["8.6", "n/a", None, "", "7.9", "0"]
+    df["geekRating"] = ["8.4", "8.3", "", "6.1", "bad", None]
+    df["numVoters"] = ["45000", "60000", None, "1200.0", "1,000", "10"]
+    df["yearPublished"] = ["2018", "abc", None, "1995", "", "2020.7"]
+    return df
+
+
+def _same(left: Any, right: Any) -> bool:
+    """Equality that treats NaN as equal to NaN, recursing into dicts and lists."""
+    if isinstance(left, float) and isinstance(right, float) and math.isnan(left) and math.isnan(right):
+        return True
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(_same(left[key], right[key]) for key in left)
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(_same(a, b) for a, b in zip(left, right))
+    return type(left) is type(right) and left == right
+
+
+def compare_game_transforms(games_df: pd.DataFrame) -> list[str]:
+    """
+    Transform games_df both row by row and column-wise and compare the documents.
+
+    Args:
+        games_df: Merged games DataFrame (as from merge_csv_data)
+
+    Returns:
+        One message per differing field (empty if the documents match)
+    """
+    reference = [transform_game_from_csv(row) for _, row in games_df.iterrows()]
+    columnar = transform_games_from_dataframe(games_df)
+    if len(reference) != len(columnar):
+        return [f"{len(reference)} reference documents, {len(columnar)} column-wise documents"]
+
+    mismatches = []
+    for row, (expected, actual) in enumerate(zip(reference, columnar)):
+        if expected.keys() != actual.keys():
+            mismatches.append(f"row {row}: fields {sorted(expected)} != {sorted(actual)}")
+            continue
+        for field in expected:
+            if field in _UNCOMPARED_FIELDS or (field == "_id" and expected["bggId"] is None):
+                continue
+            if not _same(expected[field], actual[field]):
+                mismatches.append(f"row {row} {field}: {expected[field]!r} != {actual[field]!r}")
+    return mismatches
+
+
+def _merged_games(data_dir: Path, pattern: str) -> Optional[pd.DataFrame]:
+    """Merged games of the games and credits CSVs in data_dir, as ETLPipeline builds them."""
+    from etl.merge_csv_data import merge_csv_data
+    from etl.read_csv import read_csv_files
+
+    csv_data = read_csv_files(data_dir, pattern, ["games", "credits"], use_cache=False)
+    if csv_data.get("games") is None:
+        return None
+    merged_games_df, _, _ = merge_csv_data(csv_data)
+    return merged_games_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the column-wise game transform against the row-wise reference")
+    parser.add_argument("--data-dir", type=Path, help="Also check the merged games CSVs in this directory")
+    parser.add_argument("--pattern", default="_1_100", help="CSV file pattern suffix (default: _1_100)")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    args = parser.parse_args()
+
+    setup_logging(level=args.log_level, log_to_file=False)
+
+    frames = {"sample": sample_games_frame(), "sample (text)": sample_text_frame()}
+    if args.data_dir:
+        merged = _merged_games(args.data_dir, args.pattern)
+        if merged is None or merged.empty:
+            logger.error(f"No merged games in {args.data_dir}")
+            sys.exit(1)
+        frames[str(args.data_dir)] = merged
+
+    failed = False
+    for label, frame in frames.items():
+        mismatches = compare_game_transforms(frame)
+        if mismatches:
+            failed = True
+            logger.error(f"❌ {label}: {len(mismatches)} differences in {len(frame)} games")
+            for message in mismatches[:50]:
+                logger.error(f"   {message}")
+        else:
+            logger.info(f"✓ {label}: {len(frame)} games identical")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Common utilities for the ETL pipeline including retry handling and data transfor
 """
 
 import functools
+import math
 import time
 from typing import Any, Callable, TypeVar, Optional
 import requests
@@ -150,7 +151,7 @@ def safe_get(data: dict, *keys: str, default: Any = None) -> Any:
 
 def clean_string(value: Any) -> Optional[str]:
     """Clean and normalize a string value."""
-    if value is None:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
         return None
     s = str(value).strip()
     return s if s else None
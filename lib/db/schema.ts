@@ -52,6 +52,9 @@ export interface Game {
   // Ratings from external sources
   bggRating: ExternalRating | null;
 
+  // Aggregates over our ratings collection (precomputed by the ETL)
+  ratingStats?: RatingStats | null;
+
   // Additional metadata
   officialUrl: string | null;
   priceUs: number | null;
@@ -85,6 +88,15 @@ export interface ExternalRating {
   bayesAverage?: number;
 }
 
+export interface RatingStats {
+  count: number;
+  average: number;
+  stddev: number;
+  bayesAverage: number; // shrunk toward the mean of all ratings
+  histogram: number[]; // 10 bins, ratings rounded to 1..10: [0, 1.5), [1.5, 2.5), ..., [9.5, 10]
+  updatedAt: Date;
+}
+
 // ============================================================================
 // USERS COLLECTION
 // ============================================================================
@@ -240,6 +252,8 @@ export const INDEXES = {
     { key: { categories: 1 } },
     { key: { mechanics: 1 } },
     { key: { "bggRating.average": -1 } },
+    { key: { "ratingStats.bayesAverage": -1 } },
+    { key: { "ratingStats.count": -1 } },
     { key: { bggRank: 1 } },
     { key: { complexity: 1 } },
     { key: { minPlayers: 1, maxPlayers: 1 } },